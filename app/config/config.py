@@ -6,7 +6,67 @@ TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
 if not TELEGRAM_TOKEN:
     raise ValueError("TELEGRAM_TOKEN is not Found.")
 
-OPEN_ROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
+OPEN_ROUTER_API_URL = os.getenv("OPEN_ROUTER_API_URL", "https://openrouter.ai/api/v1/chat/completions")
 OPEN_ROUTER_API_KEY = os.getenv("OPEN_ROUTER_API_KEY")
 if not OPEN_ROUTER_API_KEY:
-    raise ValueError("OPEN_ROUTER_API_KEY is not Found.")
\ No newline at end of file
+    raise ValueError("OPEN_ROUTER_API_KEY is not Found.")
+
+# 스크리닝 엔진 설정
+SCREENING_CONCURRENCY = int(os.getenv("SCREENING_CONCURRENCY", "8"))
+SCREENING_TIMEOUT = float(os.getenv("SCREENING_TIMEOUT", "30"))
+SCREENING_RETRIES = int(os.getenv("SCREENING_RETRIES", "2"))
+SCREENING_BACKOFF = float(os.getenv("SCREENING_BACKOFF", "1.0"))
+PRICE_CHUNK_SIZE = int(os.getenv("PRICE_CHUNK_SIZE", "100"))
+SCREENING_CHUNK_SIZE = int(os.getenv("SCREENING_CHUNK_SIZE", "200"))  # 결과를 흘려 보내는 단위
+SCREENING_WORKERS = int(os.getenv("SCREENING_WORKERS", "0"))  # 0 이면 프로세스 분할 없이 실행
+
+# 시세 캐시 설정 (TTL 단위: 초)
+CACHE_DIR = os.getenv("CACHE_DIR", "data/cache")
+PRICE_CACHE_TTL = float(os.getenv("PRICE_CACHE_TTL", str(6 * 60 * 60)))
+INFO_CACHE_TTL = float(os.getenv("INFO_CACHE_TTL", str(24 * 60 * 60)))
+SCREENING_SNAPSHOT_TTL = float(os.getenv("SCREENING_SNAPSHOT_TTL", str(60 * 60)))
+UNIVERSE_REFRESH_INTERVAL = float(os.getenv("UNIVERSE_REFRESH_INTERVAL", str(24 * 60 * 60)))
+WATCHLIST_DIR = os.getenv("WATCHLIST_DIR", "data/watchlists")  # *.csv 파일 이름이 /screen 범위가 된다
+RESULT_RETENTION_DAYS = int(os.getenv("RESULT_RETENTION_DAYS", "400"))  # 스크리닝 결과 스냅샷 보관 기간 (일)
+PRICE_SERIES_CACHE_BYTES = int(os.getenv("PRICE_SERIES_CACHE_BYTES", str(32 * 1024 * 1024)))  # 단일 종목 분석용 종가 메모리 한도
+
+# 산업 P/E 데이터 (NYU Stern pedata 를 CSV 로 저장한 파일, 없으면 내장 표 사용)
+STERN_PE_PATH = os.getenv("STERN_PE_PATH", "data/pedata.csv")
+STERN_PE_COLUMN = os.getenv("STERN_PE_COLUMN", "Current PE")
+
+# 일일 스크리닝 구독 (DAILY_SCREENING_TZ 기준 매일 DAILY_SCREENING_TIME 에 전송)
+DAILY_SCREENING_TIME = os.getenv("DAILY_SCREENING_TIME", "09:00")
+DAILY_SCREENING_TZ = os.getenv("DAILY_SCREENING_TZ", "Asia/Seoul")
+DAILY_SCREENING_JITTER = float(os.getenv("DAILY_SCREENING_JITTER", "120"))  # 시작을 0~N초 사이로 무작위 지연
+DAILY_SCREENING_SPREAD = float(os.getenv("DAILY_SCREENING_SPREAD", "300"))  # 채팅별 전송 시작을 0~N초 사이로 분산
+DAILY_SCREENING_CATCHUP = float(os.getenv("DAILY_SCREENING_CATCHUP", str(6 * 60 * 60)))  # 재시작으로 놓친 회차를 이어서 실행하는 한도 (초)
+
+# 관심 종목 시세 알림 (/watch)
+WATCH_POLL_INTERVAL = float(os.getenv("WATCH_POLL_INTERVAL", str(5 * 60)))  # 시세 확인 간격 (초)
+WATCH_DEFAULT_MARGIN = float(os.getenv("WATCH_DEFAULT_MARGIN", "30"))  # 기본 알림 기준 안전마진 (%)
+WATCH_HYSTERESIS = float(os.getenv("WATCH_HYSTERESIS", "2"))  # 기준 아래로 이만큼(%p) 내려가야 다시 알림
+WATCH_MAX_PER_CHAT = int(os.getenv("WATCH_MAX_PER_CHAT", "50"))
+
+# 종목 설명(LLM) 설정
+DESCRIPTION_MODEL = os.getenv("DESCRIPTION_MODEL", "google/gemini-2.0-flash-001")
+DESCRIPTION_CACHE_TTL = float(os.getenv("DESCRIPTION_CACHE_TTL", str(90 * 24 * 60 * 60)))
+DESCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv("DESCRIPTION_CACHE_MAX_ENTRIES", "20000"))
+DESCRIPTION_BATCH_SIZE = int(os.getenv("DESCRIPTION_BATCH_SIZE", "40"))
+
+# 외부 HTTP 연결 설정
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "16"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "10"))
+HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "2"))
+HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))
+
+# 관리자 및 지표 노출 설정
+ADMIN_CHAT_IDS = {int(chat_id) for chat_id in os.getenv("ADMIN_CHAT_IDS", "").split(",") if chat_id.strip()}
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))  # 0 이면 /metrics 엔드포인트 비활성화
+
+# 텔레그램 업데이트 동시 처리 수 (1 이면 한 번에 하나씩 처리)
+TELEGRAM_CONCURRENT_UPDATES = int(os.getenv("TELEGRAM_CONCURRENT_UPDATES", "64"))
+
+# 텔레그램 전송 속도 제한 (초당 메시지 수)
+TELEGRAM_GLOBAL_RATE = float(os.getenv("TELEGRAM_GLOBAL_RATE", "30"))
+TELEGRAM_CHAT_RATE = float(os.getenv("TELEGRAM_CHAT_RATE", "1"))
+TELEGRAM_CHAT_BURST = float(os.getenv("TELEGRAM_CHAT_BURST", "3"))
@@ -1,8 +1,20 @@
 # app/handlers/commands.py
-import time
+import asyncio
+import re
 from telegram import Update
 from telegram.ext import ContextTypes
-from app.utils.screening import daily_screening, manual_screening
+from app.config.config import (
+    ADMIN_CHAT_IDS,
+    DAILY_SCREENING_TIME,
+    DAILY_SCREENING_TZ,
+    WATCH_DEFAULT_MARGIN,
+    WATCH_MAX_PER_CHAT,
+)
+from app.utils.metrics import metrics
+from app.utils.outbox import outbox
+from app.utils.price_watch import watch_store, watcher
+from app.utils.screening import available_scopes, manual_screening, requires_admin, resolve_scope
+from app.utils.subscriptions import subscriptions
 from app.utils.logging import setup_logging
 
 logger = setup_logging()
@@ -10,33 +22,111 @@ logger = setup_logging()
 async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     chat_id = update.message.chat_id
     welcome_message = (
-        "매일 아침 9시에 나스닥과 S&P 500 종목을 스크리닝하여 단도원칙에 맞는 종목을 드립니다.\n"
+        f"매일 {DAILY_SCREENING_TIME}({DAILY_SCREENING_TZ})에 나스닥과 S&P 500 종목을 스크리닝하여 단도원칙에 맞는 종목을 드립니다.\n"
         "또는 종목 티커(예: AAPL)를 입력하면 분석 결과를 드립니다.\n"
         "/screen 명령어로 즉시 스크리닝을 실행할 수 있습니다.\n"
-        "사용법: /screen [all|nasdaq|sp500] (기본값: all)\n"
-    )
-    await update.message.reply_text(welcome_message)
-    context.job_queue.run_daily(
-        daily_screening, time=time(hour=0, minute=0), chat_id=chat_id
+        f"사용법: /screen [{'|'.join(available_scopes())}] (기본값: all)\n"
+        f"/watch 티커 [안전마진%] 로 관심 종목을 등록하면 안전마진이 기준(기본 {WATCH_DEFAULT_MARGIN:g}%)을 넘을 때 알려 드립니다.\n"
+        "/watch 만 입력하면 목록을, /unwatch 티커 로 해제할 수 있습니다.\n"
+        "/stop 으로 일일 스크리닝 구독을 해지할 수 있습니다.\n"
     )
+    await outbox.reply(update.message, welcome_message)
+    # 구독은 저장소에 남아 재시작 후에도 유지되고, 같은 채팅은 한 번만 구독된다
+    if subscriptions.add(chat_id):
+        logger.info(f"사용자 {chat_id} 일일 스크리닝 구독")
     logger.info(f"사용자 {chat_id} 시작 명령 실행")
 
+async def stop(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """일일 스크리닝 구독 해지"""
+    chat_id = update.message.chat_id
+    if subscriptions.remove(chat_id):
+        await outbox.reply(update.message, "일일 스크리닝 구독을 해지했습니다. /start 로 다시 구독할 수 있습니다.")
+        logger.info(f"사용자 {chat_id} 일일 스크리닝 구독 해지")
+    else:
+        await outbox.reply(update.message, "구독 중이 아닙니다. /start 로 구독할 수 있습니다.")
+
 async def screen(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """수동으로 스크리닝 실행"""
     chat_id = update.message.chat_id
     args = context.args  # 명령어 뒤 인자
     scope = args[0].lower() if args else "all"
     
-    if scope not in ["all", "nasdaq", "sp500"]:
-        await update.message.reply_text(
-            "잘못된 범위입니다. 사용법: /screen [all|nasdaq|sp500]"
-        )
+    if resolve_scope(scope) is None:
+        await outbox.reply(update.message, f"잘못된 범위입니다. 사용법: /screen [{'|'.join(available_scopes())}]")
+        return
+    if requires_admin(scope) and chat_id not in ADMIN_CHAT_IDS:
+        await outbox.reply(update.message, f"{scope.upper()} 스크리닝은 종목 수가 많아 관리자만 실행할 수 있습니다.")
+        logger.info(f"사용자 {chat_id}의 관리자 전용 범위 스크리닝 요청 거절 (scope: {scope})")
         return
     
     logger.info(f"사용자 {chat_id}가 /screen 명령어 실행 (scope: {scope})")
-    await update.message.reply_text(f"📈 {scope.upper()} 스크리닝을 시작합니다...")
+    await outbox.reply(update.message, f"📈 {scope.upper()} 스크리닝을 시작합니다...")
     
     # manual_screening 호출
     await manual_screening(context, chat_id, scope=scope, is_manual=True)
     
-    logger.info(f"사용자 {chat_id} 스크리닝 완료")
\ No newline at end of file
+    logger.info(f"사용자 {chat_id} 스크리닝 완료")
+
+async def stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """관리자용 성능 지표 요약"""
+    chat_id = update.message.chat_id
+    if chat_id not in ADMIN_CHAT_IDS:
+        await outbox.reply(update.message, "관리자만 사용할 수 있는 명령어입니다.")
+        return
+    await outbox.reply(update.message, metrics.render_summary())
+    logger.info(f"관리자 {chat_id} /stats 조회")
+
+TICKER_PATTERN = re.compile(r"^[A-Z0-9.\-^=]{1,12}$")
+
+async def watch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """관심 종목 등록 (/watch TICKER [margin]) 또는 목록 조회 (/watch)"""
+    chat_id = update.message.chat_id
+    args = context.args
+    if not args:
+        watches = watch_store.list(chat_id)
+        if not watches:
+            await outbox.reply(update.message, "등록된 관심 종목이 없습니다. 사용법: /watch 티커 [안전마진%]")
+            return
+        lines = [f"{ticker}: 안전마진 {margin:g}% 이상" for ticker, margin in watches]
+        await outbox.reply(update.message, "👀 관심 종목\n" + "\n".join(lines))
+        return
+
+    ticker = args[0].upper()
+    try:
+        margin = float(args[1].rstrip("%")) if len(args) > 1 else WATCH_DEFAULT_MARGIN
+    except ValueError:
+        margin = None
+    if not TICKER_PATTERN.match(ticker) or margin is None or not 0 < margin < 100:
+        await outbox.reply(update.message, "사용법: /watch 티커 [안전마진%] (예: /watch AAPL 25)")
+        return
+    if watch_store.count(chat_id) >= WATCH_MAX_PER_CHAT and ticker not in dict(watch_store.list(chat_id)):
+        await outbox.reply(update.message, f"관심 종목은 최대 {WATCH_MAX_PER_CHAT}개까지 등록할 수 있습니다.")
+        return
+
+    # 현재 상태를 기준으로 시작해 이후 기준을 새로 넘을 때만 알린다
+    quote = (await asyncio.to_thread(watcher.quotes, [ticker])).get(ticker)
+    if quote is None:
+        await outbox.reply(update.message, f"❌ {ticker} 시세나 내재가치를 계산할 수 없어 등록하지 않았습니다.")
+        return
+    above = watcher.is_above(quote, margin, None)
+    watch_store.add(chat_id, ticker, margin, above)
+    await outbox.reply(
+        update.message,
+        f"👀 {ticker} 관심 종목 등록 (기준: 안전마진 {margin:g}%)\n"
+        f"현재 안전마진: {quote.safety_margin:.2f}%"
+        + (" (이미 기준 이상입니다)" if above else ""),
+    )
+    logger.info(f"사용자 {chat_id} 관심 종목 등록: {ticker} ({margin:g}%)")
+
+async def unwatch(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """관심 종목 해제 (/unwatch TICKER)"""
+    chat_id = update.message.chat_id
+    if not context.args:
+        await outbox.reply(update.message, "사용법: /unwatch 티커")
+        return
+    ticker = context.args[0].upper()
+    if watch_store.remove(chat_id, ticker):
+        await outbox.reply(update.message, f"{ticker} 관심 종목을 해제했습니다.")
+        logger.info(f"사용자 {chat_id} 관심 종목 해제: {ticker}")
+    else:
+        await outbox.reply(update.message, f"{ticker} 는 관심 종목이 아닙니다.")
@@ -2,6 +2,7 @@
 from telegram import Update
 from telegram.ext import ContextTypes
 import telegram.error
+from app.utils.outbox import outbox, retry_after_seconds
 from app.utils.logging import setup_logging
 
 logger = setup_logging()
@@ -12,7 +13,12 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
     user_message = None
 
-    if isinstance(error, telegram.error.Conflict):
+    if isinstance(error, telegram.error.RetryAfter):
+        # 전송 한도 초과: 답장을 보내면 더 막히므로 전송 큐만 잠시 멈춘다
+        seconds = retry_after_seconds(error)
+        logger.warning(f"Flood control exceeded, pausing sends for {seconds:.1f}s.")
+        outbox.pause(seconds)
+    elif isinstance(error, telegram.error.Conflict):
         logger.error("Conflict detected: Multiple bot instances running.")
         user_message = "봇 충돌이 발생했습니다. 한 번에 하나의 인스턴스만 실행해주세요."
     elif isinstance(error, telegram.error.NetworkError):
@@ -29,4 +35,4 @@ async def error_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         user_message = "알 수 없는 오류가 발생했습니다. 잠시 후 다시 시도해주세요."
 
     if update and update.message and user_message:
-        await update.message.reply_text(user_message)
\ No newline at end of file
+        await outbox.reply(update.message, user_message)
\ No newline at end of file
@@ -1,24 +1,43 @@
+import asyncio
 from telegram import Update
 from telegram.ext import ContextTypes
-from app.utils.stock import analyze_stock
+from app.utils.stock import analyze_stock, fetch_stock_description_async
+from app.utils.outbox import outbox
+from app.utils.singleflight import SingleFlight
 from app.utils.logging import setup_logging
 
 logger = setup_logging()
 
+# 같은 티커의 동시 조회는 하나의 계산을 공유
+lookups = SingleFlight()
+
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     ticker = update.message.text.strip().upper()
     logger.info(f"사용자 요청: {ticker} 분석")
-    analysis = analyze_stock(ticker)
-    if analysis:
-        message = (
-            f"📊 {ticker} 분석 결과\n"
-            f"현재가: ${analysis['current_price']}\n"
-            f"내재가치: ${analysis['intrinsic_value']}\n"
-            f"안전마진: ${analysis['safety_margin']}%\n"
-            f"매수추천: {'✅ 예' if analysis['buy_recommendation'] else '❌ 아니오'}\n"
-            f"종목설명: {analysis['description']}\n"
-        )
-    else:
-        message = f"❌ {ticker} 데이터를 가져올 수 없습니다."
-    await update.message.reply_text(message)
-    logger.info(f"{ticker} 분석 결과 전송 완료")
\ No newline at end of file
+    analysis = await lookups.do(
+        ("analysis", ticker), lambda: asyncio.to_thread(analyze_stock, ticker, include_description=False)
+    )
+    if not analysis:
+        await outbox.reply(update.message, f"❌ {ticker} 데이터를 가져올 수 없습니다.")
+        logger.info(f"{ticker} 분석 결과 전송 완료")
+        return
+
+    # 가격/가치 평가를 먼저 보내고, AI 종목 설명은 도착하면 같은 메시지를 수정해 붙인다
+    message = (
+        f"📊 {ticker} 분석 결과\n"
+        f"현재가: ${analysis['current_price']}\n"
+        f"내재가치: ${analysis['intrinsic_value']}\n"
+        f"안전마진: ${analysis['safety_margin']}%\n"
+        f"매수추천: {'✅ 예' if analysis['buy_recommendation'] else '❌ 아니오'}\n"
+    )
+    # 나중에 수정할 메시지이므로 다른 메시지와 합치지 않는다
+    reply = await outbox.reply(update.message, message + "종목설명: 불러오는 중...\n", coalesce=False)
+    logger.info(f"{ticker} 분석 결과 전송 완료")
+
+    description = await lookups.do(
+        ("description", ticker), lambda: fetch_stock_description_async(ticker)
+    )
+    try:
+        await outbox.edit(reply, message + f"종목설명: {description}\n")
+    except Exception as e:
+        logger.error(f"{ticker} 종목설명 수정 실패 | error: {e}")
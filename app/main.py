@@ -1,24 +1,53 @@
 # app/main.py
-from telegram.ext import Application, CommandHandler, MessageHandler, filters
-from app.config.config import TELEGRAM_TOKEN
-from app.handlers.commands import start, screen
+from telegram.ext import Application, ApplicationBuilder, CommandHandler, MessageHandler, filters
+from app.config.config import METRICS_PORT, TELEGRAM_CONCURRENT_UPDATES, TELEGRAM_TOKEN, WATCH_POLL_INTERVAL
+from app.handlers.commands import start, screen, stats, stop, unwatch, watch
 from app.handlers.messages import handle_message
 from app.handlers.errors import error_handler
+from app.utils.http import close_async_client
+from app.utils.metrics import start_metrics_server
+from app.utils.outbox import outbox
+from app.utils.price_watch import watch_prices
+from app.utils.sharding import sharded
+from app.utils.subscriptions import daily_scheduler
 from app.utils.logging import setup_logging
 
 logger = setup_logging()
 
-def main():
-    logger.info("Starting Dhandho Bot...")
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+async def shutdown(application: Application):
+    await outbox.close()
+    sharded.shutdown()
+    await close_async_client()
+
+def build_application(builder: ApplicationBuilder) -> Application:
+    """핸들러를 등록한 Application 생성 (벤치마크도 같은 구성으로 업데이트를 처리한다)"""
+    # 한 사용자의 긴 스크리닝이나 조회가 다른 채팅의 업데이트를 막지 않도록 동시에 처리
+    application = builder.concurrent_updates(TELEGRAM_CONCURRENT_UPDATES).post_shutdown(shutdown).build()
     
     # 핸들러 등록
     application.add_handler(CommandHandler("start", start))
     application.add_handler(CommandHandler("screen", screen))
+    application.add_handler(CommandHandler("stats", stats))
+    application.add_handler(CommandHandler("stop", stop))
+    application.add_handler(CommandHandler("watch", watch))
+    application.add_handler(CommandHandler("unwatch", unwatch))
     application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, handle_message))
     
     # 에러 핸들러 등록
     application.add_error_handler(error_handler)
+    return application
+
+def main():
+    logger.info("Starting Dhandho Bot...")
+    application = build_application(Application.builder().token(TELEGRAM_TOKEN))
+    
+    # 일일 스크리닝은 구독자 수와 관계없이 회차마다 한 번만 실행하고 결과를 공유 (재시작으로 놓친 회차는 이어서 실행)
+    daily_scheduler.install(application.job_queue)
+    # 관심 종목 시세는 감시 티커 합집합에 대해 주기적으로 한 번씩만 조회
+    application.job_queue.run_repeating(watch_prices, interval=WATCH_POLL_INTERVAL, first=WATCH_POLL_INTERVAL)
+    
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
     
     logger.info("Bot polling started.")
     application.run_polling()
@@ -0,0 +1,128 @@
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+from app.utils import stock
+from app.utils.logging import setup_logging
+from app.utils.universe import universes
+
+logger = setup_logging()
+
+INFO_FIELDS = ["trailingEps", "trailingPE", "industry", "sector", "profitMargins", "returnOnEquity"]
+
+WEIGHTS = {"moat": 0.4, "consistency": 0.3, "track_record": 0.3}
+
+def build_info_frame(infos: List[Dict[str, Any]]) -> pd.DataFrame:
+    """'ticker' 키를 포함한 info 딕셔너리 목록을 분석에 필요한 열만 가진 프레임으로 변환"""
+    frame = pd.DataFrame(infos, columns=["ticker"] + INFO_FIELDS)
+    return frame.drop_duplicates("ticker").set_index("ticker")
+
+def price_stats(values: np.ndarray) -> Dict[str, np.ndarray]:
+    """(날짜 x 티커) 종가 배열에서 티커별 첫/마지막 종가, 봉 수, 일간 수익률 표준편차를 계산"""
+    # 티커별 첫/마지막 유효 봉 위치
+    valid = ~np.isnan(values)
+    has_data = valid.any(axis=0)
+    first_pos = valid.argmax(axis=0)
+    last_pos = len(values) - 1 - valid[::-1].argmax(axis=0)
+    columns = np.arange(values.shape[1])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # pct_change(fill_method=None).std() 와 같은 표본 표준편차 (NaN 제외)
+        # 큰 임시 배열을 하나만 두고 제자리 연산으로 재사용
+        returns = np.divide(values[1:], values[:-1])
+        returns -= 1
+        missing = np.isnan(returns)
+        count = returns.shape[0] - missing.sum(axis=0)
+        returns[missing] = 0.0
+        mean = returns.sum(axis=0) / count
+        returns -= mean
+        returns[missing] = 0.0
+        np.square(returns, out=returns)
+        volatility = np.where(count > 1, np.sqrt(returns.sum(axis=0) / (count - 1)), np.nan)
+    return {
+        "has_data": has_data,
+        "first_close": values[first_pos, columns],
+        "current_price": values[last_pos, columns],
+        "rows": (last_pos - first_pos + 1).astype(float),
+        "volatility": volatility,
+    }
+
+def analyze_universe(panel: pd.DataFrame, info_frame: pd.DataFrame, safety_margin_threshold: float = 0.3) -> pd.DataFrame:
+    """(날짜 x 티커) 종가 패널 전체를 열 연산으로 한 번에 분석
+
+    analyze_close 와 같은 지표를 계산하며 (종목 설명 제외), 분석 불가 종목은 결과에서 빠진다.
+    trailingPE 가 없으면(NaN) 현재가/EPS 로 대체한다.
+    """
+    tickers = panel.columns.intersection(info_frame.index)
+    if tickers.empty:
+        return pd.DataFrame()
+    # 패널 전체를 쓰는 경우 복사 없이 배열 뷰를 그대로 사용
+    values = panel.to_numpy(dtype=float)
+    if len(tickers) != panel.shape[1]:
+        values = values[:, panel.columns.get_indexer(tickers)]
+    return score_universe(tickers, info_frame.loc[tickers], safety_margin_threshold, **price_stats(values))
+
+def score_universe(tickers: pd.Index, info: pd.DataFrame, safety_margin_threshold: float, has_data: np.ndarray,
+                   first_close: np.ndarray, current_price: np.ndarray, rows: np.ndarray,
+                   volatility: np.ndarray) -> pd.DataFrame:
+    """티커별 가격 통계와 info 로 가치 평가 지표를 계산 (전체 재계산과 증분 재스크리닝이 공유)"""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cagr = (current_price / first_close) ** (1 / (rows / 252)) - 1
+    consistency = volatility < 0.03
+    track_record = (rows > 252 * 3) & (cagr > 0.05)
+
+    eps = pd.to_numeric(info["trailingEps"], errors="coerce").to_numpy()
+    trailing_pe = pd.to_numeric(info["trailingPE"], errors="coerce").to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        trailing_pe = np.where(np.isnan(trailing_pe), current_price / eps, trailing_pe)
+
+    # 산업 P/E 조회는 고유한 (산업, 섹터) 조합 수만큼만 수행
+    industry = info["industry"].fillna("Default")
+    sector = info["sector"].fillna("Default")
+    pairs = list(zip(industry, sector))
+    base_pe_by_pair = {pair: stock.lookup_industry_pe(*pair) for pair in set(pairs)}
+    base_pe = np.array([base_pe_by_pair[pair] for pair in pairs], dtype=float)
+    realistic_pe = np.clip(trailing_pe * 1.2, 15.0, 30.0)
+    industry_pe = np.where((trailing_pe > 0) & (base_pe > 30), realistic_pe, np.minimum(base_pe, 30.0))
+
+    intrinsic_value = eps * industry_pe
+    with np.errstate(divide="ignore", invalid="ignore"):
+        discount = np.where(intrinsic_value > 0, (intrinsic_value - current_price) / intrinsic_value, 0.0)
+        pe_discount = np.where(
+            (trailing_pe != 0) & ~np.isnan(trailing_pe) & (industry_pe != 0),
+            (industry_pe - trailing_pe) / industry_pe * 100,
+            0.0,
+        )
+
+    profit_margins = pd.to_numeric(info["profitMargins"], errors="coerce").fillna(0).to_numpy()
+    return_on_equity = pd.to_numeric(info["returnOnEquity"], errors="coerce").fillna(0).to_numpy()
+    moat = (profit_margins > 0.1) & (return_on_equity > 0.15)
+
+    score = WEIGHTS["moat"] * moat + WEIGHTS["consistency"] * consistency + WEIGHTS["track_record"] * track_record
+    score = np.round(score, 2)
+
+    result = pd.DataFrame(
+        {
+            "ticker": tickers,
+            "current_price": np.round(current_price, 2),
+            "trailing_pe": np.round(trailing_pe, 2),
+            "industry_pe": np.round(industry_pe, 2),
+            "intrinsic_value": np.round(intrinsic_value, 2),
+            "safety_margin": np.round(discount * 100, 2),
+            "pe_discount": np.round(pe_discount, 2),
+            "moat": moat,
+            "consistency": consistency,
+            "track_record": track_record,
+            "cagr": np.round(cagr * 100, 2),
+            "is_nasdaq100": tickers.isin(universes.get("nasdaq").members()),
+            "is_sp500": tickers.isin(universes.get("sp500").members()),
+            "score": score,
+            "buy_recommendation": (discount > safety_margin_threshold) & (score >= 0.6),
+        },
+        index=tickers,
+    )
+    usable = has_data & (eps > 0)
+    skipped = len(tickers) - int(usable.sum())
+    if skipped:
+        logger.info(f"analyze_universe skipped {skipped} tickers without prices or valid EPS")
+    logger.info(f"analyze_universe done | tickers: {int(usable.sum())}")
+    return result[usable]
@@ -0,0 +1,180 @@
+import json
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import pandas as pd
+from app.config.config import CACHE_DIR, INFO_CACHE_TTL, PRICE_CACHE_TTL
+from app.utils.logging import setup_logging
+from app.utils.sqlite import SQLiteStore
+
+logger = setup_logging()
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# 수정주가 기준이 바뀌었는지 판단하는 겹치는 봉의 종가 허용 오차
+ADJUSTMENT_TOLERANCE = 0.005
+
+class MarketDataCache(SQLiteStore):
+    """가격 이력과 info 스냅샷을 TTL 과 함께 보관하는 SQLite 저장소"""
+
+    def __init__(self, path: str, price_ttl: float = PRICE_CACHE_TTL, info_ttl: float = INFO_CACHE_TTL):
+        self.price_ttl = price_ttl
+        self.info_ttl = info_ttl
+        super().__init__(
+            path,
+            """
+            CREATE TABLE IF NOT EXISTS prices (
+                ticker TEXT NOT NULL,
+                date TEXT NOT NULL,
+                open REAL, high REAL, low REAL, close REAL, volume REAL,
+                PRIMARY KEY (ticker, date)
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS price_meta (
+                ticker TEXT PRIMARY KEY,
+                refreshed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS price_state (
+                ticker TEXT PRIMARY KEY,
+                data TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS info (
+                ticker TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            """
+        )
+
+    def price_refreshed_at(self, ticker: str) -> Optional[float]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT refreshed_at FROM price_meta WHERE ticker = ?", (ticker,)).fetchone()
+        return row[0] if row else None
+
+    def is_price_fresh(self, ticker: str) -> bool:
+        refreshed_at = self.price_refreshed_at(ticker)
+        return refreshed_at is not None and time.time() - refreshed_at < self.price_ttl
+
+    def last_price_date(self, ticker: str) -> Optional[pd.Timestamp]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT MAX(date) FROM prices WHERE ticker = ?", (ticker,)).fetchone()
+        return pd.Timestamp(row[0]) if row and row[0] else None
+
+    def load_prices(self, ticker: str, since: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        query = "SELECT date, open, high, low, close, volume FROM prices WHERE ticker = ?"
+        params: list = [ticker]
+        if since is not None:
+            query += " AND date >= ?"
+            params.append(since.strftime("%Y-%m-%d"))
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY date", params).fetchall()
+        if not rows:
+            return None
+        df = pd.DataFrame(rows, columns=["Date"] + PRICE_COLUMNS)
+        df.index = pd.DatetimeIndex(df.pop("Date"), name="Date")
+        return df
+
+    def load_closes(self, ticker: str, since: Optional[str] = None, until: Optional[str] = None,
+                    limit: Optional[int] = None, conn: Optional[sqlite3.Connection] = None) -> List[Tuple[str, float]]:
+        """[since, until) 구간의 (날짜, 종가) 목록. conn 을 주면 그 연결을 재사용"""
+        query = "SELECT date, close FROM prices WHERE ticker = ?"
+        params: list = [ticker]
+        if since is not None:
+            query += " AND date >= ?"
+            params.append(since)
+        if until is not None:
+            query += " AND date < ?"
+            params.append(until)
+        query += " ORDER BY date"
+        if limit is not None:
+            query += f" LIMIT {int(limit)}"
+        if conn is not None:
+            return conn.execute(query, params).fetchall()
+        with self._connect() as conn:
+            return conn.execute(query, params).fetchall()
+
+    @contextmanager
+    def reader(self):
+        """여러 조회를 한 연결로 묶을 때 사용"""
+        with self._connect() as conn:
+            yield conn
+
+    def store_prices(self, ticker: str, df: pd.DataFrame, replace: bool = False) -> bool:
+        """새 봉을 추가한다. 겹치는 봉의 종가가 달라졌으면 (배당/분할 재조정) 저장하지 않고 False
+
+        증분 재스크리닝 상태가 맞도록 전체 교체가 아니면 마지막 저장 봉 이후만 덮어쓴다. 종가가 있는 봉이
+        없으면 (조회 실패 시 yfinance 는 NaN 열을 준다) 기존 이력과 갱신 시각을 건드리지 않는다.
+        """
+        df = df.dropna(subset=["Close"])
+        if df.empty:
+            return True
+        dates = pd.DatetimeIndex(df.index).strftime("%Y-%m-%d")
+        with self._connect() as conn:
+            if replace:
+                conn.execute("DELETE FROM prices WHERE ticker = ?", (ticker,))
+                conn.execute("DELETE FROM price_state WHERE ticker = ?", (ticker,))
+            elif len(df):
+                row = conn.execute(
+                    "SELECT close FROM prices WHERE ticker = ? AND date = ?", (ticker, dates[0])
+                ).fetchone()
+                if row is not None and abs(df["Close"].iloc[0] / row[0] - 1) > ADJUSTMENT_TOLERANCE:
+                    logger.info(f"{ticker} price adjustment detected, full refresh required")
+                    return False
+                last = conn.execute("SELECT MAX(date) FROM prices WHERE ticker = ?", (ticker,)).fetchone()[0]
+                if last is not None:
+                    keep = dates >= last
+                    df, dates = df[keep], dates[keep]
+            values = df.reindex(columns=PRICE_COLUMNS).astype(float).itertuples(index=False, name=None)
+            conn.executemany(
+                "INSERT OR REPLACE INTO prices VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ((ticker, date, *row) for date, row in zip(dates, values)),
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO price_meta VALUES (?, ?)", (ticker, time.time())
+            )
+        return True
+
+    def load_states(self, tickers: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """증분 재스크리닝용 티커별 가격 상태"""
+        tickers = list(tickers)
+        states = {}
+        with self._connect() as conn:
+            # SQLite 변수 개수 제한 안에서 나눠 조회
+            for start in range(0, len(tickers), 500):
+                chunk = tickers[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                for ticker, data in conn.execute(
+                    f"SELECT ticker, data FROM price_state WHERE ticker IN ({placeholders})", chunk
+                ):
+                    states[ticker] = json.loads(data)
+        return states
+
+    def store_states(self, states: Dict[str, Optional[Dict[str, Any]]]):
+        """상태를 한 트랜잭션으로 저장. 값이 None 이면 삭제"""
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO price_state VALUES (?, ?)",
+                ((ticker, json.dumps(state)) for ticker, state in states.items() if state is not None),
+            )
+            conn.executemany(
+                "DELETE FROM price_state WHERE ticker = ?",
+                ((ticker,) for ticker, state in states.items() if state is None),
+            )
+
+    def load_info(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """TTL 안의 info 스냅샷만 반환"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT data, fetched_at FROM info WHERE ticker = ?", (ticker,)).fetchone()
+        if row is None or time.time() - row[1] >= self.info_ttl:
+            return None
+        return json.loads(row[0])
+
+    def store_info(self, ticker: str, info: Dict[str, Any]):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO info VALUES (?, ?, ?)",
+                (ticker, json.dumps(info, default=str), time.time()),
+            )
+
+market_cache = MarketDataCache(os.path.join(CACHE_DIR, "market_data.sqlite3"))
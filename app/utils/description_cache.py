@@ -0,0 +1,76 @@
+import os
+import time
+from typing import Dict, Iterable, Optional
+from app.config.config import CACHE_DIR, DESCRIPTION_CACHE_MAX_ENTRIES, DESCRIPTION_CACHE_TTL
+from app.utils.logging import setup_logging
+from app.utils.sqlite import SQLiteStore
+
+logger = setup_logging()
+
+class DescriptionCache(SQLiteStore):
+    """(티커, 모델, 프롬프트 버전) 별 종목 설명을 보관하는 SQLite 저장소
+
+    TTL 이 지난 항목은 무시하고, 최대 개수를 넘으면 가장 오래 조회되지 않은 항목부터 지운다.
+    """
+
+    def __init__(self, path: str, ttl: float = DESCRIPTION_CACHE_TTL, max_entries: int = DESCRIPTION_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        super().__init__(
+            path,
+            """
+            CREATE TABLE IF NOT EXISTS descriptions (
+                ticker TEXT NOT NULL,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                description TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                PRIMARY KEY (ticker, model, prompt_version)
+            );
+            CREATE INDEX IF NOT EXISTS descriptions_accessed ON descriptions (accessed_at);
+            """
+        )
+
+    def get_many(self, tickers: Iterable[str], model: str, prompt_version: str) -> Dict[str, str]:
+        tickers = list(tickers)
+        if not tickers:
+            return {}
+        now = time.time()
+        placeholders = ",".join("?" * len(tickers))
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT ticker, description FROM descriptions "
+                f"WHERE model = ? AND prompt_version = ? AND created_at > ? AND ticker IN ({placeholders})",
+                (model, prompt_version, now - self.ttl, *tickers),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE descriptions SET accessed_at = ? WHERE ticker = ? AND model = ? AND prompt_version = ?",
+                ((now, ticker, model, prompt_version) for ticker, _ in rows),
+            )
+        return dict(rows)
+
+    def get(self, ticker: str, model: str, prompt_version: str) -> Optional[str]:
+        return self.get_many([ticker], model, prompt_version).get(ticker)
+
+    def put_many(self, descriptions: Dict[str, str], model: str, prompt_version: str):
+        if not descriptions:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO descriptions VALUES (?, ?, ?, ?, ?, ?)",
+                ((ticker, model, prompt_version, description, now, now) for ticker, description in descriptions.items()),
+            )
+            evicted = conn.execute(
+                "DELETE FROM descriptions WHERE rowid IN ("
+                "SELECT rowid FROM descriptions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            ).rowcount
+        if evicted:
+            logger.info(f"Evicted {evicted} cached descriptions")
+
+    def put(self, ticker: str, description: str, model: str, prompt_version: str):
+        self.put_many({ticker: description}, model, prompt_version)
+
+description_cache = DescriptionCache(os.path.join(CACHE_DIR, "descriptions.sqlite3"))
@@ -0,0 +1,71 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from app.config.config import (
+    SCREENING_BACKOFF,
+    SCREENING_CONCURRENCY,
+    SCREENING_RETRIES,
+    SCREENING_TIMEOUT,
+)
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+AnalyzeFn = Callable[[str], Optional[Dict[str, Any]]]
+
+class ScreeningEngine:
+    """티커별 분석을 이벤트 루프 밖의 제한된 워커 풀에서 병렬 실행"""
+
+    def __init__(
+        self,
+        analyze: AnalyzeFn,
+        concurrency: int = SCREENING_CONCURRENCY,
+        timeout: float = SCREENING_TIMEOUT,
+        retries: int = SCREENING_RETRIES,
+        backoff: float = SCREENING_BACKOFF,
+    ):
+        self.analyze = analyze
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+
+    async def _run_one(self, loop, executor, semaphore, ticker: str) -> Optional[Dict[str, Any]]:
+        for attempt in range(self.retries + 1):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        loop.run_in_executor(executor, self.analyze, ticker), timeout=self.timeout
+                    )
+                except asyncio.TimeoutError:
+                    error = f"timeout after {self.timeout}s"
+                except Exception as e:
+                    error = str(e)
+            if attempt < self.retries:
+                # 지수 백오프 + 지터로 재시도 (세마포어는 대기 중에 반납)
+                delay = self.backoff * (2 ** attempt) * (1 + random.random() * 0.1)
+                logger.warning(f"{ticker} analyze failed ({error}), retry {attempt + 1}/{self.retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            else:
+                logger.error(f"{ticker} analyze failed after {self.retries + 1} attempts | error: {error}")
+        return None
+
+    async def run(self, tickers: List[str]) -> List[Dict[str, Any]]:
+        """입력 순서를 유지한 채 분석 가능한 종목의 결과만 반환"""
+        if not tickers:
+            return []
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        # 타임아웃된 작업이 워커를 점유하므로 재시도분만큼 여유를 둔다
+        executor = ThreadPoolExecutor(
+            max_workers=self.concurrency * (self.retries + 1), thread_name_prefix="screening"
+        )
+        try:
+            results = await asyncio.gather(
+                *(self._run_one(loop, executor, semaphore, ticker) for ticker in tickers)
+            )
+        finally:
+            # 종료 대기로 이벤트 루프를 막지 않는다
+            executor.shutdown(wait=False)
+        return [result for result in results if result is not None]
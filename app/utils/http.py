@@ -0,0 +1,204 @@
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+import requests
+from curl_cffi import requests as curl_requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+from app.config.config import HTTP_BACKOFF, HTTP_POOL_SIZE, HTTP_RETRIES, HTTP_TIMEOUT, OPEN_ROUTER_API_URL
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+class HttpStats:
+    """호스트별 요청 수, 새 연결 수, 누적 지연 시간 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._requests: Dict[str, int] = defaultdict(int)
+        self._connections: Dict[str, int] = defaultdict(int)
+        self._errors: Dict[str, int] = defaultdict(int)
+        self._latency: Dict[str, float] = defaultdict(float)
+
+    def record_request(self, host: str, elapsed: float, error: bool = False):
+        with self._lock:
+            self._requests[host] += 1
+            self._latency[host] += elapsed
+            if error:
+                self._errors[host] += 1
+
+    def record_connection(self, host: str):
+        with self._lock:
+            self._connections[host] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            hosts = set(self._requests) | set(self._connections)
+            return {
+                host: {
+                    "requests": self._requests[host],
+                    "connections": self._connections[host],
+                    "reused": max(self._requests[host] - self._connections[host], 0),
+                    "errors": self._errors[host],
+                    "avg_ms": round(self._latency[host] / self._requests[host] * 1000, 1) if self._requests[host] else 0.0,
+                }
+                for host in sorted(hosts)
+            }
+
+http_stats = HttpStats()
+
+def _host(url: Any) -> str:
+    return urlsplit(str(url)).hostname or "unknown"
+
+# 실제 TCP 연결(재연결 포함)이 일어날 때마다 집계
+class _CountingHTTPConnection(HTTPConnection):
+    def connect(self):
+        http_stats.record_connection(self.host)
+        super().connect()
+
+class _CountingHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        http_stats.record_connection(self.host)
+        super().connect()
+
+class _CountingHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _CountingHTTPConnection
+
+class _CountingHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _CountingHTTPSConnection
+
+class InstrumentedAdapter(HTTPAdapter):
+    """keep-alive 풀 + 재시도 + 기본 타임아웃을 적용하고 호스트별 통계를 남기는 어댑터"""
+
+    def __init__(self, timeout: float = HTTP_TIMEOUT, **kwargs):
+        self.timeout = timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _CountingHTTPConnectionPool,
+            "https": _CountingHTTPSConnectionPool,
+        }
+
+    def send(self, request, timeout=None, **kwargs):
+        start = time.perf_counter()
+        try:
+            response = super().send(request, timeout=timeout or self.timeout, **kwargs)
+        except Exception:
+            http_stats.record_request(_host(request.url), time.perf_counter() - start, error=True)
+            raise
+        http_stats.record_request(_host(request.url), time.perf_counter() - start, error=response.status_code >= 400)
+        return response
+
+_session: Optional[requests.Session] = None
+_yf_session: Optional[curl_requests.Session] = None
+_async_client: Optional[httpx.AsyncClient] = None
+_lock = threading.Lock()
+
+def _retry(**kwargs) -> Retry:
+    return Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+        **kwargs,
+    )
+
+def get_session() -> requests.Session:
+    """모든 동기 요청이 공유하는 requests 세션
+
+    기본 어댑터는 멱등 메서드만 재시도한다. OpenRouter POST 는 멱등이 아니어서 요청이 이미 전달됐을 수 있는
+    연결/읽기 오류는 재시도하지 않고 (타임아웃은 requests.Timeout 으로 그대로 올라간다) 재시도 상태 코드에만
+    다시 보낸다.
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            adapter = InstrumentedAdapter(pool_connections=8, pool_maxsize=HTTP_POOL_SIZE, max_retries=_retry())
+            completion = InstrumentedAdapter(
+                pool_connections=1, pool_maxsize=HTTP_POOL_SIZE,
+                max_retries=_retry(allowed_methods=frozenset({"POST"}), connect=False, read=False),
+            )
+            origin = urlsplit(OPEN_ROUTER_API_URL)
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+            _session.mount(f"{origin.scheme}://{origin.netloc}/", completion)
+        return _session
+
+def get_yfinance_session() -> curl_requests.Session:
+    """yfinance 용 curl_cffi 세션 (Yahoo API 는 curl_cffi 세션만 허용)"""
+    global _yf_session
+    with _lock:
+        if _yf_session is None:
+            _yf_session = curl_requests.Session(impersonate="chrome", timeout=HTTP_TIMEOUT)
+        return _yf_session
+
+class timed_call:
+    """세션 밖(yfinance 등)에서 일어나는 호출의 지연 시간을 호스트 단위로 기록"""
+
+    def __init__(self, host: str):
+        self.host = host
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        http_stats.record_request(self.host, time.perf_counter() - self.start, error=exc_type is not None)
+        return False
+
+class InstrumentedAsyncClient(httpx.AsyncClient):
+    """상태 코드 기반 재시도(Retry-After 반영)와 호스트별 통계를 더한 httpx 클라이언트"""
+
+    async def send(self, request: httpx.Request, **kwargs) -> httpx.Response:
+        host = request.url.host
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            if event_name == "connection.connect_tcp.complete":
+                http_stats.record_connection(host)
+
+        request.extensions["trace"] = trace
+        for attempt in range(HTTP_RETRIES + 1):
+            start = time.perf_counter()
+            try:
+                response = await super().send(request, **kwargs)
+            except Exception:
+                http_stats.record_request(host, time.perf_counter() - start, error=True)
+                raise
+            http_stats.record_request(host, time.perf_counter() - start, error=response.status_code >= 400)
+            if response.status_code not in RETRY_STATUSES or attempt == HTTP_RETRIES:
+                return response
+            retry_after = response.headers.get("Retry-After", "")
+            delay = float(retry_after) if retry_after.isdigit() else HTTP_BACKOFF * (2 ** attempt)
+            await response.aclose()
+            logger.warning(f"{host} returned {response.status_code}, retry {attempt + 1}/{HTTP_RETRIES} in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        return response
+
+def get_async_client() -> httpx.AsyncClient:
+    """모든 비동기 요청이 공유하는 httpx 클라이언트"""
+    global _async_client
+    if _async_client is None or _async_client.is_closed:
+        _async_client = InstrumentedAsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE),
+            transport=httpx.AsyncHTTPTransport(retries=HTTP_RETRIES),
+        )
+    return _async_client
+
+async def close_async_client():
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
@@ -0,0 +1,200 @@
+import math
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.utils import stock
+from app.utils.analysis import INFO_FIELDS, score_universe
+from app.utils.cache import MarketDataCache, market_cache
+from app.utils.metrics import metrics
+from app.utils.universe import universes
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+# 누적합 오차가 쌓이지 않도록 이 횟수만큼 갱신하면 전체 이력으로 다시 만든다
+REBUILD_INTERVAL = 252
+
+@dataclass
+class PriceState:
+    """티커의 분석 구간 종가에 대한 누적 통계 (CAGR 용 첫/마지막 종가, 변동성용 수익률 합과 제곱합)"""
+
+    first_date: str
+    first_close: float
+    last_date: str
+    last_close: float
+    prev_close: Optional[float]  # 마지막 봉 직전 종가 (마지막 봉 수정 반영용)
+    rows: int
+    count: int  # 수익률 개수
+    total: float  # 수익률 합
+    squares: float  # 수익률 제곱합
+    updates: int = 0
+
+    @classmethod
+    def from_closes(cls, closes: List[Tuple[str, float]]) -> Optional["PriceState"]:
+        if not closes:
+            return None
+        values = np.array([close for _, close in closes], dtype=float)
+        returns = values[1:] / values[:-1] - 1
+        return cls(
+            first_date=closes[0][0],
+            first_close=float(values[0]),
+            last_date=closes[-1][0],
+            last_close=float(values[-1]),
+            prev_close=float(values[-2]) if len(values) > 1 else None,
+            rows=len(values),
+            count=len(returns),
+            total=float(returns.sum()),
+            squares=float(np.square(returns).sum()),
+        )
+
+    def _add(self, r: float, sign: int = 1):
+        self.count += sign
+        self.total += sign * r
+        self.squares += sign * r * r
+
+    def append(self, date: str, close: float):
+        self._add(close / self.last_close - 1)
+        self.prev_close, self.last_date, self.last_close = self.last_close, date, close
+        self.rows += 1
+        self.updates += 1
+
+    def replace_last(self, close: float):
+        """장중에 저장된 마지막 봉이 확정 종가로 바뀐 경우"""
+        if self.prev_close is None:
+            self.first_close = close
+        else:
+            self._add(self.last_close / self.prev_close - 1, -1)
+            self._add(close / self.prev_close - 1)
+        self.last_close = close
+        self.updates += 1
+
+    def drop_first(self, next_date: str, next_close: float):
+        """구간 시작일이 지나 가장 오래된 봉을 뺀다"""
+        self._add(next_close / self.first_close - 1, -1)
+        self.first_date, self.first_close = next_date, next_close
+        self.rows -= 1
+        if self.rows == 1:
+            self.prev_close = None
+        self.updates += 1
+
+    @property
+    def volatility(self) -> float:
+        if self.count < 2:
+            return math.nan
+        variance = (self.squares - self.total * self.total / self.count) / (self.count - 1)
+        return math.sqrt(max(variance, 0.0))
+
+class IncrementalScreener:
+    """티커별 가격 상태를 캐시에 보관해 새 봉만 반영하고, 입력이 그대로인 티커는 다시 계산하지 않는다
+
+    전체 재계산(analyze_universe)과 같은 score_universe 를 쓰므로 결과가 같다.
+    """
+
+    def __init__(self, cache: MarketDataCache = market_cache):
+        self.cache = cache
+        # 티커 -> (입력 키, 결과 행 또는 분석 불가 시 None)
+        self._results: Dict[str, Tuple[Tuple, Optional[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def _advance(self, ticker: str, state: Optional[PriceState], since: Optional[str],
+                 conn) -> Tuple[Optional[PriceState], str]:
+        """상태를 현재 캐시 가격과 구간에 맞춘다. (새 상태, 'unchanged'|'updated'|'rebuilt')"""
+        if state is not None and state.updates < REBUILD_INTERVAL:
+            result = self._slide(ticker, state, since, conn)
+            if result is not None:
+                return state, result
+        return PriceState.from_closes(self.cache.load_closes(ticker, since=since, conn=conn)), "rebuilt"
+
+    def _slide(self, ticker: str, state: PriceState, since: Optional[str], conn) -> Optional[str]:
+        """새 봉 추가와 오래된 봉 제거를 O(새 봉 수) 로 반영. 이어 붙일 수 없으면 None"""
+        updated = False
+        tail = self.cache.load_closes(ticker, since=state.last_date, conn=conn)
+        if not tail or tail[0][0] != state.last_date:
+            return None
+        if tail[0][1] != state.last_close:
+            state.replace_last(tail[0][1])
+            updated = True
+        for date, close in tail[1:]:
+            state.append(date, close)
+            updated = True
+        if since is not None and state.first_date < since:
+            head = self.cache.load_closes(ticker, since=state.first_date, until=since, conn=conn)
+            head += self.cache.load_closes(ticker, since=since, limit=1, conn=conn)
+            if len(head) < 2 or head[0] != (state.first_date, state.first_close) or head[-1][0] < since:
+                return None
+            for date, close in head[1:]:
+                state.drop_first(date, close)
+            updated = True
+        return "updated" if updated else "unchanged"
+
+    def update_prices(self, tickers: List[str], period: str = "5y",
+                      since: Optional[pd.Timestamp] = None) -> Dict[str, PriceState]:
+        """캐시에 반영된 가격으로 티커별 상태를 갱신해 분석 가능한 티커의 상태 반환"""
+        since = stock.period_start(period) if since is None else since
+        since = since.strftime("%Y-%m-%d") if since is not None else None
+        stored = self.cache.load_states(tickers)
+        states, changed = {}, {}
+        counts = {"unchanged": 0, "updated": 0, "rebuilt": 0}
+        with self.cache.reader() as conn:
+            for ticker in tickers:
+                state = PriceState(**stored[ticker]) if ticker in stored else None
+                state, result = self._advance(ticker, state, since, conn)
+                counts[result] += 1
+                if result != "unchanged":
+                    changed[ticker] = asdict(state) if state is not None else None
+                if state is not None:
+                    states[ticker] = state
+        self.cache.store_states(changed)
+        for result, count in counts.items():
+            metrics.inc("rescreen_tickers_total", count, result=result)
+        logger.info(f"Price states updated | unchanged: {counts['unchanged']}, updated: {counts['updated']}, "
+                    f"rebuilt: {counts['rebuilt']}")
+        return states
+
+    def score(self, states: Dict[str, PriceState], info_frame: pd.DataFrame,
+              safety_margin_threshold: float = 0.3) -> pd.DataFrame:
+        """상태와 info 로 지표를 계산. 가격 상태, info 지문, 산업 P/E 표가 지난번과 같은 티커는 이전 결과를 쓴다"""
+        tickers = pd.Index([ticker for ticker in states if ticker in info_frame.index])
+        if tickers.empty:
+            return pd.DataFrame()
+        info = info_frame.loc[tickers, INFO_FIELDS]
+        fingerprints = pd.util.hash_pandas_object(info.astype(str), index=False).to_numpy()
+        pe_version = stock.industry_pe_version()
+        keys = {
+            ticker: (states[ticker].first_date, states[ticker].first_close, states[ticker].last_date,
+                     states[ticker].last_close, int(fingerprint), safety_margin_threshold, pe_version)
+            for ticker, fingerprint in zip(tickers, fingerprints)
+        }
+        with self._lock:
+            stale = pd.Index([ticker for ticker in tickers if self._results.get(ticker, (None,))[0] != keys[ticker]])
+        metrics.inc("rescreen_scored_total", len(stale), result="scored")
+        metrics.inc("rescreen_scored_total", len(tickers) - len(stale), result="skipped")
+        if not stale.empty:
+            selected = [states[ticker] for ticker in stale]
+            scored = score_universe(
+                stale, info.loc[stale], safety_margin_threshold,
+                has_data=np.ones(len(stale), dtype=bool),
+                first_close=np.array([state.first_close for state in selected]),
+                current_price=np.array([state.last_close for state in selected]),
+                rows=np.array([state.rows for state in selected], dtype=float),
+                volatility=np.array([state.volatility for state in selected]),
+            )
+            rows = scored.to_dict("index")
+            with self._lock:
+                for ticker in stale:
+                    self._results[ticker] = (keys[ticker], rows.get(ticker))
+        with self._lock:
+            records = [self._results[ticker][1] for ticker in tickers]
+        records = [record for record in records if record is not None]
+        if not records:
+            return pd.DataFrame()
+        result = pd.DataFrame.from_records(records)
+        result.index = pd.Index(result["ticker"], name=None)
+        # 종목군 구성은 가격과 무관하게 바뀌므로 매번 다시 표시
+        result["is_nasdaq100"] = result.index.isin(universes.get("nasdaq").members())
+        result["is_sp500"] = result.index.isin(universes.get("sp500").members())
+        return result
+
+screener = IncrementalScreener()
@@ -0,0 +1,199 @@
+import asyncio
+import bisect
+import functools
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from app.utils.http import http_stats
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+# 지연 시간 히스토그램 버킷 상한 (초)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+def _label_key(labels: Dict[str, str]) -> LabelKey:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{value}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+class Histogram:
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """버킷 상한으로 근사한 분위수"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float("inf")
+
+class MetricsRegistry:
+    """카운터, 게이지, 지연 시간 히스토그램을 스레드 안전하게 모으는 저장소"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+        self._gauges: Dict[str, Dict[LabelKey, float]] = defaultdict(dict)
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = defaultdict(dict)
+
+    def inc(self, name: str, value: float = 1, **labels):
+        with self._lock:
+            self._counters[name][_label_key(labels)] += value
+
+    def set(self, name: str, value: float, **labels):
+        with self._lock:
+            self._gauges[name][_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            histogram = self._histograms[name].get(key)
+            if histogram is None:
+                histogram = self._histograms[name][key] = Histogram()
+            histogram.observe(value)
+
+    def cache_result(self, cache: str, hit: bool):
+        self.inc("cache_requests_total", cache=cache, result="hit" if hit else "miss")
+
+    @contextmanager
+    def span(self, operation: str):
+        """블록의 소요 시간과 예외 수를 operation 라벨로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.inc("operation_errors_total", operation=operation)
+            raise
+        finally:
+            self.observe("operation_seconds", time.perf_counter() - start, operation=operation)
+
+    def timed(self, operation: str):
+        """동기/비동기 함수 전체를 span 으로 감싸는 데코레이터"""
+        def decorator(func):
+            if asyncio.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def async_wrapper(*args, **kwargs):
+                    with self.span(operation):
+                        return await func(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(operation):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def render_prometheus(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE dhandho_{name} counter")
+                lines.extend(f"dhandho_{name}{_format_labels(key)} {value:g}" for key, value in series.items())
+            for name, series in sorted(self._gauges.items()):
+                lines.append(f"# TYPE dhandho_{name} gauge")
+                lines.extend(f"dhandho_{name}{_format_labels(key)} {value:g}" for key, value in series.items())
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE dhandho_{name} histogram")
+                for key, histogram in series.items():
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        bucket_labels = _format_labels(key, 'le="' + le + '"')
+                        lines.append(f"dhandho_{name}_bucket{bucket_labels} {cumulative}")
+                    lines.append(f"dhandho_{name}_sum{_format_labels(key)} {histogram.total:g}")
+                    lines.append(f"dhandho_{name}_count{_format_labels(key)} {histogram.count}")
+        for host, stats in http_stats.snapshot().items():
+            for field in ("requests", "connections", "errors"):
+                lines.append(f'dhandho_http_{field}_total{{host="{host}"}} {stats[field]}')
+        return "\n".join(lines) + "\n"
+
+    def render_summary(self) -> str:
+        """/stats 명령어용 요약"""
+        lines = ["⏱ 처리 시간 (건수 / 평균 / p50 / p95)"]
+        with self._lock:
+            for key, histogram in sorted(self._histograms.get("operation_seconds", {}).items()):
+                operation = dict(key).get("operation", "?")
+                average = histogram.total / histogram.count if histogram.count else 0.0
+                lines.append(
+                    f"{operation}: {histogram.count} / {average * 1000:.0f}ms / "
+                    f"≤{histogram.quantile(0.5) * 1000:g}ms / ≤{histogram.quantile(0.95) * 1000:g}ms"
+                )
+            lines.append("\n💾 캐시 적중률")
+            caches = defaultdict(lambda: {"hit": 0.0, "miss": 0.0})
+            for key, value in self._counters.get("cache_requests_total", {}).items():
+                labels = dict(key)
+                caches[labels["cache"]][labels["result"]] += value
+            for cache, counts in sorted(caches.items()):
+                total = counts["hit"] + counts["miss"]
+                if not total:
+                    # 빈 목록 호출은 0 을 더하므로 조회가 없었던 캐시는 건너뛴다
+                    continue
+                lines.append(f"{cache}: {counts['hit'] / total * 100:.1f}% ({counts['hit']:g}/{total:g})")
+            lines.append("\n❗ 오류")
+            for name in ("source_errors_total", "operation_errors_total"):
+                for key, value in sorted(self._counters.get(name, {}).items()):
+                    lines.append(f"{'/'.join(v for _, v in key)}: {value:g}")
+            for key, value in self._gauges.get("screening_tickers_per_second", {}).items():
+                lines.append(f"\n🚀 최근 스크리닝 처리량 ({dict(key).get('market', '?')}): {value:.1f} 종목/초")
+            series_bytes = self._gauges.get("price_series_cache_bytes", {}).get(())
+            if series_bytes is not None:
+                entries = self._gauges["price_series_cache_entries"][()]
+                limit = self._gauges["price_series_cache_limit_bytes"][()]
+                lines.append(
+                    f"\n📦 가격 이력 메모리: {entries:g} 종목 / {series_bytes / 2**20:.1f}MB "
+                    f"(한도 {limit / 2**20:.0f}MB, 종목당 {series_bytes / entries / 1024 if entries else 0:.1f}KB)"
+                )
+        lines.append("\n🌐 HTTP (요청 / 새 연결 / 평균)")
+        for host, stats in http_stats.snapshot().items():
+            lines.append(f"{host}: {stats['requests']} / {stats['connections']} / {stats['avg_ms']}ms")
+        return "\n".join(lines)
+
+metrics = MetricsRegistry()
+
+def start_metrics_server(port: int) -> ThreadingHTTPServer:
+    """Prometheus 텍스트 형식의 /metrics 엔드포인트를 백그라운드 스레드에서 제공"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = metrics.render_prometheus().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics", daemon=True).start()
+    logger.info(f"Metrics endpoint listening on :{port}/metrics")
+    return server
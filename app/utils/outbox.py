@@ -0,0 +1,285 @@
+import asyncio
+import heapq
+import itertools
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+import telegram.error
+from app.config.config import TELEGRAM_CHAT_BURST, TELEGRAM_CHAT_RATE, TELEGRAM_GLOBAL_RATE
+from app.utils.metrics import metrics
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+# 텔레그램 메시지 최대 길이
+MESSAGE_LIMIT = 4096
+
+# 전송 우선순위: 숫자가 작을수록 먼저 보낸다
+INTERACTIVE = 0
+BROADCAST = 1
+PRIORITIES = (INTERACTIVE, BROADCAST)
+
+def retry_after_seconds(error: telegram.error.RetryAfter) -> float:
+    """버전에 따라 int 또는 timedelta 인 retry_after 를 초 단위로 변환"""
+    value = error.retry_after
+    return value.total_seconds() if hasattr(value, "total_seconds") else float(value)
+
+class TokenBucket:
+    """초당 rate 개씩 채워지고 최대 capacity 개까지 쌓이는 토큰 버킷"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def ready_at(self, now: float) -> float:
+        self._refill(now)
+        return now if self.tokens >= 1 else now + (1 - self.tokens) / self.rate
+
+    def take(self, now: float):
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause(self, seconds: float, now: float):
+        """seconds 동안 토큰이 생기지 않도록 비운다"""
+        self._refill(now)
+        self.tokens = min(self.tokens, 1 - seconds * self.rate)
+
+@dataclass
+class _Outgoing:
+    kind: str  # "send" | "reply" | "edit"
+    chat_id: Any
+    target: Any  # send 는 bot, reply/edit 는 대상 메시지
+    text: str
+    kwargs: Dict[str, Any]
+    priority: int
+    coalesce: bool
+    future: asyncio.Future = field(repr=False)
+
+    def call(self):
+        if self.kind == "send":
+            return self.target.send_message(chat_id=self.chat_id, text=self.text, **self.kwargs)
+        if self.kind == "reply":
+            return self.target.reply_text(self.text, **self.kwargs)
+        return self.target.edit_text(self.text, **self.kwargs)
+
+    def merge(self, other: "_Outgoing") -> bool:
+        """아직 보내지 않은 같은 대상의 짧은 메시지는 한 통으로 합친다"""
+        if not (self.coalesce and other.coalesce and self.kind == other.kind and self.target is other.target):
+            return False
+        if self.kwargs or other.kwargs or len(self.text) + 1 + len(other.text) > MESSAGE_LIMIT:
+            return False
+        self.text += "\n" + other.text
+        return True
+
+class SendQueue:
+    """모든 텔레그램 전송을 거치는 중앙 스케줄러
+
+    전체/채팅별 토큰 버킷으로 속도를 맞추고, 대화형 응답을 방송보다 먼저 보내며, RetryAfter 를 받으면
+    그만큼 쉬었다가 같은 메시지를 다시 보낸다. 같은 채팅의 메시지는 보낸 순서대로 하나씩 전송하고,
+    대기 중인 짧은 메시지는 합치며 같은 메시지에 대한 수정은 최신 내용 하나만 남긴다.
+    """
+
+    def __init__(self, global_rate: float = TELEGRAM_GLOBAL_RATE, chat_rate: float = TELEGRAM_CHAT_RATE,
+                 chat_burst: float = TELEGRAM_CHAT_BURST):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reset()
+
+    def _reset(self):
+        self._worker: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._global = TokenBucket(self.global_rate, self.global_rate)
+        self._chats: Dict[Any, TokenBucket] = {}
+        # (채팅, 우선순위) 별 대기열과 우선순위별 (준비 시각, 순번, 채팅) 힙
+        self._pending: Dict[Tuple[Any, int], Deque[_Outgoing]] = {}
+        self._ready: Dict[int, List[Tuple[float, int, Any]]] = {priority: [] for priority in PRIORITIES}
+        self._scheduled: Set[Tuple[Any, int]] = set()
+        self._busy: Set[Any] = set()
+        self._edits: Dict[Tuple[Any, Any], _Outgoing] = {}
+        self._sending: Set[asyncio.Task] = set()
+        self._seq = itertools.count()
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._reset()
+            self._loop = loop
+            self._wakeup = asyncio.Event()
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+
+    def _bucket(self, chat_id) -> TokenBucket:
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_rate, self.chat_burst)
+        return bucket
+
+    def _schedule(self, chat_id, priority: int):
+        key = (chat_id, priority)
+        if key in self._scheduled or chat_id in self._busy or key not in self._pending:
+            return
+        self._scheduled.add(key)
+        ready_at = self._bucket(chat_id).ready_at(time.monotonic())
+        heapq.heappush(self._ready[priority], (ready_at, next(self._seq), chat_id))
+        self._wakeup.set()
+
+    def _enqueue(self, item: _Outgoing) -> asyncio.Future:
+        self._ensure_worker()
+        if item.kind == "edit":
+            edit_key = (item.chat_id, item.target.message_id)
+            pending = self._edits.get(edit_key)
+            if pending is not None:
+                pending.text, pending.kwargs = item.text, item.kwargs
+                metrics.inc("telegram_coalesced_total", kind="edit")
+                return pending.future
+            self._edits[edit_key] = item
+        key = (item.chat_id, item.priority)
+        queue = self._pending.setdefault(key, deque())
+        if queue and queue[-1].merge(item):
+            metrics.inc("telegram_coalesced_total", kind=item.kind)
+            return queue[-1].future
+        queue.append(item)
+        self._schedule(item.chat_id, item.priority)
+        return item.future
+
+    def _next(self) -> Tuple[Optional[_Outgoing], Optional[float]]:
+        """지금 보낼 수 있는 메시지, 없으면 다음 메시지까지 기다릴 시간"""
+        now = time.monotonic()
+        earliest = None
+        for priority in PRIORITIES:
+            heap = self._ready[priority]
+            while heap:
+                ready_at, _, chat_id = heap[0]
+                if chat_id in self._busy:
+                    # 전송 중인 채팅은 끝난 뒤 다시 예약된다
+                    heapq.heappop(heap)
+                    self._scheduled.discard((chat_id, priority))
+                    continue
+                actual = self._bucket(chat_id).ready_at(now)
+                if actual > ready_at:
+                    # 다른 우선순위 전송으로 토큰을 썼다면 다시 줄 세운다
+                    heapq.heapreplace(heap, (actual, next(self._seq), chat_id))
+                    continue
+                break
+            if not heap:
+                continue
+            ready_at, _, chat_id = heap[0]
+            if ready_at > now:
+                earliest = ready_at if earliest is None else min(earliest, ready_at)
+                continue
+            global_ready = self._global.ready_at(now)
+            if global_ready > now:
+                return None, global_ready - now
+            heapq.heappop(heap)
+            key = (chat_id, priority)
+            self._scheduled.discard(key)
+            queue = self._pending[key]
+            item = queue.popleft()
+            if not queue:
+                del self._pending[key]
+            if item.kind == "edit" and self._edits.get((chat_id, item.target.message_id)) is item:
+                del self._edits[(chat_id, item.target.message_id)]
+            self._global.take(now)
+            self._bucket(chat_id).take(now)
+            self._busy.add(chat_id)
+            return item, None
+        return None, None if earliest is None else earliest - now
+
+    async def _run(self):
+        while True:
+            item, delay = self._next()
+            if item is not None:
+                task = asyncio.create_task(self._dispatch(item))
+                self._sending.add(task)
+                task.add_done_callback(self._sending.discard)
+                continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _dispatch(self, item: _Outgoing):
+        try:
+            with metrics.span("telegram_send"):
+                result = await item.call()
+        except telegram.error.RetryAfter as e:
+            seconds = retry_after_seconds(e)
+            logger.warning(f"Telegram flood limit hit, retrying chat {item.chat_id} in {seconds:.1f}s")
+            metrics.inc("telegram_retry_after_total")
+            self.pause(seconds)
+            # 버리지 않고 같은 채팅 대기열의 맨 앞으로 되돌린다
+            self._pending.setdefault((item.chat_id, item.priority), deque()).appendleft(item)
+            if item.kind == "edit":
+                self._edits.setdefault((item.chat_id, item.target.message_id), item)
+        except Exception as e:
+            if not item.future.done():
+                item.future.set_exception(e)
+        else:
+            if not item.future.done():
+                item.future.set_result(result)
+        finally:
+            self._busy.discard(item.chat_id)
+            for priority in PRIORITIES:
+                self._schedule(item.chat_id, priority)
+            self._prune()
+
+    def _prune(self):
+        # 토큰이 가득 찬 유휴 채팅의 버킷은 처음 만든 것과 같으므로 지운다
+        if len(self._chats) < 10000:
+            return
+        now = time.monotonic()
+        idle = {chat_id for chat_id, _ in self._pending} | self._busy
+        for chat_id, bucket in list(self._chats.items()):
+            if chat_id not in idle and bucket.ready_at(now) <= now and bucket.tokens >= bucket.capacity:
+                del self._chats[chat_id]
+
+    def pause(self, seconds: float):
+        """RetryAfter 를 받았을 때 모든 전송을 seconds 동안 멈춘다"""
+        if self._wakeup is None:
+            return
+        self._global.pause(seconds, time.monotonic())
+        self._wakeup.set()
+
+    def submit(self, bot, chat_id, text: str, priority: int = INTERACTIVE, coalesce: bool = True,
+               **kwargs) -> asyncio.Future:
+        """전송을 예약하고 결과 메시지를 돌려줄 Future 반환"""
+        future = asyncio.get_running_loop().create_future()
+        return self._enqueue(_Outgoing("send", chat_id, bot, text, kwargs, priority, coalesce, future))
+
+    async def send(self, bot, chat_id, text: str, priority: int = INTERACTIVE, coalesce: bool = True, **kwargs):
+        return await asyncio.shield(self.submit(bot, chat_id, text, priority, coalesce, **kwargs))
+
+    async def reply(self, message, text: str, priority: int = INTERACTIVE, coalesce: bool = True, **kwargs):
+        future = asyncio.get_running_loop().create_future()
+        item = _Outgoing("reply", message.chat_id, message, text, kwargs, priority, coalesce, future)
+        return await asyncio.shield(self._enqueue(item))
+
+    async def edit(self, message, text: str, priority: int = INTERACTIVE, **kwargs):
+        future = asyncio.get_running_loop().create_future()
+        item = _Outgoing("edit", message.chat_id, message, text, kwargs, priority, False, future)
+        return await asyncio.shield(self._enqueue(item))
+
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._pending.values()) + len(self._sending)
+
+    async def close(self, timeout: float = 10.0):
+        """남은 메시지를 최대 timeout 초 동안 보낸 뒤 스케줄러 종료"""
+        if self._worker is None:
+            return
+        deadline = time.monotonic() + timeout
+        while self.pending() and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        self._worker.cancel()
+        self._worker = None
+
+outbox = SendQueue()
@@ -108,4 +108,150 @@ SECTOR_FALLBACK = {
     "Energy": "Oil/Gas (Production and Exploration)",
     "Utilities": "Power",
     "Financials": "Banks (Regional)",
-}
\ No newline at end of file
+    # yfinance 섹터명
+    "Financial Services": "Banks (Regional)",
+    "Consumer Cyclical": "Retail (Special Lines)",
+    "Consumer Defensive": "Food Processing",
+    "Basic Materials": "Chemical (Diversified)",
+    "Real Estate": "R.E.I.T.",
+}
+# yfinance 산업명 -> Stern 산업명 수동 대응표 (정규화/유사도 매칭보다 우선)
+YFINANCE_INDUSTRY_OVERRIDES = {
+    "Advertising Agencies": "Advertising",
+    "Aerospace & Defense": "Aerospace/Defense",
+    "Agricultural Inputs": "Chemical (Basic)",
+    "Airlines": "Air Transport",
+    "Airports & Air Services": "Air Transport",
+    "Aluminum": "Metals & Mining",
+    "Apparel Manufacturing": "Apparel",
+    "Apparel Retail": "Retail (Special Lines)",
+    "Asset Management": "Investments & Asset Management",
+    "Auto Manufacturers": "Auto & Truck",
+    "Auto & Truck Dealerships": "Retail (Automotive)",
+    "Banks - Diversified": "Bank (Money Center)",
+    "Banks - Regional": "Banks (Regional)",
+    "Beverages - Brewers": "Beverage (Alcoholic)",
+    "Beverages - Non-Alcoholic": "Beverage (Soft)",
+    "Beverages - Wineries & Distilleries": "Beverage (Alcoholic)",
+    "Biotechnology": "Drugs (Biotechnology)",
+    "Building Products & Equipment": "Building Materials",
+    "Business Equipment & Supplies": "Office Equipment & Services",
+    "Capital Markets": "Brokerage & Investment Banking",
+    "Chemicals": "Chemical (Diversified)",
+    "Coking Coal": "Coal & Related Energy",
+    "Communication Equipment": "Telecom. Equipment",
+    "Computer Hardware": "Computers/Peripherals",
+    "Confectioners": "Food Processing",
+    "Conglomerates": "Diversified",
+    "Consulting Services": "Business & Consumer Services",
+    "Consumer Electronics": "Electronics (General)",
+    "Copper": "Metals & Mining",
+    "Credit Services": "Financial Svcs. (Non-bank & Insurance)",
+    "Department Stores": "Retail (General)",
+    "Diagnostics & Research": "Healthcare Support Services",
+    "Discount Stores": "Retail (General)",
+    "Drug Manufacturers - General": "Drugs (Pharmaceutical)",
+    "Drug Manufacturers - Specialty & Generic": "Drugs (Pharmaceutical)",
+    "Education & Training Services": "Education",
+    "Electrical Equipment & Parts": "Electrical Equipment",
+    "Electronic Components": "Electronics (General)",
+    "Electronic Gaming & Multimedia": "Software (Entertainment)",
+    "Electronics & Computer Distribution": "Retail (Distributors)",
+    "Engineering & Construction": "Engineering/Construction",
+    "Farm & Heavy Construction Machinery": "Machinery",
+    "Farm Products": "Farming/Agriculture",
+    "Financial Conglomerates": "Financial Svcs. (Non-bank & Insurance)",
+    "Financial Data & Stock Exchanges": "Information Services",
+    "Food Distribution": "Food Wholesalers",
+    "Footwear & Accessories": "Shoe",
+    "Furnishings, Fixtures & Appliances": "Furn/Home Furnishings",
+    "Gambling": "Hotel/Gaming",
+    "Gold": "Precious Metals",
+    "Grocery Stores": "Retail (Grocery and Food)",
+    "Health Information Services": "Heathcare Information and Technology",
+    "Healthcare Plans": "Healthcare Support Services",
+    "Home Improvement Retail": "Retail (Building Supply)",
+    "Household & Personal Products": "Household Products",
+    "Industrial Distribution": "Retail (Distributors)",
+    "Information Technology Services": "Computer Services",
+    "Infrastructure Operations": "Transportation",
+    "Insurance - Diversified": "Insurance (General)",
+    "Insurance - Life": "Insurance (Life)",
+    "Insurance - Property & Casualty": "Insurance (Prop/Cas.)",
+    "Insurance - Reinsurance": "Reinsurance",
+    "Insurance - Specialty": "Insurance (General)",
+    "Insurance Brokers": "Insurance (General)",
+    "Integrated Freight & Logistics": "Transportation",
+    "Internet Content & Information": "Software (Internet)",
+    "Internet Retail": "Retail (Special Lines)",
+    "Leisure": "Recreation",
+    "Lodging": "Hotel/Gaming",
+    "Lumber & Wood Production": "Paper/Forest Products",
+    "Luxury Goods": "Apparel",
+    "Marine Shipping": "Shipbuilding & Marine",
+    "Medical Care Facilities": "Hospitals/Healthcare Facilities",
+    "Medical Devices": "Healthcare Products",
+    "Medical Distribution": "Healthcare Support Services",
+    "Medical Instruments & Supplies": "Healthcare Products",
+    "Metal Fabrication": "Machinery",
+    "Mortgage Finance": "Financial Svcs. (Non-bank & Insurance)",
+    "Oil & Gas Drilling": "Oilfield Svcs/Equip.",
+    "Oil & Gas E&P": "Oil/Gas (Production and Exploration)",
+    "Oil & Gas Equipment & Services": "Oilfield Svcs/Equip.",
+    "Oil & Gas Integrated": "Oil/Gas (Integrated)",
+    "Oil & Gas Midstream": "Oil/Gas Distribution",
+    "Oil & Gas Refining & Marketing": "Oil/Gas (Integrated)",
+    "Other Industrial Metals & Mining": "Metals & Mining",
+    "Other Precious Metals & Mining": "Precious Metals",
+    "Packaged Foods": "Food Processing",
+    "Packaging & Containers": "Packaging & Container",
+    "Paper & Paper Products": "Paper/Forest Products",
+    "Personal Services": "Business & Consumer Services",
+    "Pharmaceutical Retailers": "Retail (Special Lines)",
+    "Pollution & Treatment Controls": "Environmental & Waste Services",
+    "Publishing": "Publishing & Newspapers",
+    "Railroads": "Transportation (Railroads)",
+    "Real Estate - Development": "Real Estate (Development)",
+    "Real Estate - Diversified": "Real Estate (General/Diversified)",
+    "Real Estate Services": "Real Estate (Operations & Services)",
+    "Recreational Vehicles": "Recreation",
+    "REIT - Diversified": "R.E.I.T.",
+    "REIT - Healthcare Facilities": "R.E.I.T.",
+    "REIT - Hotel & Motel": "R.E.I.T.",
+    "REIT - Industrial": "R.E.I.T.",
+    "REIT - Mortgage": "R.E.I.T.",
+    "REIT - Office": "R.E.I.T.",
+    "REIT - Residential": "R.E.I.T.",
+    "REIT - Retail": "Retail (REITs)",
+    "REIT - Specialty": "R.E.I.T.",
+    "Rental & Leasing Services": "Business & Consumer Services",
+    "Residential Construction": "Homebuilding",
+    "Resorts & Casinos": "Hotel/Gaming",
+    "Restaurants": "Restaurant/Dining",
+    "Scientific & Technical Instruments": "Electronics (General)",
+    "Security & Protection Services": "Business & Consumer Services",
+    "Semiconductor Equipment & Materials": "Semiconductor Equip",
+    "Semiconductors": "Semiconductor",
+    "Silver": "Precious Metals",
+    "Software - Application": "Software (System & Application)",
+    "Software - Infrastructure": "Software (System & Application)",
+    "Solar": "Green & Renewable Energy",
+    "Specialty Business Services": "Business & Consumer Services",
+    "Specialty Chemicals": "Chemical (Specialty)",
+    "Specialty Industrial Machinery": "Machinery",
+    "Specialty Retail": "Retail (Special Lines)",
+    "Staffing & Employment Services": "Business & Consumer Services",
+    "Telecom Services": "Telecom. Services",
+    "Textile Manufacturing": "Apparel",
+    "Thermal Coal": "Coal & Related Energy",
+    "Tools & Accessories": "Machinery",
+    "Travel Services": "Hotel/Gaming",
+    "Uranium": "Coal & Related Energy",
+    "Utilities - Diversified": "Utility (General)",
+    "Utilities - Independent Power Producers": "Power",
+    "Utilities - Regulated Electric": "Utility (General)",
+    "Utilities - Regulated Gas": "Utility (General)",
+    "Utilities - Regulated Water": "Utility (Water)",
+    "Utilities - Renewable": "Green & Renewable Energy",
+    "Waste Management": "Environmental & Waste Services",
+}
@@ -0,0 +1,177 @@
+import csv
+import difflib
+import os
+import re
+import threading
+import time
+from typing import Dict, FrozenSet, Optional, Tuple
+from app.config.config import STERN_PE_COLUMN, STERN_PE_PATH
+from app.utils.pe_mapping import INDUSTRY_PE, SECTOR_FALLBACK, YFINANCE_INDUSTRY_OVERRIDES
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+# 어느 것과도 충분히 비슷하지 않으면 섹터 대체 산업을 쓴다
+MIN_MATCH_SCORE = 0.6
+DEFAULT_PE = 20.0
+FALLBACK_INDUSTRY = "Total Market"
+
+# 데이터 파일 변경 확인 간격 (초)
+RELOAD_CHECK_INTERVAL = 60
+
+ABBREVIATIONS = {
+    "svcs": "services", "svc": "services", "equip": "equipment", "furn": "furnishings",
+    "heathcare": "healthcare", "reits": "reit", "pharma": "pharmaceutical", "biotech": "biotechnology",
+}
+# yfinance 는 산업명 구분에 ' - ' 대신 em/en dash 를 쓰기도 한다 ("Drug Manufacturers—General")
+DASHES = re.compile(r"\s*[\u2013\u2014]\s*")
+STOP_WORDS = {"and", "the", "of", "general", "other", "diversified", "related", "products", "product"}
+
+def canonical_industry(name: str) -> str:
+    """dash 표기를 대응표의 ' - ' 로 맞춘다"""
+    return DASHES.sub(" - ", name.strip())
+
+def normalize(name: str) -> str:
+    """소문자, 약어 풀기, 구두점 제거, 단순 복수형 제거"""
+    name = canonical_industry(name).lower().replace("r.e.i.t.", "reit").replace("e&p", "exploration production")
+    tokens = []
+    for token in re.split(r"[^a-z0-9]+", name):
+        for part in ABBREVIATIONS.get(token, token).split():
+            if len(part) > 3 and part.endswith("s") and not part.endswith("ss"):
+                part = part[:-1]
+            tokens.append(part)
+    return " ".join(tokens)
+
+def _tokens(normalized: str) -> FrozenSet[str]:
+    return frozenset(token for token in normalized.split() if token not in STOP_WORDS)
+
+def load_stern_table(path: str, column: str = STERN_PE_COLUMN) -> Dict[str, Optional[float]]:
+    """NYU Stern pedata 파일(CSV)에서 산업명 -> P/E 표를 읽는다
+
+    원본 엑셀을 CSV 로 저장한 파일처럼 머리말 줄이 앞에 있어도 'Industry Name' 행부터 표로 읽는다.
+    'NA' 등 숫자가 아닌 값은 None 으로 둔다.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = list(csv.reader(f))
+    header_index = next(i for i, row in enumerate(rows) if any(cell.strip() == "Industry Name" for cell in row))
+    header = [cell.strip() for cell in rows[header_index]]
+    name_position = header.index("Industry Name")
+    pe_position = header.index(column)
+    table: Dict[str, Optional[float]] = {}
+    for row in rows[header_index + 1:]:
+        if len(row) <= max(name_position, pe_position) or not row[name_position].strip():
+            continue
+        try:
+            pe: Optional[float] = float(row[pe_position].replace(",", ""))
+        except ValueError:
+            pe = None
+        table[row[name_position].strip()] = pe
+    return table
+
+class IndustryPEResolver:
+    """yfinance 산업명을 Stern 산업 분류에 대응시켜 산업 P/E 를 돌려주는 색인
+
+    정확히 같은 이름, 수동 대응표, 정규화한 이름 일치, 토큰/문자열 유사도 순으로 찾고, 찾지 못하면 섹터 대체
+    산업을 쓴다. 결과는 (산업, 섹터) 별로 메모이즈하며, 대응하지 못한 이름은 처음 한 번만 기록한다.
+    """
+
+    def __init__(self, table: Dict[str, Optional[float]], overrides: Dict[str, str] = YFINANCE_INDUSTRY_OVERRIDES,
+                 sector_fallback: Dict[str, str] = SECTOR_FALLBACK, source: Optional[str] = None,
+                 column: str = STERN_PE_COLUMN):
+        self.overrides = {canonical_industry(industry): name for industry, name in overrides.items()}
+        self.sector_fallback = sector_fallback
+        self.source = source
+        self.column = column
+        self._source_mtime = os.path.getmtime(source) if source else None
+        self._checked_at = time.time()
+        self._lock = threading.Lock()
+        self.version = 0
+        self._build(table)
+
+    def _build(self, table: Dict[str, Optional[float]]):
+        # 값이 없는(NA) 산업은 대응 대상에서 뺀다
+        self.table = {name: float(pe) for name, pe in table.items() if pe is not None}
+        self._normalized = {normalize(name): name for name in self.table}
+        self._token_index = {name: _tokens(normalized) for normalized, name in self._normalized.items()}
+        self._memo: Dict[Tuple[str, str], Tuple[str, float, str]] = {}
+        # 표를 다시 읽을 때마다 올려 P/E 로 계산한 결과를 보관하는 쪽이 무효화할 수 있게 한다
+        self.version += 1
+
+    @classmethod
+    def from_file(cls, path: str, column: str = STERN_PE_COLUMN, **kwargs) -> "IndustryPEResolver":
+        return cls(load_stern_table(path, column), source=path, column=column, **kwargs)
+
+    def _match(self, industry: str) -> Tuple[Optional[str], str]:
+        """(Stern 산업명, 방법). 찾지 못하면 (None, 'unmatched')"""
+        industry = canonical_industry(industry)
+        if industry in self.table:
+            return industry, "exact"
+        override = self.overrides.get(industry)
+        if override in self.table:
+            return override, "override"
+        normalized = normalize(industry)
+        if normalized in self._normalized:
+            return self._normalized[normalized], "normalized"
+        tokens = _tokens(normalized)
+        best, best_score = None, 0.0
+        for name, candidate in self._token_index.items():
+            overlap = 2 * len(tokens & candidate) / (len(tokens) + len(candidate)) if tokens and candidate else 0.0
+            ratio = difflib.SequenceMatcher(None, normalized, normalize(name)).ratio()
+            score = 0.7 * overlap + 0.3 * ratio
+            if score > best_score:
+                best, best_score = name, score
+        if best is not None and best_score >= MIN_MATCH_SCORE:
+            return best, "fuzzy"
+        return None, "unmatched"
+
+    def resolve(self, industry: str, sector: str) -> Tuple[str, float, str]:
+        """(Stern 산업명, 조정 전 P/E, 방법)"""
+        key = (industry, sector)
+        resolved = self._memo.get(key)
+        if resolved is not None:
+            return resolved
+        name, method = self._match(industry) if industry and industry != "Default" else (None, "unmatched")
+        if name is None:
+            name = self.sector_fallback.get(sector, FALLBACK_INDUSTRY)
+            method = "sector"
+            if name not in self.table:
+                name = FALLBACK_INDUSTRY
+            logger.info(f"Industry '{industry}' not mapped, using sector fallback '{name}' for sector '{sector}'")
+        resolved = (name, self.table.get(name, DEFAULT_PE), method)
+        with self._lock:
+            self._memo[key] = resolved
+        return resolved
+
+    def pe(self, industry: str, sector: str) -> float:
+        self.refresh_if_changed()
+        return self.resolve(industry, sector)[1]
+
+    def refresh_if_changed(self):
+        """데이터 파일이 바뀌었으면 표를 다시 읽고 메모를 비운다 (확인은 최대 RELOAD_CHECK_INTERVAL 초마다)"""
+        if not self.source or time.time() - self._checked_at < RELOAD_CHECK_INTERVAL:
+            return
+        self._checked_at = time.time()
+        try:
+            mtime = os.path.getmtime(self.source)
+            if mtime == self._source_mtime:
+                return
+            table = load_stern_table(self.source, self.column)
+            with self._lock:
+                self._build(table)
+                self._source_mtime = mtime
+            logger.info(f"Reloaded industry PE table from {self.source} | industries: {len(self.table)}")
+        except Exception as e:
+            logger.error(f"Failed to reload industry PE table from {self.source} | error: {e}")
+
+def build_resolver() -> IndustryPEResolver:
+    """Stern 데이터 파일이 있으면 그 표로, 없으면 내장 표로 만든다"""
+    if STERN_PE_PATH and os.path.exists(STERN_PE_PATH):
+        try:
+            resolver = IndustryPEResolver.from_file(STERN_PE_PATH)
+            logger.info(f"Loaded industry PE table from {STERN_PE_PATH} | industries: {len(resolver.table)}")
+            return resolver
+        except Exception as e:
+            logger.error(f"Failed to load industry PE table from {STERN_PE_PATH}, using built-in table | error: {e}")
+    return IndustryPEResolver(INDUSTRY_PE)
+
+industry_pe = build_resolver()
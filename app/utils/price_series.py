@@ -0,0 +1,104 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Hashable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from app.config.config import PRICE_SERIES_CACHE_BYTES
+from app.utils.metrics import metrics
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+@dataclass(frozen=True)
+class PriceSeries:
+    """분석에 필요한 종가만 담은 한 티커의 가격 이력 (날짜 datetime64[D], 종가 float32)
+
+    refreshed_at 은 이 이력을 읽어온 시세 캐시가 마지막으로 갱신된 시각이다.
+    """
+    ticker: str
+    dates: np.ndarray
+    closes: np.ndarray
+    refreshed_at: float
+
+    @classmethod
+    def from_rows(cls, ticker: str, rows: List[Tuple[str, float]], refreshed_at: float) -> "PriceSeries":
+        """시세 캐시의 (날짜, 종가) 목록으로 만든다. 종가가 없는 봉은 뺀다"""
+        dates = np.array([row[0] for row in rows], dtype="datetime64[D]")
+        closes = np.array([row[1] for row in rows], dtype=np.float64)
+        valid = ~np.isnan(closes)
+        return cls(ticker, dates[valid], closes[valid].astype(np.float32), refreshed_at)
+
+    def __len__(self) -> int:
+        return len(self.closes)
+
+    @property
+    def nbytes(self) -> int:
+        return self.dates.nbytes + self.closes.nbytes
+
+    def close(self) -> pd.Series:
+        """분석용 종가 시리즈 (계산은 float64 로, 호출마다 만드는 임시 객체)"""
+        return pd.Series(self.closes.astype(np.float64), index=pd.DatetimeIndex(self.dates, name="Date"), name="Close")
+
+class PriceSeriesCache:
+    """바이트 예산 안에서 PriceSeries 를 보관하는 LRU 캐시
+
+    항목 수가 아니라 배열 크기 합으로 한도를 재고, 넘으면 가장 오래 쓰이지 않은 항목부터 지운다.
+    예산보다 큰 항목 하나는 보관하지 않는다.
+    """
+
+    def __init__(self, max_bytes: int = PRICE_SERIES_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Hashable, PriceSeries]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[PriceSeries]:
+        with self._lock:
+            series = self._entries.get(key)
+            if series is not None:
+                self._entries.move_to_end(key)
+            return series
+
+    def put(self, key: Hashable, series: PriceSeries):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            if series.nbytes <= self.max_bytes:
+                self._entries[key] = series
+                self.nbytes += series.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+                self.evictions += 1
+            self._report()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+            self._report()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _report(self):
+        metrics.set("price_series_cache_bytes", self.nbytes)
+        metrics.set("price_series_cache_entries", len(self._entries))
+        metrics.set("price_series_cache_limit_bytes", self.max_bytes)
+
+    def stats(self) -> dict:
+        """보관 종목 수, 사용/한도 바이트, 종목당 평균 바이트, 누적 축출 수"""
+        with self._lock:
+            entries = len(self._entries)
+            return {
+                "entries": entries,
+                "bytes": self.nbytes,
+                "limit_bytes": self.max_bytes,
+                "bytes_per_ticker": self.nbytes / entries if entries else 0.0,
+                "evictions": self.evictions,
+            }
+
+price_series = PriceSeriesCache()
@@ -0,0 +1,187 @@
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+import telegram
+from telegram.ext import ContextTypes
+from app.config.config import CACHE_DIR, INFO_CACHE_TTL, WATCH_HYSTERESIS
+from app.utils.metrics import metrics
+from app.utils.outbox import BROADCAST, outbox
+from app.utils.stock import estimate_intrinsic_value, fetch_quotes, fetch_stock_info
+from app.utils.sqlite import SQLiteStore
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+@dataclass
+class Quote:
+    price: float
+    intrinsic_value: float
+
+    @property
+    def safety_margin(self) -> float:
+        return (self.intrinsic_value - self.price) / self.intrinsic_value * 100
+
+class WatchStore(SQLiteStore):
+    """채팅별 관심 종목, 알림 기준 안전마진(%), 마지막 판정(기준 이상 여부)을 보관하는 SQLite 저장소"""
+
+    def __init__(self, path: str):
+        super().__init__(
+            path,
+            """
+            CREATE TABLE IF NOT EXISTS watches (
+                chat_id INTEGER NOT NULL,
+                ticker TEXT NOT NULL,
+                margin REAL NOT NULL,
+                above INTEGER,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (chat_id, ticker)
+            );
+            CREATE INDEX IF NOT EXISTS watches_ticker ON watches (ticker);
+            """
+        )
+
+    def add(self, chat_id: int, ticker: str, margin: float, above: Optional[bool] = None):
+        """추가하거나 기준을 바꾼다. 판정 상태는 주어진 값으로 새로 시작"""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO watches VALUES (?, ?, ?, ?, ?)",
+                (chat_id, ticker, margin, above, time.time()),
+            )
+
+    def remove(self, chat_id: int, ticker: str) -> bool:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM watches WHERE chat_id = ? AND ticker = ?", (chat_id, ticker)).rowcount > 0
+
+    def remove_chat(self, chat_id: int):
+        with self._connect() as conn:
+            conn.execute("DELETE FROM watches WHERE chat_id = ?", (chat_id,))
+
+    def list(self, chat_id: int) -> List[Tuple[str, float]]:
+        """(티커, 기준 안전마진) 목록"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT ticker, margin FROM watches WHERE chat_id = ? ORDER BY ticker", (chat_id,)
+            ).fetchall()
+
+    def count(self, chat_id: int) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM watches WHERE chat_id = ?", (chat_id,)).fetchone()[0]
+
+    def tickers(self) -> List[str]:
+        """모든 채팅이 감시하는 티커의 합집합"""
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT ticker FROM watches ORDER BY ticker")]
+
+    def watches(self) -> List[Tuple[int, str, float, Optional[int]]]:
+        """(채팅, 티커, 기준, 판정) 전체"""
+        with self._connect() as conn:
+            return conn.execute("SELECT chat_id, ticker, margin, above FROM watches").fetchall()
+
+    def set_states(self, states: List[Tuple[bool, int, str]]):
+        """(판정, 채팅, 티커) 목록을 한 트랜잭션으로 반영"""
+        if not states:
+            return
+        with self._connect() as conn:
+            conn.executemany("UPDATE watches SET above = ? WHERE chat_id = ? AND ticker = ?", states)
+
+class PriceWatcher:
+    """관심 종목 전체의 시세를 주기적으로 한 번에 조회해 안전마진이 기준을 넘는 순간에만 알림을 만든다
+
+    시세 요청은 채팅 수와 관계없이 감시 티커의 합집합에 대해 청크 단위 일괄 요청으로 보내고, 내재가치는
+    info 캐시로 계산해 value_ttl 동안 재사용하므로 가격 이력을 다시 받지 않는다. 기준 이상이 된 뒤에는
+    기준보다 hysteresis(%p) 아래로 내려갔다가 다시 넘어야 다음 알림이 나간다.
+    """
+
+    def __init__(self, store: WatchStore, quote_fetcher: Callable[[List[str]], Dict[str, float]] = fetch_quotes,
+                 info_fetcher: Callable = fetch_stock_info, value_ttl: float = INFO_CACHE_TTL,
+                 hysteresis: float = WATCH_HYSTERESIS):
+        self.store = store
+        self.quote_fetcher = quote_fetcher
+        self.info_fetcher = info_fetcher
+        self.value_ttl = value_ttl
+        self.hysteresis = hysteresis
+        self._values: Dict[str, Tuple[Optional[float], float]] = {}
+        self._lock = threading.Lock()
+
+    def intrinsic_value(self, ticker: str, current_price: Optional[float] = None) -> Optional[float]:
+        with self._lock:
+            cached = self._values.get(ticker)
+        if cached is not None and time.time() - cached[1] < self.value_ttl:
+            return cached[0]
+        info = self.info_fetcher(ticker)
+        value = estimate_intrinsic_value(info, current_price) if info else None
+        with self._lock:
+            self._values[ticker] = (value if value and value > 0 else None, time.time())
+            return self._values[ticker][0]
+
+    def quotes(self, tickers: List[str]) -> Dict[str, Quote]:
+        """티커별 (현재가, 내재가치). 시세나 내재가치가 없는 티커는 빠진다"""
+        quotes = {}
+        for ticker, price in self.quote_fetcher(tickers).items():
+            value = self.intrinsic_value(ticker, price)
+            if value is not None:
+                quotes[ticker] = Quote(price, value)
+        return quotes
+
+    def is_above(self, quote: Quote, margin: float, previous: Optional[bool]) -> bool:
+        if previous:
+            return quote.safety_margin >= margin - self.hysteresis
+        return quote.safety_margin >= margin
+
+    def poll(self) -> List[Tuple[int, str, float, Quote]]:
+        """한 번 조회해 기준을 새로 넘은 (채팅, 티커, 기준, 시세) 목록을 돌려주고 판정을 저장"""
+        tickers = self.store.tickers()
+        if not tickers:
+            return []
+        quotes = self.quotes(tickers)
+        metrics.inc("watch_quotes_total", len(quotes))
+        alerts, changed = [], []
+        for chat_id, ticker, margin, above in self.store.watches():
+            quote = quotes.get(ticker)
+            if quote is None:
+                continue
+            now_above = self.is_above(quote, margin, bool(above))
+            if above is not None and now_above == bool(above):
+                continue
+            changed.append((now_above, chat_id, ticker))
+            # 처음 판정하는 경우에는 현재 상태만 기록하고 알리지 않는다
+            if now_above and above is not None:
+                alerts.append((chat_id, ticker, margin, quote))
+        self.store.set_states(changed)
+        logger.info(f"Polled {len(tickers)} watched tickers | quoted: {len(quotes)}, alerts: {len(alerts)}")
+        return alerts
+
+def format_alert(ticker: str, margin: float, quote: Quote) -> str:
+    return (
+        f"🔔 {ticker} 안전마진이 {margin:g}%를 넘었습니다\n"
+        f"현재가: ${quote.price:.2f}\n"
+        f"내재가치: ${quote.intrinsic_value:.2f}\n"
+        f"안전마진: {quote.safety_margin:.2f}%"
+    )
+
+async def watch_prices(context: ContextTypes.DEFAULT_TYPE):
+    """주기 작업: 관심 종목 시세를 확인해 기준을 넘은 채팅에만 알림 전송"""
+    try:
+        alerts = await asyncio.to_thread(watcher.poll)
+    except Exception as e:
+        logger.error(f"관심 종목 시세 확인 실패 | error: {e}")
+        return
+    pending = [
+        (chat_id, outbox.submit(context.bot, chat_id, format_alert(ticker, margin, quote), priority=BROADCAST))
+        for chat_id, ticker, margin, quote in alerts
+    ]
+    for chat_id, future in pending:
+        try:
+            await future
+        except telegram.error.Forbidden:
+            # 봇을 차단했거나 나간 채팅의 관심 종목은 지운다
+            watch_store.remove_chat(chat_id)
+            logger.info(f"사용자 {chat_id} 관심 종목 삭제 (전송 거부)")
+        except Exception as e:
+            logger.error(f"사용자 {chat_id} 관심 종목 알림 전송 실패 | error: {e}")
+
+watch_store = WatchStore(os.path.join(CACHE_DIR, "watches.sqlite3"))
+watcher = PriceWatcher(watch_store)
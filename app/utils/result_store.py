@@ -0,0 +1,173 @@
+import json
+import os
+import shutil
+import threading
+import time
+from typing import List, Optional
+import numpy as np
+import pandas as pd
+from app.config.config import CACHE_DIR, RESULT_RETENTION_DAYS
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+# 스냅샷 열과 저장 타입. 가격/비율은 float32 로 충분하다 (결과는 소수 둘째 자리로 반올림된 값)
+FLOAT_COLUMNS = ["current_price", "trailing_pe", "industry_pe", "intrinsic_value", "safety_margin",
+                 "pe_discount", "cagr", "score"]
+BOOL_COLUMNS = ["moat", "consistency", "track_record", "is_nasdaq100", "is_sp500", "buy_recommendation"]
+TICKER_DTYPE = "S12"
+
+def _ticker_array(tickers: np.ndarray) -> np.ndarray:
+    """티커 열. 모두 12바이트 이하 ASCII 면 S12, 아니면 잘리거나 인코딩 오류가 나지 않도록 유니코드로 저장"""
+    tickers = tickers.astype(str)
+    if all(ticker.isascii() for ticker in tickers) and max(map(len, tickers), default=0) <= np.dtype(TICKER_DTYPE).itemsize:
+        return tickers.astype(TICKER_DTYPE)
+    logger.warning(f"Snapshot tickers exceed {TICKER_DTYPE} (non-ASCII or longer than "
+                   f"{np.dtype(TICKER_DTYPE).itemsize} bytes), storing as {tickers.dtype}")
+    return tickers
+
+class ResultStore:
+    """스크리닝 결과를 (시장, 실행일) 별 열 단위 스냅샷으로 보관
+
+    스냅샷은 <directory>/<market>/<YYYY-MM-DD>/ 아래에 열마다 .npy 파일 하나로 저장되고 티커 순으로 정렬되어
+    있어, 메모리 매핑으로 필요한 열만 읽는다. 같은 날 다시 실행하면 그날의 스냅샷을 덮어쓴다.
+    """
+
+    def __init__(self, directory: str, retention_days: int = RESULT_RETENTION_DAYS):
+        self.directory = directory
+        self.retention_days = retention_days
+        self._lock = threading.Lock()
+
+    def _market_dir(self, market: str) -> str:
+        return os.path.join(self.directory, market)
+
+    def save(self, market: str, results: pd.DataFrame, run_date: Optional[str] = None) -> Optional[str]:
+        if results.empty:
+            return None
+        run_date = run_date or pd.Timestamp.now().strftime("%Y-%m-%d")
+        results = results.sort_values("ticker")
+        columns = {"ticker": _ticker_array(results["ticker"].to_numpy())}
+        for column in FLOAT_COLUMNS:
+            columns[column] = results[column].to_numpy(dtype=np.float32)
+        for column in BOOL_COLUMNS:
+            columns[column] = results[column].to_numpy(dtype=bool)
+
+        path = os.path.join(self._market_dir(market), run_date)
+        tmp_path = f"{path}.tmp"
+        with self._lock:
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            os.makedirs(tmp_path)
+            for column, values in columns.items():
+                np.save(os.path.join(tmp_path, f"{column}.npy"), values)
+            with open(os.path.join(tmp_path, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"created_at": time.time(), "tickers": len(results)}, f)
+            # 이전 스냅샷을 치운 뒤 새 디렉터리로 교체
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_path, path)
+            self._prune(market)
+        logger.info(f"Saved {market} screening snapshot {run_date} | tickers: {len(results)}")
+        return path
+
+    def _prune(self, market: str):
+        cutoff = (pd.Timestamp.now() - pd.Timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        for run_date in self.dates(market):
+            if run_date < cutoff:
+                shutil.rmtree(os.path.join(self._market_dir(market), run_date), ignore_errors=True)
+
+    def dates(self, market: str) -> List[str]:
+        """저장된 실행일 (오름차순)"""
+        try:
+            entries = os.listdir(self._market_dir(market))
+        except FileNotFoundError:
+            return []
+        return sorted(entry for entry in entries if len(entry) == 10 and not entry.endswith(".tmp"))
+
+    def load(self, market: str, run_date: Optional[str] = None, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """실행일(기본: 최근) 스냅샷을 티커 인덱스 프레임으로 읽는다. 열 데이터는 메모리 매핑된 배열"""
+        if run_date is None:
+            dates = self.dates(market)
+            if not dates:
+                return pd.DataFrame()
+            run_date = dates[-1]
+        path = os.path.join(self._market_dir(market), run_date)
+        if not os.path.isdir(path):
+            return pd.DataFrame()
+        tickers = np.load(os.path.join(path, "ticker.npy")).astype(str)
+        data = {
+            column: np.load(os.path.join(path, f"{column}.npy"), mmap_mode="r")
+            for column in (columns or FLOAT_COLUMNS + BOOL_COLUMNS)
+        }
+        return pd.DataFrame(data, index=pd.Index(tickers, name="ticker"), copy=False)
+
+    def history(self, market: str, column: str, since: Optional[str] = None,
+                until: Optional[str] = None) -> pd.DataFrame:
+        """(실행일 x 티커) 로 펼친 한 열의 이력"""
+        dates = [d for d in self.dates(market) if (since is None or d >= since) and (until is None or d <= until)]
+        series = {run_date: self.load(market, run_date, [column])[column] for run_date in dates}
+        if not series:
+            return pd.DataFrame()
+        return pd.DataFrame(series).T.rename_axis("run_date")
+
+    def crossed(self, market: str, column: str = "safety_margin", threshold: float = 30.0,
+                since: Optional[str] = None) -> pd.DataFrame:
+        """since 이후 실행에서 threshold 를 아래에서 위로 넘은 티커 (예: 이번 주 안전마진 30% 돌파)
+
+        since 직전 스냅샷을 기준점으로 포함해 연속한 두 실행 사이의 돌파를 찾는다.
+        """
+        dates = self.dates(market)
+        if since is not None:
+            start = max(0, int(np.searchsorted(dates, since)) - 1)
+            dates = dates[start:]
+        if len(dates) < 2:
+            return pd.DataFrame(columns=["crossed_on", "before", "after"])
+        history = self.history(market, column, since=dates[0])
+        values = history.to_numpy(dtype=float)
+        # NaN(그날 분석되지 않음) 과의 비교는 False 이므로 돌파로 보지 않는다
+        crossings = (values[:-1] <= threshold) & (values[1:] > threshold)
+        rows = []
+        for position, ticker_position in zip(*np.nonzero(crossings)):
+            rows.append({
+                "ticker": history.columns[ticker_position],
+                "crossed_on": history.index[position + 1],
+                "before": float(values[position, ticker_position]),
+                "after": float(values[position + 1, ticker_position]),
+            })
+        frame = pd.DataFrame(rows, columns=["ticker", "crossed_on", "before", "after"])
+        # 여러 번 넘었다면 가장 최근 돌파만 남긴다
+        return frame.sort_values("crossed_on").drop_duplicates("ticker", keep="last").set_index("ticker")
+
+    def diff(self, market: str, run_date: Optional[str] = None, previous: Optional[str] = None) -> pd.DataFrame:
+        """두 실행(기본: 최근과 그 직전) 사이에 추가/제외되었거나 추천 여부, 안전마진이 바뀐 티커"""
+        dates = self.dates(market)
+        if run_date is None and dates:
+            run_date = dates[-1]
+        if previous is None:
+            earlier = [d for d in dates if run_date is not None and d < run_date]
+            previous = earlier[-1] if earlier else None
+        if run_date is None or previous is None:
+            return pd.DataFrame()
+        columns = ["safety_margin", "buy_recommendation", "current_price"]
+        current = self.load(market, run_date, columns)
+        before = self.load(market, previous, columns)
+        joined = before.join(current, how="outer", lsuffix="_before", rsuffix="_after")
+        status = np.select(
+            [joined["safety_margin_before"].isna(), joined["safety_margin_after"].isna(),
+             joined["buy_recommendation_before"] != joined["buy_recommendation_after"]],
+            ["added", "removed", "recommendation_changed"],
+            default="changed",
+        )
+        joined["status"] = status
+        joined["safety_margin_change"] = joined["safety_margin_after"] - joined["safety_margin_before"]
+        changed = (joined["status"] != "changed") | (joined["safety_margin_change"].abs() > 1e-3)
+        return joined[changed]
+
+    def nbytes(self, market: str, run_date: Optional[str] = None) -> int:
+        """스냅샷 열 데이터 크기 (바이트)"""
+        frame = self.load(market, run_date)
+        if frame.empty:
+            return 0
+        path = os.path.join(self._market_dir(market), run_date or self.dates(market)[-1], "ticker.npy")
+        tickers = np.load(path, mmap_mode="r")
+        return int(sum(frame[column].to_numpy().nbytes for column in frame.columns)) + tickers.nbytes
+
+result_store = ResultStore(os.path.join(CACHE_DIR, "results"))
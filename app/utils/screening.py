@@ -1,75 +1,267 @@
+import asyncio
 import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 import pandas as pd
 from telegram.ext import ContextTypes
-from app.utils.stock import analyze_stock, fetch_nasdaq_tickers, fetch_sp500_tickers
+from app.config.config import SCREENING_CHUNK_SIZE, SCREENING_SNAPSHOT_TTL
+from app.utils.analysis import build_info_frame
+from app.utils.engine import ScreeningEngine
+from app.utils.incremental import screener
+from app.utils.metrics import metrics
+from app.utils.outbox import outbox
+from app.utils.result_store import result_store
+from app.utils.sharding import sharded
+from app.utils.stock import fetch_info_record, fetch_stock_descriptions, refresh_prices
+from app.utils.universe import universes
 from app.utils.logging import setup_logging
 
 logger = setup_logging()
 
-def daily_screening(context: ContextTypes.DEFAULT_TYPE):
-    """매일 자동 실행되는 스크리닝"""
-    chat_id = context.job.chat_id
-    logger.info("일일 스크리닝 시작")
-    manual_screening(context, chat_id, scope="all", is_manual=False)
+# 여러 종목군을 묶은 범위. 그 외에는 등록된 종목군 이름(관심목록 CSV 포함)이 그대로 범위가 된다
+SCOPES = {
+    "all": ["nasdaq", "sp500"],
+}
 
+def resolve_scope(scope: str) -> Optional[List[str]]:
+    """범위 이름을 스크리닝할 종목군 목록으로 변환. 알 수 없는 범위면 None"""
+    if scope in SCOPES:
+        return SCOPES[scope]
+    return [scope] if scope in universes else None
+
+def requires_admin(scope: str) -> bool:
+    """관리자 전용 종목군이 포함된 범위인지"""
+    return any(universes.get(name).admin_only for name in resolve_scope(scope) or [])
+
+def available_scopes() -> List[str]:
+    return list(SCOPES) + universes.names()
+
+# 텔레그램 메시지 최대 길이는 4096자, 여유를 둔다
+MESSAGE_LIMIT = 4000
+
+# 진행 상황 메시지 수정 최소 간격 (초)
+PROGRESS_EDIT_INTERVAL = 2.0
+
+def update_price_states(tickers):
+    refresh_prices(tickers)
+    return screener.update_prices(tickers)
+
+async def screen_tickers(tickers) -> pd.DataFrame:
+    """가격은 청크 단위로 일괄 갱신해 새 봉만 증분 반영하고, info 는 엔진에서 병렬 조회한 뒤 바뀐 티커만 다시 계산"""
+    states = await asyncio.to_thread(update_price_states, tickers)
+    if not states:
+        return pd.DataFrame()
+    infos = await ScreeningEngine(fetch_info_record).run(list(states))
+    if not infos:
+        return pd.DataFrame()
+    return await asyncio.to_thread(screener.score, states, build_info_frame(infos))
+
+async def iter_screening(tickers: List[str], chunk_size: int = SCREENING_CHUNK_SIZE) -> AsyncIterator[Tuple[int, pd.DataFrame]]:
+    """티커를 청크 단위로 분석해 (처리한 티커 수, 결과) 를 청크가 끝날 때마다 내보낸다
+
+    SCREENING_WORKERS 가 설정되어 있으면 청크를 샤드로 삼아 워커 프로세스들에서 병렬로 처리한다.
+    """
+    if sharded.workers and len(tickers) > chunk_size:
+        async for item in sharded.run(tickers):
+            yield item
+        return
+    for start in range(0, len(tickers), chunk_size):
+        chunk = tickers[start:start + chunk_size]
+        yield len(chunk), await screen_tickers(chunk)
+
+class ScreeningRun:
+    """진행 중이거나 끝난 한 시장의 스크리닝
+
+    여러 채팅이 stream() 으로 처음부터 결과를 이어 받을 수 있다. failed 는 티커 목록 조회 실패 또는
+    실행 중 오류를 뜻하며, 이런 실행은 재사용하지 않는다.
+    """
+
+    def __init__(self, market: str):
+        self.market = market
+        self.created_at = time.time()
+        self.total = 0
+        self.processed = 0
+        self.chunks: List[pd.DataFrame] = []
+        self.done = False
+        self.failed = False
+        self._changed = asyncio.Condition()
+
+    async def _notify(self):
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def publish(self, processed: int, results: pd.DataFrame):
+        self.processed += processed
+        self.chunks.append(results)
+        await self._notify()
+
+    async def finish(self, failed: bool = False):
+        self.failed = failed
+        self.done = True
+        await self._notify()
+
+    async def stream(self) -> AsyncIterator[pd.DataFrame]:
+        index = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: index < len(self.chunks) or self.done)
+                pending, done = self.chunks[index:], self.done
+            for results in pending:
+                yield results
+            index += len(pending)
+            if done and index >= len(self.chunks):
+                return
+
+    async def wait(self) -> "ScreeningRun":
+        async for _ in self.stream():
+            pass
+        return self
+
+    @property
+    def results(self) -> pd.DataFrame:
+        chunks = [chunk for chunk in self.chunks if not chunk.empty]
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+class ScreeningHub:
+    """시장별 스크리닝을 한 번만 실행해 결과를 모든 채팅이 공유하도록 관리
+
+    최근에 끝난 실행이 있으면 재사용하고, 같은 시장의 실행이 진행 중이면 새로 시작하지 않고 합류한다.
+    """
+
+    def __init__(self, max_age: float = SCREENING_SNAPSHOT_TTL):
+        self.max_age = max_age
+        self._runs: Dict[str, ScreeningRun] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def _execute(self, run: ScreeningRun):
+        start = time.perf_counter()
+        try:
+            tickers = await asyncio.to_thread(universes.get(run.market).tickers)
+            if not tickers:
+                await run.finish(failed=True)
+                return
+            run.total = len(tickers)
+            async for processed, results in iter_screening(tickers):
+                await run.publish(processed, results)
+            elapsed = time.perf_counter() - start
+            metrics.inc("tickers_screened_total", len(tickers), market=run.market)
+            metrics.set("screening_tickers_per_second", len(tickers) / elapsed if elapsed else 0.0, market=run.market)
+            logger.info(f"{run.market} 스크리닝 완료 (종목 수: {run.total}, 소요: {elapsed:.1f}s)")
+        except Exception as e:
+            logger.error(f"{run.market} 스크리닝 실패 | error: {e}")
+            await run.finish(failed=True)
+            return
+        await run.finish()
+        # 실행일별 스냅샷으로 남겨 이후 이력 조회/비교에 쓴다
+        try:
+            await asyncio.to_thread(result_store.save, run.market, run.results)
+        except Exception as e:
+            logger.error(f"{run.market} 스크리닝 스냅샷 저장 실패 | error: {e}")
+
+    def get_run(self, market: str, max_age: Optional[float] = None) -> ScreeningRun:
+        max_age = self.max_age if max_age is None else max_age
+        run = self._runs.get(market)
+        if run is not None and not run.done:
+            logger.info(f"{market} 진행 중인 스크리닝에 합류")
+            return run
+        if run is not None and not run.failed and time.time() - run.created_at < max_age:
+            logger.info(f"{market} 스냅샷 재사용")
+            return run
+        run = ScreeningRun(market)
+        self._runs[market] = run
+        task = asyncio.create_task(self._execute(run))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return run
+
+    async def get(self, market: str, max_age: Optional[float] = None) -> ScreeningRun:
+        """끝난 실행을 기다려 반환"""
+        return await self.get_run(market, max_age).wait()
+
+hub = ScreeningHub()
+
+def format_candidates(candidates: pd.DataFrame, descriptions: Optional[Dict[str, str]] = None) -> List[str]:
+    lines = []
+    for row in candidates.itertuples(index=False):
+        lines.append(f"{row.ticker}: ${row.current_price} (내재가치: ${row.intrinsic_value}, 안전마진: {row.safety_margin}%)")
+        if descriptions and row.ticker in descriptions:
+            lines.append(f"  └ {descriptions[row.ticker]}")
+    return lines
+
+def pack_messages(lines: List[str], limit: int = MESSAGE_LIMIT) -> List[str]:
+    """줄 단위로 묶어 각 메시지가 limit 자를 넘지 않도록 나눈다"""
+    messages, current = [], ""
+    for line in lines:
+        line = line[:limit - 1]
+        if current and len(current) + len(line) + 1 > limit:
+            messages.append(current)
+            current = ""
+        current += line + "\n"
+    if current:
+        messages.append(current)
+    return messages
+
+def candidates_of(results: pd.DataFrame) -> pd.DataFrame:
+    return results if results.empty else results[results["buy_recommendation"]]
+
+def summarize_run(run: ScreeningRun, candidate_count: int) -> str:
+    name = universes.get(run.market).label
+    if run.failed and not run.total:
+        return f"{name} 티커 데이터를 가져오지 못했습니다."
+    analyzed = sum(len(chunk) for chunk in run.chunks)
+    if not analyzed:
+        return f"분석 가능한 {name} 종목이 없습니다."
+    summary = f"{name}: {analyzed}/{run.total} 종목 분석, 추천 {candidate_count}개"
+    return summary if candidate_count else summary + " (추천 종목 없음)"
+
+async def _edit(message, text: str):
+    try:
+        await outbox.edit(message, text)
+    except Exception as e:
+        logger.warning(f"진행 상황 메시지 수정 실패 | error: {e}")
+
+async def stream_market(bot, chat_id, market: str, max_age: Optional[float] = None) -> str:
+    """청크가 끝날 때마다 추천 종목을 크기 제한 안에서 바로 보내고, 진행 상황 메시지는 제자리에서 수정"""
+    name = universes.get(market).label
+    run = hub.get_run(market, max_age)
+    # 진행 상황 메시지는 계속 수정하므로 다른 메시지와 합치지 않는다
+    progress = await outbox.send(bot, chat_id, f"📈 {name} 종목 분석 중...", coalesce=False)
+    candidate_count, last_edit = 0, time.monotonic()
+    async for results in run.stream():
+        candidates = candidates_of(results)
+        if not candidates.empty:
+            # 추천 종목 설명은 캐시 또는 묶음 요청으로 한 번에 가져온다
+            descriptions = await asyncio.to_thread(fetch_stock_descriptions, candidates["ticker"].tolist())
+            lines = [] if candidate_count else [f"=== {name} 매수 추천 ==="]
+            for text in pack_messages(lines + format_candidates(candidates, descriptions)):
+                await outbox.send(bot, chat_id, text)
+            candidate_count += len(candidates)
+        if run.total and time.monotonic() - last_edit >= PROGRESS_EDIT_INTERVAL:
+            await _edit(progress, f"📈 {name} 종목 분석 중... {run.processed}/{run.total}")
+            last_edit = time.monotonic()
+    summary = summarize_run(run, candidate_count)
+    await _edit(progress, f"✅ {summary}")
+    return summary
+
+async def build_report(scope="all", max_age: Optional[float] = None) -> List[str]:
+    """범위 내 시장들의 공유 실행이 끝나길 기다려 크기 제한에 맞게 나눈 보고서 작성"""
+    timestamp = time.strftime('%Y-%m-%d %H:%M')
+    lines = [f"📅 {timestamp} 스크리닝 결과"]
+    for market in resolve_scope(scope):
+        name = universes.get(market).label
+        run = await hub.get(market, max_age)
+        candidates = candidates_of(run.results)
+        lines += ["", f"📈 {name} 종목 분석 결과", summarize_run(run, len(candidates))]
+        if not candidates.empty:
+            descriptions = await asyncio.to_thread(fetch_stock_descriptions, candidates["ticker"].tolist())
+            lines += [f"=== {name} 매수 추천 ==="] + format_candidates(candidates, descriptions)
+    return pack_messages(lines)
+
+@metrics.timed("manual_screening")
 async def manual_screening(context: ContextTypes.DEFAULT_TYPE, chat_id, scope="all", is_manual=True):
-    """수동 또는 자동 스크리닝 실행"""
+    """수동 또는 자동 스크리닝 실행: 결과를 청크 단위로 흘려 보내고 마지막에 요약 전송"""
     if is_manual:
         logger.info(f"사용자 {chat_id}가 수동 스크리닝 요청 (scope: {scope})")
-    
     timestamp = time.strftime('%Y-%m-%d %H:%M')
-    message = f"📅 {timestamp} 스크리닝 결과\n"
-    
-    # 스크리닝 범위 설정
-    if scope in ["all", "nasdaq"]:
-        message += "\n📈 나스닥 종목 분석 중...\n"
-        if is_manual:
-            await context.bot.send_message(chat_id=chat_id, text=message)  # await 추가
-            message = ""
-        
-        NASDAQ_TICKERS = fetch_nasdaq_tickers()
-        if not NASDAQ_TICKERS:
-            message += "나스닥 티커 데이터를 가져오지 못했습니다.\n"
-        else:
-            nasdaq_results = [
-                result for ticker in NASDAQ_TICKERS if (result := analyze_stock(ticker, include_description=False)) is not None
-            ]
-            if nasdaq_results:
-                nasdaq_df = pd.DataFrame(nasdaq_results)
-                nasdaq_candidates = nasdaq_df[nasdaq_df["buy_recommendation"] == True]
-                if not nasdaq_candidates.empty:
-                    message += "=== 나스닥 매수 추천 ===\n"
-                    for _, row in nasdaq_candidates.iterrows():
-                        message += f"{row['ticker']}: ${row['current_price']} (내재가치: ${row['intrinsic_value']}, 안전마진: {row['safety_margin']}%)\n"
-                else:
-                    message += "추천 종목 없음\n"
-            else:
-                message += "분석 가능한 나스닥 종목이 없습니다.\n"
-    
-    if scope in ["all", "sp500"]:
-        message += "\n📈 S&P 500 종목 분석 중...\n"
-        if is_manual:
-            await context.bot.send_message(chat_id=chat_id, text=message)  # await 추가
-            message = ""
-        
-        SP500_TICKERS = fetch_sp500_tickers()
-        if not SP500_TICKERS:
-            message += "S&P 500 티커 데이터를 가져오지 못했습니다.\n"
-        else:
-            sp500_results = [
-                result for ticker in SP500_TICKERS if (result := analyze_stock(ticker, include_description=False)) is not None
-            ]
-            if sp500_results:
-                sp500_df = pd.DataFrame(sp500_results)
-                sp500_candidates = sp500_df[sp500_df["buy_recommendation"] == True]
-                if not sp500_candidates.empty:
-                    message += "=== S&P 500 매수 추천 ===\n"
-                    for _, row in sp500_candidates.iterrows():
-                        message += f"{row['ticker']}: ${row['current_price']} (내재가치: ${row['intrinsic_value']}, 안전마진: {row['safety_margin']}%)\n"
-                else:
-                    message += "추천 종목 없음\n"
-            else:
-                message += "분석 가능한 S&P 500 종목이 없습니다.\n"
-    
-    await context.bot.send_message(chat_id=chat_id, text=message)  # await 추가
-    logger.info(f"스크리닝 완료 (scope: {scope})")
\ No newline at end of file
+    summaries = [await stream_market(context.bot, chat_id, market) for market in resolve_scope(scope)]
+    await outbox.send(context.bot, chat_id, f"📅 {timestamp} 스크리닝 완료\n" + "\n".join(summaries))
+    logger.info(f"스크리닝 완료 (scope: {scope})")
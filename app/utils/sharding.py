@@ -0,0 +1,82 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+import pandas as pd
+from app.config.config import SCREENING_CHUNK_SIZE, SCREENING_WORKERS
+from app.utils.analysis import build_info_frame
+from app.utils.engine import ScreeningEngine
+from app.utils.incremental import screener
+from app.utils.stock import fetch_info_record, refresh_prices
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+def screen_shard(tickers: List[str]) -> pd.DataFrame:
+    """워커 프로세스에서 한 샤드를 가격 갱신부터 점수 계산까지 처리"""
+    refresh_prices(tickers)
+    states = screener.update_prices(tickers)
+    if not states:
+        return pd.DataFrame()
+    infos = asyncio.run(ScreeningEngine(fetch_info_record).run(list(states)))
+    if not infos:
+        return pd.DataFrame()
+    return screener.score(states, build_info_frame(infos))
+
+class ShardedScreener:
+    """종목군을 샤드로 나눠 프로세스 풀에서 병렬로 스크리닝하고 끝나는 순서대로 결과를 내보낸다
+
+    워커마다 info 조회 스레드를 SCREENING_CONCURRENCY 개씩 쓰므로 외부 동시 요청 수는 workers 배가 된다.
+    가격 캐시(SQLite, WAL)는 모든 프로세스가 공유한다.
+    """
+
+    def __init__(self, workers: int = SCREENING_WORKERS, shard_size: int = SCREENING_CHUNK_SIZE,
+                 initializer: Optional[Callable] = None, initargs: Tuple = ()):
+        self.workers = workers
+        self.shard_size = shard_size
+        self.initializer = initializer
+        self.initargs = initargs
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # 봇 프로세스는 스레드를 쓰므로 fork 대신 spawn 으로 깨끗한 워커를 띄운다
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+                initargs=self.initargs,
+            )
+        return self._pool
+
+    async def _screen(self, shard: List[str]) -> Tuple[int, pd.DataFrame]:
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._get_pool(), screen_shard, shard)
+        except BrokenProcessPool as e:
+            # 워커가 죽었으면 다음 샤드부터 새 풀을 쓴다
+            logger.error(f"Screening worker pool broken | error: {e}")
+            self._pool = None
+            result = pd.DataFrame()
+        except Exception as e:
+            logger.error(f"Failed to screen shard of {len(shard)} tickers | error: {e}")
+            result = pd.DataFrame()
+        return len(shard), result
+
+    async def run(self, tickers: List[str]) -> AsyncIterator[Tuple[int, pd.DataFrame]]:
+        """(샤드 티커 수, 결과) 를 샤드가 끝나는 순서대로 내보낸다"""
+        shards = [tickers[start:start + self.shard_size] for start in range(0, len(tickers), self.shard_size)]
+        tasks = [asyncio.ensure_future(self._screen(shard)) for shard in shards]
+        try:
+            for done in asyncio.as_completed(tasks):
+                yield await done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+sharded = ShardedScreener()
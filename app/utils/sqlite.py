@@ -0,0 +1,25 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+
+class SQLiteStore:
+    """WAL 모드 SQLite 파일 위의 저장소 공통 부분 (파일/스키마 준비와 호출 단위 연결)"""
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(schema)
+
+    @contextmanager
+    def _connect(self):
+        # 워커 스레드마다 별도 연결을 쓰도록 호출 단위로 연다
+        conn = sqlite3.connect(self.path, timeout=30)
+        # WAL 모드에서는 NORMAL 로도 손상 없이 커밋마다의 fsync 를 피할 수 있다
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
@@ -1,106 +1,318 @@
+import json
+import httpx
 import yfinance as yf
 import pandas as pd
 import requests
-from functools import lru_cache
+import time
 from typing import List, Optional, Dict, Any
-from app.config.config import OPEN_ROUTER_API_KEY, OPEN_ROUTER_API_URL
+from app.config.config import (
+    DESCRIPTION_BATCH_SIZE,
+    DESCRIPTION_MODEL,
+    OPEN_ROUTER_API_KEY,
+    OPEN_ROUTER_API_URL,
+    PRICE_CHUNK_SIZE,
+)
+from app.utils.cache import market_cache
+from app.utils.description_cache import description_cache
+from app.utils.http import get_async_client, get_session, get_yfinance_session, timed_call
 from app.utils.logging import setup_logging
-from app.utils.pe_mapping import INDUSTRY_PE, SECTOR_FALLBACK
+from app.utils.metrics import metrics
+from app.utils.pe_resolver import industry_pe as industry_pe_index
+from app.utils.price_series import PriceSeries, price_series
+from app.utils.universe import universes
 
 logger = setup_logging()
 
-NASDAQ_TICKERS: List[str] = []
-SP500_TICKERS: List[str] = []
+# 설명 프롬프트를 바꾸면 올려서 기존 캐시 항목을 무효화
+DESCRIPTION_PROMPT_VERSION = "v1"
 
-def fetch_sp500_tickers() -> List[str]:
-    try:
-        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
-        tables = pd.read_html(url, attrs={"id": "constituents"})
-        sp500_df = tables[0]
-        tickers = sp500_df["Symbol"].str.replace(".", "-").tolist()
-        logger.info(f"Successfully fetched {len(tickers)} S&P 500 tickers")
-        return tickers
-    except Exception as e:
-        logger.error(f"Failed to fetch S&P 500 tickers | error: {e}")
-        return []
-
-def fetch_nasdaq_tickers() -> List[str]:
-    try:
-        url = "https://api.nasdaq.com/api/quote/list-type/nasdaq100"
-        headers = {"User-Agent": "Mozilla/5.0"}
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        data = response.json()
-        tickers = [item["symbol"] for item in data["data"]["data"]["rows"]]
-        logger.info(f"Successfully fetched {len(tickers)} Nasdaq-100 tickers from Nasdaq API")
-        return tickers
-    except Exception as e:
-        logger.error(f"Failed to fetch Nasdaq-100 tickers from Nasdaq API | error: {e}")
-        return []
+# yfinance 호출은 curl_cffi 세션을 쓰므로 호출 단위로 지연 시간을 기록
+YAHOO_HOST = "finance.yahoo.com"
 
-NASDAQ_TICKERS = fetch_nasdaq_tickers()
-SP500_TICKERS = fetch_sp500_tickers()
+def period_start(period: str) -> Optional[pd.Timestamp]:
+    """'5y' 같은 기간 문자열을 캐시 조회 시작일로 변환"""
+    if period.endswith("y") and period[:-1].isdigit():
+        return pd.Timestamp.now().normalize() - pd.DateOffset(years=int(period[:-1]))
+    return None
 
-@lru_cache(maxsize=128)
-def fetch_stock_data(ticker: str, period: str = "5y") -> Optional[pd.DataFrame]:
+def _refresh_stock_data(ticker: str, period: str = "5y"):
+    """캐시가 만료되었으면 마지막 저장일 이후 구간(수정주가가 바뀌었으면 전체)을 받아 캐시에 반영"""
+    fresh = market_cache.is_price_fresh(ticker)
+    metrics.cache_result("prices", fresh)
+    if fresh:
+        return
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(period=period, auto_adjust=True)
-        if df.empty:
-            logger.warning(f"{ticker} historical data is empty")
-            return None
+        stock = yf.Ticker(ticker, session=get_yfinance_session())
+        last_date = market_cache.last_price_date(ticker)
+        if last_date is not None:
+            # 마지막 저장일부터 받아 겹치는 봉으로 수정주가 변경 여부를 확인
+            with timed_call(YAHOO_HOST):
+                df = stock.history(start=last_date, auto_adjust=True)
+            if not market_cache.store_prices(ticker, df):
+                last_date = None
+        if last_date is None:
+            with timed_call(YAHOO_HOST):
+                df = stock.history(period=period, auto_adjust=True)
+            if df.empty:
+                logger.warning(f"{ticker} historical data is empty")
+                return
+            market_cache.store_prices(ticker, df, replace=True)
         logger.info(f"Successfully fetched {ticker} data | rows: {len(df)}")
-        return df
     except Exception as e:
+        metrics.inc("source_errors_total", source="yfinance")
         logger.error(f"Failed to fetch {ticker} data | error: {e}")
+
+@metrics.timed("fetch_close_series")
+def fetch_close_series(ticker: str, period: str = "5y") -> Optional[PriceSeries]:
+    """분석용 종가 이력. 시세 캐시가 갱신되기 전까지는 메모리의 압축 이력(PriceSeries)을 재사용"""
+    series = price_series.get((ticker, period))
+    if series is not None and time.time() - series.refreshed_at < market_cache.price_ttl:
+        metrics.cache_result("price_series", True)
+        return series
+    metrics.cache_result("price_series", False)
+    _refresh_stock_data(ticker, period)
+    since = period_start(period)
+    rows = market_cache.load_closes(ticker, since.strftime("%Y-%m-%d") if since is not None else None)
+    if not rows:
         return None
+    # 갱신에 실패해 갱신 시각이 없으면 다음 조회에서 다시 시도하도록 만료된 것으로 둔다
+    series = PriceSeries.from_rows(ticker, rows, market_cache.price_refreshed_at(ticker) or 0.0)
+    price_series.put((ticker, period), series)
+    return series
+
+def _download_chunk(chunk: List[str], **kwargs) -> Dict[str, pd.DataFrame]:
+    with timed_call(YAHOO_HOST):
+        data = yf.download(
+            chunk, auto_adjust=True, group_by="column", threads=True, progress=False,
+            session=get_yfinance_session(), **kwargs
+        )
+    if data.empty:
+        return {}
+    if not isinstance(data.columns, pd.MultiIndex):
+        return {chunk[0]: data}
+    # (필드, 티커) 열을 청크당 한 번 티커 순으로 재배열하면 티커별 프레임은 복사 없이 연속 구간을 가리킨다
+    data = data.swaplevel(axis=1).sort_index(axis=1)
+    return {ticker: data[ticker] for ticker in data.columns.get_level_values(0).unique()}
+
+def _with_bars(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """종가가 있는 봉이 하나라도 있는 티커만 (조회에 실패한 티커는 NaN 열로 온다)"""
+    return {ticker: df for ticker, df in frames.items() if "Close" in df and df["Close"].notna().any()}
+
+def _replace_history(tickers: List[str], period: str) -> int:
+    """전체 기간을 받아 이력을 교체하고 교체한 티커 수를 돌려준다"""
+    frames = _with_bars(_download_chunk(tickers, period=period))
+    for ticker, df in frames.items():
+        market_cache.store_prices(ticker, df, replace=True)
+    return len(frames)
+
+@metrics.timed("refresh_prices")
+def refresh_prices(tickers: List[str], period: str = "5y", chunk_size: int = PRICE_CHUNK_SIZE):
+    """캐시가 만료된 티커만 청크 단위로 다운로드해 캐시에 반영
+
+    이력이 있는 티커는 마지막 저장일 이후 구간만 받고, 이력이 없는 티커만 전체 기간을 받는다. 받은 봉이
+    없는 티커는 기존 이력을 그대로 두고 다음 갱신 때 다시 시도한다.
+    """
+    stale = [ticker for ticker in tickers if not market_cache.is_price_fresh(ticker)]
+    metrics.inc("cache_requests_total", len(tickers) - len(stale), cache="prices", result="hit")
+    metrics.inc("cache_requests_total", len(stale), cache="prices", result="miss")
+    last_dates = {ticker: market_cache.last_price_date(ticker) for ticker in stale}
+    # 시작일이 비슷한 티커끼리 묶이도록 마지막 저장일 순으로 정렬
+    cached = sorted((ticker for ticker in stale if last_dates[ticker] is not None), key=last_dates.get)
+    missing = [ticker for ticker in stale if last_dates[ticker] is None]
+
+    for start in range(0, len(cached), chunk_size):
+        chunk = cached[start:start + chunk_size]
+        try:
+            frames = _with_bars(_download_chunk(chunk, start=min(last_dates[ticker] for ticker in chunk)))
+            adjusted = [ticker for ticker, df in frames.items() if not market_cache.store_prices(ticker, df)]
+            if adjusted:
+                _replace_history(adjusted, period)
+            logger.info(f"Successfully refreshed price chunk {start}-{start + len(chunk)} | "
+                        f"updated: {len(frames)}, adjusted: {len(adjusted)}, no data: {len(chunk) - len(frames)}")
+        except Exception as e:
+            metrics.inc("source_errors_total", source="yfinance")
+            logger.error(f"Failed to fetch price chunk {start}-{start + len(chunk)} | error: {e}")
+
+    for start in range(0, len(missing), chunk_size):
+        chunk = missing[start:start + chunk_size]
+        try:
+            stored = _replace_history(chunk, period)
+            logger.info(f"Successfully fetched new price histories {start}-{start + len(chunk)} | "
+                        f"stored: {stored}, no data: {len(chunk) - stored}")
+        except Exception as e:
+            metrics.inc("source_errors_total", source="yfinance")
+            logger.error(f"Failed to fetch new price histories {start}-{start + len(chunk)} | error: {e}")
+
+@metrics.timed("fetch_quotes")
+def fetch_quotes(tickers: List[str], chunk_size: int = PRICE_CHUNK_SIZE) -> Dict[str, float]:
+    """최근 시세(최근 5분봉 종가, 장이 닫혀 있으면 마지막 거래 시점)를 청크 단위 일괄 요청으로 조회"""
+    quotes = {}
+    for start in range(0, len(tickers), chunk_size):
+        chunk = tickers[start:start + chunk_size]
+        try:
+            for ticker, df in _download_chunk(chunk, period="5d", interval="5m").items():
+                close = df["Close"].dropna()
+                if len(close):
+                    quotes[ticker] = float(close.iloc[-1])
+        except Exception as e:
+            metrics.inc("source_errors_total", source="yfinance")
+            logger.error(f"Failed to fetch quote chunk {start}-{start + len(chunk)} | error: {e}")
+    return quotes
+
+@metrics.timed("fetch_stock_info")
+def _load_stock_info(ticker: str) -> Dict[str, Any]:
+    """캐시 또는 yfinance 에서 info 조회 (조회 실패는 예외로 올린다)"""
+    info = market_cache.load_info(ticker)
+    metrics.cache_result("info", info is not None)
+    if info is not None:
+        return info
+    try:
+        stock = yf.Ticker(ticker, session=get_yfinance_session())
+        with timed_call(YAHOO_HOST):
+            info = stock.info
+    except Exception:
+        metrics.inc("source_errors_total", source="yfinance")
+        raise
+    market_cache.store_info(ticker, info)
+    logger.info(f"Successfully fetched {ticker} info")
+    return info
 
-@lru_cache(maxsize=128)
 def fetch_stock_info(ticker: str) -> Dict[str, Any]:
     try:
-        stock = yf.Ticker(ticker)
-        info = stock.info
-        logger.info(f"Successfully fetched {ticker} info")
-        return info
+        return _load_stock_info(ticker)
     except Exception as e:
         logger.error(f"Failed to fetch {ticker} info | error: {e}")
         return {}
 
-def fetch_stock_description(ticker: str) -> str:
-    if not OPEN_ROUTER_API_KEY or not OPEN_ROUTER_API_URL:
-        logger.warning("Open Router API credentials not configured")
-        return "주식 요약을 가져올 수 없습니다."
+def fetch_info_record(ticker: str) -> Optional[Dict[str, Any]]:
+    """분석용 info 를 티커와 함께 반환 (info 가 없으면 None)
+
+    조회 실패는 예외로 올려 ScreeningEngine 이 백오프 후 재시도하게 한다.
+    """
+    info = _load_stock_info(ticker)
+    return {"ticker": ticker, **info} if info else None
+
+def _completion_request(prompt: str, max_tokens: int) -> Dict[str, Any]:
     headers = {
         "Authorization": f"Bearer {OPEN_ROUTER_API_KEY}",
         "Content-Type": "application/json",
     }
     payload = {
-        "model": "google/gemini-2.0-flash-001",
-        "messages": [
-            {"role": "user", "content": f"{ticker} 주식에 대한 간단한 설명을 1문장으로 한국어로 제공해 주세요."}
-        ],
-        "max_tokens": 50,
+        "model": DESCRIPTION_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+        "max_tokens": max_tokens,
     }
+    return {"headers": headers, "json": payload}
+
+def _request_completion(prompt: str, max_tokens: int) -> str:
+    response = get_session().post(OPEN_ROUTER_API_URL, **_completion_request(prompt, max_tokens))
+    response.raise_for_status()
+    result = response.json()
+    return result["choices"][0]["message"]["content"].strip()
+
+def _description_prompt(ticker: str) -> str:
+    return f"{ticker} 주식에 대한 간단한 설명을 1문장으로 한국어로 제공해 주세요."
+
+@metrics.timed("fetch_stock_description")
+def fetch_stock_description(ticker: str) -> str:
+    if not OPEN_ROUTER_API_KEY or not OPEN_ROUTER_API_URL:
+        logger.warning("Open Router API credentials not configured")
+        return "주식 요약을 가져올 수 없습니다."
+    cached = description_cache.get(ticker, DESCRIPTION_MODEL, DESCRIPTION_PROMPT_VERSION)
+    metrics.cache_result("description", cached is not None)
+    if cached is not None:
+        return cached
     try:
-        response = requests.post(OPEN_ROUTER_API_URL, headers=headers, json=payload, timeout=10)
-        response.raise_for_status()
-        result = response.json()
-        description = result["choices"][0]["message"]["content"].strip()
+        description = _request_completion(_description_prompt(ticker), 50)
+        description_cache.put(ticker, description, DESCRIPTION_MODEL, DESCRIPTION_PROMPT_VERSION)
         logger.info(f"Successfully fetched {ticker} description: {description}")
         return description
     except requests.Timeout:
+        metrics.inc("source_errors_total", source="openrouter")
         logger.error(f"Open Router API timeout for {ticker}")
         return f"{ticker}에 대한 요약을 가져오는 데 시간이 초과되었습니다."
     except Exception as e:
+        metrics.inc("source_errors_total", source="openrouter")
         logger.error(f"Failed to fetch {ticker} description via Open Router | error: {e}")
         return f"{ticker}에 대한 요약을 가져올 수 없습니다."
 
+@metrics.timed("fetch_stock_description")
+async def fetch_stock_description_async(ticker: str) -> str:
+    """fetch_stock_description 의 비동기 버전 (공유 httpx 클라이언트 사용)"""
+    if not OPEN_ROUTER_API_KEY or not OPEN_ROUTER_API_URL:
+        logger.warning("Open Router API credentials not configured")
+        return "주식 요약을 가져올 수 없습니다."
+    cached = description_cache.get(ticker, DESCRIPTION_MODEL, DESCRIPTION_PROMPT_VERSION)
+    metrics.cache_result("description", cached is not None)
+    if cached is not None:
+        return cached
+    try:
+        response = await get_async_client().post(OPEN_ROUTER_API_URL, **_completion_request(_description_prompt(ticker), 50))
+        response.raise_for_status()
+        description = response.json()["choices"][0]["message"]["content"].strip()
+        description_cache.put(ticker, description, DESCRIPTION_MODEL, DESCRIPTION_PROMPT_VERSION)
+        logger.info(f"Successfully fetched {ticker} description: {description}")
+        return description
+    except httpx.TimeoutException:
+        metrics.inc("source_errors_total", source="openrouter")
+        logger.error(f"Open Router API timeout for {ticker}")
+        return f"{ticker}에 대한 요약을 가져오는 데 시간이 초과되었습니다."
+    except Exception as e:
+        metrics.inc("source_errors_total", source="openrouter")
+        logger.error(f"Failed to fetch {ticker} description via Open Router | error: {e}")
+        return f"{ticker}에 대한 요약을 가져올 수 없습니다."
+
+def _parse_batch_descriptions(content: str, tickers: List[str]) -> Dict[str, str]:
+    """{"티커": "설명"} 형태의 응답에서 요청한 티커의 설명만 추출 (코드 블록 감싸기 허용)"""
+    start, end = content.find("{"), content.rfind("}")
+    if start < 0 or end < start:
+        raise ValueError("no JSON object in reply")
+    parsed = json.loads(content[start:end + 1])
+    requested = set(tickers)
+    return {
+        str(ticker).strip().upper(): description.strip()
+        for ticker, description in parsed.items()
+        if str(ticker).strip().upper() in requested and isinstance(description, str) and description.strip()
+    }
+
+def fetch_stock_descriptions(tickers: List[str], batch_size: int = DESCRIPTION_BATCH_SIZE) -> Dict[str, str]:
+    """여러 티커의 설명을 캐시에서 읽고, 없는 것만 한 번의 요청에 여러 개씩 묶어 생성
+
+    설명을 얻지 못한 티커는 결과에서 빠진다.
+    """
+    descriptions = description_cache.get_many(tickers, DESCRIPTION_MODEL, DESCRIPTION_PROMPT_VERSION)
+    missing = [ticker for ticker in dict.fromkeys(tickers) if ticker not in descriptions]
+    metrics.inc("cache_requests_total", len(descriptions), cache="description", result="hit")
+    metrics.inc("cache_requests_total", len(missing), cache="description", result="miss")
+    if not missing or not OPEN_ROUTER_API_KEY or not OPEN_ROUTER_API_URL:
+        return descriptions
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        prompt = (
+            "다음 각 주식 티커에 대한 간단한 설명을 1문장으로 한국어로 제공해 주세요. "
+            "티커를 키로, 설명을 값으로 하는 JSON 객체만 출력하세요.\n" + "\n".join(batch)
+        )
+        try:
+            generated = _parse_batch_descriptions(_request_completion(prompt, 60 * len(batch)), batch)
+            description_cache.put_many(generated, DESCRIPTION_MODEL, DESCRIPTION_PROMPT_VERSION)
+            descriptions.update(generated)
+            logger.info(f"Successfully fetched batch descriptions | requested: {len(batch)}, parsed: {len(generated)}")
+        except Exception as e:
+            metrics.inc("source_errors_total", source="openrouter")
+            logger.error(f"Failed to fetch batch descriptions via Open Router | error: {e}")
+    return descriptions
+
+def lookup_industry_pe(industry: str, sector: str) -> float:
+    """조정 전 산업 P/E 조회 (대응표/유사 이름으로 찾고, 없으면 섹터 대체 산업, 그것도 없으면 20)"""
+    return industry_pe_index.pe(industry, sector)
+
+def industry_pe_version() -> int:
+    """산업 P/E 표 버전 (데이터 파일이 바뀌어 다시 읽으면 올라간다)"""
+    industry_pe_index.refresh_if_changed()
+    return industry_pe_index.version
+
 def get_industry_pe(industry: str, sector: str, trailing_pe: Optional[float] = None) -> float:
-    industry_pe = INDUSTRY_PE.get(industry)
-    if industry_pe is None:
-        mapped_industry = SECTOR_FALLBACK.get(sector, "Total Market")
-        industry_pe = INDUSTRY_PE.get(mapped_industry, 20.0)  # 기본값을 20으로 현실화
-        logger.debug(f"Industry '{industry}' not found, using fallback '{mapped_industry}' PE: {industry_pe}")
+    industry_pe = lookup_industry_pe(industry, sector)
     
     # 현실적인 P/E로 조정: 상한선 30, 주식 trailingPE 반영
     if trailing_pe and trailing_pe > 0:
@@ -110,17 +322,28 @@ def get_industry_pe(industry: str, sector: str, trailing_pe: Optional[float] = N
             return realistic_pe
     return min(industry_pe, 30.0)  # 상한선 30 적용
 
-@lru_cache(maxsize=128)
+def estimate_intrinsic_value(info: Dict[str, Any], current_price: Optional[float] = None) -> Optional[float]:
+    """가격 이력 없이 info 만으로 내재가치(EPS x 조정 산업 P/E) 추정. EPS 가 없거나 0 이하이면 None"""
+    eps = info.get("trailingEps")
+    if eps is None or eps <= 0:
+        return None
+    current_price = current_price or info.get("currentPrice")
+    trailing_pe = info.get("trailingPE", current_price / eps if current_price else None)
+    return eps * get_industry_pe(info.get("industry", "Default"), info.get("sector", "Default"), trailing_pe)
+
+@metrics.timed("analyze_stock")
 def analyze_stock(ticker: str, safety_margin_threshold: float = 0.3, include_description: bool = True) -> Optional[Dict[str, Any]]:
-    df = fetch_stock_data(ticker)
-    if df is None:
+    series = fetch_close_series(ticker)
+    if series is None or not len(series):
         return None
-    
+    return analyze_close(ticker, series.close(), safety_margin_threshold, include_description)
+
+def analyze_close(ticker: str, close: pd.Series, safety_margin_threshold: float = 0.3, include_description: bool = True) -> Optional[Dict[str, Any]]:
     info = fetch_stock_info(ticker)
     if not info:
         return None
     
-    current_price = df["Close"].iloc[-1]
+    current_price = close.iloc[-1]
     eps = info.get("trailingEps")
     if eps is None or eps <= 0:
         logger.warning(f"{ticker} EPS unavailable or invalid: {eps}")
@@ -140,9 +363,9 @@ def analyze_stock(ticker: str, safety_margin_threshold: float = 0.3, include_des
     pe_discount = ((industry_pe - trailing_pe) / industry_pe * 100) if trailing_pe and industry_pe else 0
     
     moat = (info.get("profitMargins", 0) > 0.1) and (info.get("returnOnEquity", 0) > 0.15)
-    consistency = df["Close"].pct_change().std() < 0.03
-    cagr = ((df["Close"].iloc[-1] / df["Close"].iloc[0]) ** (1 / (len(df) / 252)) - 1) if len(df) > 0 else 0
-    track_record = (len(df) > 252 * 3) and (cagr > 0.05)
+    consistency = close.pct_change(fill_method=None).std() < 0.03
+    cagr = ((close.iloc[-1] / close.iloc[0]) ** (1 / (len(close) / 252)) - 1) if len(close) > 0 else 0
+    track_record = (len(close) > 252 * 3) and (cagr > 0.05)
     
     result = {
         "ticker": ticker,
@@ -156,8 +379,8 @@ def analyze_stock(ticker: str, safety_margin_threshold: float = 0.3, include_des
         "consistency": consistency,
         "track_record": track_record,
         "cagr": round(cagr * 100, 2),
-        "is_nasdaq100": ticker in NASDAQ_TICKERS,
-        "is_sp500": ticker in SP500_TICKERS,
+        "is_nasdaq100": ticker in universes.get("nasdaq"),
+        "is_sp500": ticker in universes.get("sp500"),
     }
     
     if include_description:
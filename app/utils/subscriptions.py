@@ -0,0 +1,211 @@
+import asyncio
+import os
+import random
+import time
+from datetime import datetime, timedelta, timezone, tzinfo
+from datetime import time as dtime
+from typing import List, Set, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+import telegram.error
+from telegram.ext import ContextTypes, JobQueue
+from app.config.config import (
+    CACHE_DIR,
+    DAILY_SCREENING_CATCHUP,
+    DAILY_SCREENING_JITTER,
+    DAILY_SCREENING_SPREAD,
+    DAILY_SCREENING_TIME,
+    DAILY_SCREENING_TZ,
+)
+from app.utils.outbox import BROADCAST, outbox
+from app.utils.screening import build_report
+from app.utils.sqlite import SQLiteStore
+from app.utils.logging import setup_logging
+
+logger = setup_logging()
+
+# 회차별 전송 기록 보관 기간 (일)
+DELIVERY_RETENTION_DAYS = 30
+
+def resolve_timezone(name: str) -> tzinfo:
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        logger.error(f"Unknown timezone '{name}', daily screening falls back to UTC")
+        return timezone.utc
+
+def parse_time(value: str, tz: tzinfo) -> dtime:
+    """'HH:MM' 을 시간대가 붙은 time 으로"""
+    hour, minute = (int(part) for part in value.split(":"))
+    return dtime(hour=hour, minute=minute, tzinfo=tz)
+
+class SubscriptionStore(SQLiteStore):
+    """일일 스크리닝 구독 채팅과 회차(slot)별 실행/전송 기록을 보관하는 SQLite 저장소
+
+    채팅 id 가 기본 키라 같은 채팅은 한 번만 구독된다. 회차는 실행 시작/완료 시각을, 전송 기록은 회차 안에서
+    이미 보고서를 받은 채팅을 남겨 재시작 후 같은 회차를 이어서 보낼 때 중복 전송을 막는다.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(
+            path,
+            """
+            CREATE TABLE IF NOT EXISTS subscriptions (
+                chat_id INTEGER PRIMARY KEY,
+                subscribed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS screening_slots (
+                slot TEXT PRIMARY KEY,
+                started_at REAL NOT NULL,
+                finished_at REAL,
+                chats INTEGER,
+                failed INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS slot_deliveries (
+                slot TEXT NOT NULL,
+                chat_id INTEGER NOT NULL,
+                PRIMARY KEY (slot, chat_id)
+            ) WITHOUT ROWID;
+            """
+        )
+
+    def add(self, chat_id: int) -> bool:
+        """구독 추가. 이미 구독 중이면 False"""
+        with self._connect() as conn:
+            return conn.execute(
+                "INSERT OR IGNORE INTO subscriptions VALUES (?, ?)", (chat_id, time.time())
+            ).rowcount > 0
+
+    def remove(self, chat_id: int) -> bool:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM subscriptions WHERE chat_id = ?", (chat_id,)).rowcount > 0
+
+    def chat_ids(self) -> List[int]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT chat_id FROM subscriptions ORDER BY subscribed_at")]
+
+    def count(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM subscriptions").fetchone()[0]
+
+    def is_finished(self, slot: str) -> bool:
+        with self._connect() as conn:
+            row = conn.execute("SELECT finished_at FROM screening_slots WHERE slot = ?", (slot,)).fetchone()
+        return row is not None and row[0] is not None
+
+    def start(self, slot: str):
+        """회차 시작 기록 (중단된 회차를 이어서 실행하면 처음 시작 시각을 유지)"""
+        with self._connect() as conn:
+            conn.execute("INSERT OR IGNORE INTO screening_slots (slot, started_at) VALUES (?, ?)", (slot, time.time()))
+
+    def finish(self, slot: str, chats: int, failed: int):
+        cutoff = time.time() - DELIVERY_RETENTION_DAYS * 24 * 60 * 60
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE screening_slots SET finished_at = ?, chats = ?, failed = ? WHERE slot = ?",
+                (time.time(), chats, failed, slot),
+            )
+            old = [row[0] for row in conn.execute("SELECT slot FROM screening_slots WHERE started_at < ?", (cutoff,))]
+            conn.executemany("DELETE FROM slot_deliveries WHERE slot = ?", ((s,) for s in old))
+
+    def delivered(self, slot: str) -> Set[int]:
+        with self._connect() as conn:
+            return {row[0] for row in conn.execute("SELECT chat_id FROM slot_deliveries WHERE slot = ?", (slot,))}
+
+    def mark_delivered(self, slot: str, chat_ids: List[int]):
+        with self._connect() as conn:
+            conn.executemany("INSERT OR IGNORE INTO slot_deliveries VALUES (?, ?)", ((slot, c) for c in chat_ids))
+
+class DailyScreeningScheduler:
+    """구독 채팅에 매일 정해진 시각(회차)마다 스크리닝 보고서를 보내는 스케줄러
+
+    회차마다 전체 종목군 스크리닝은 한 번만 실행하며, 완료된 회차는 재시작 후에도 다시 실행하지 않는다.
+    재시작 때문에 놓쳤거나 중간에 끊긴 최근 회차는 catchup 초 안이면 부팅 직후 이어서 실행하고, 이미 받은
+    채팅에는 다시 보내지 않는다. 시작 시각은 0~jitter 초 사이에서 무작위로 늦춰 매 정각 외부 요청이
+    몰리지 않게 하고, 보고서 전송은 채팅마다 0~spread 초 사이의 무작위 시점에 시작해 구독자 전체에 대한
+    전송이 한꺼번에 몰리지 않게 한다.
+    """
+
+    def __init__(self, store: SubscriptionStore, at: dtime, jitter: float = DAILY_SCREENING_JITTER,
+                 catchup: float = DAILY_SCREENING_CATCHUP, spread: float = DAILY_SCREENING_SPREAD):
+        self.store = store
+        self.at = at
+        self.jitter = jitter
+        self.catchup = catchup
+        self.spread = spread
+        self._lock = asyncio.Lock()
+
+    def latest_slot(self, now: datetime = None) -> Tuple[str, datetime]:
+        """now 이전(포함)의 가장 최근 회차 (회차 id 는 현지 날짜)"""
+        now = (now or datetime.now(timezone.utc)).astimezone(self.at.tzinfo)
+        scheduled = now.replace(hour=self.at.hour, minute=self.at.minute, second=0, microsecond=0)
+        if scheduled > now:
+            scheduled -= timedelta(days=1)
+        return scheduled.strftime("%Y-%m-%d"), scheduled
+
+    async def run_slot(self, bot, slot: str):
+        """한 회차 실행: 아직 받지 못한 구독 채팅에 보고서 전송 (이미 완료된 회차면 아무것도 하지 않음)"""
+        async with self._lock:
+            if self.store.is_finished(slot):
+                logger.info(f"일일 스크리닝 {slot} 회차는 이미 완료되어 건너뜀")
+                return
+            self.store.start(slot)
+            delivered = self.store.delivered(slot)
+            chat_ids = [chat_id for chat_id in self.store.chat_ids() if chat_id not in delivered]
+            logger.info(f"일일 스크리닝 {slot} 회차 시작 (대상 채팅: {len(chat_ids)}, 이미 전송: {len(delivered)})")
+            if not chat_ids:
+                self.store.finish(slot, len(delivered), 0)
+                return
+            if self.jitter:
+                await asyncio.sleep(random.uniform(0, self.jitter))
+            messages = await build_report("all", max_age=0)
+            pending = {
+                chat_id: asyncio.ensure_future(self._deliver(bot, chat_id, messages)) for chat_id in chat_ids
+            }
+            failed = 0
+            try:
+                for chat_id, results in pending.items():
+                    errors = [r for r in await results if isinstance(r, Exception)]
+                    if not errors:
+                        self.store.mark_delivered(slot, [chat_id])
+                        continue
+                    failed += 1
+                    logger.error(f"사용자 {chat_id} 일일 스크리닝 전송 실패 | error: {errors[0]}")
+                    if isinstance(errors[0], telegram.error.Forbidden):
+                        # 봇을 차단했거나 나간 채팅은 구독에서 제외
+                        self.store.remove(chat_id)
+            finally:
+                # 회차가 중단되면 아직 시작하지 않은 전송도 멈춘다 (재시작 후 이어서 전송)
+                for task in pending.values():
+                    task.cancel()
+            self.store.finish(slot, len(delivered) + len(chat_ids), failed)
+            logger.info(f"일일 스크리닝 {slot} 회차 전송 완료 (채팅: {len(chat_ids)}, 실패: {failed})")
+
+    async def _deliver(self, bot, chat_id: int, messages: List[str]) -> list:
+        """무작위 지연 후 채팅의 보고서 메시지를 전송 큐에 예약. 예외는 결과로 돌려준다"""
+        if self.spread:
+            await asyncio.sleep(random.uniform(0, self.spread))
+        # 전송 큐가 허용 속도에 맞춰 보내고, 대화형 응답이 먼저 나간다
+        return await asyncio.gather(
+            *(outbox.submit(bot, chat_id, text, priority=BROADCAST) for text in messages),
+            return_exceptions=True,
+        )
+
+    async def job(self, context: ContextTypes.DEFAULT_TYPE):
+        """JobQueue 콜백. 회차는 job.data 가 없으면 현재 시각 기준 최근 회차"""
+        slot = context.job.data if context.job and context.job.data else self.latest_slot()[0]
+        await self.run_slot(context.bot, slot)
+
+    def install(self, job_queue: JobQueue):
+        """매일 회차 작업을 등록하고, 놓친 최근 회차가 있으면 부팅 직후 이어서 실행하도록 예약"""
+        job_queue.run_daily(self.job, time=self.at, name="daily_screening")
+        slot, scheduled = self.latest_slot()
+        missed = (datetime.now(timezone.utc) - scheduled).total_seconds()
+        if missed <= self.catchup and not self.store.is_finished(slot):
+            job_queue.run_once(self.job, when=1, data=slot, name="daily_screening_catchup")
+            logger.info(f"놓친 일일 스크리닝 {slot} 회차를 이어서 실행 예약 ({missed / 60:.0f}분 경과)")
+        logger.info(f"일일 스크리닝 예약: 매일 {self.at.strftime('%H:%M')} ({self.at.tzinfo}) | 구독 채팅: {self.store.count()}")
+
+subscriptions = SubscriptionStore(os.path.join(CACHE_DIR, "subscriptions.sqlite3"))
+daily_scheduler = DailyScreeningScheduler(
+    subscriptions, parse_time(DAILY_SCREENING_TIME, resolve_timezone(DAILY_SCREENING_TZ))
+)
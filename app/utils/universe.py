@@ -0,0 +1,231 @@
+import io
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, List, Optional
+import pandas as pd
+from app.config.config import CACHE_DIR, UNIVERSE_REFRESH_INTERVAL, WATCHLIST_DIR
+from app.utils.http import get_session
+from app.utils.logging import setup_logging
+from app.utils.metrics import metrics
+
+logger = setup_logging()
+
+# 조회 실패 후 다시 시도하기까지의 대기 시간 (초)
+FAILURE_RETRY_INTERVAL = 5 * 60
+
+def fetch_sp500_tickers() -> List[str]:
+    try:
+        url = "https://en.wikipedia.org/wiki/List_of_S%26P_500_companies"
+        response = get_session().get(url, headers={"User-Agent": "Mozilla/5.0"})
+        response.raise_for_status()
+        tables = pd.read_html(io.StringIO(response.text), attrs={"id": "constituents"})
+        sp500_df = tables[0]
+        tickers = sp500_df["Symbol"].str.replace(".", "-").tolist()
+        logger.info(f"Successfully fetched {len(tickers)} S&P 500 tickers")
+        return tickers
+    except Exception as e:
+        metrics.inc("source_errors_total", source="wikipedia")
+        logger.error(f"Failed to fetch S&P 500 tickers | error: {e}")
+        return []
+
+def fetch_nasdaq_tickers() -> List[str]:
+    try:
+        url = "https://api.nasdaq.com/api/quote/list-type/nasdaq100"
+        headers = {"User-Agent": "Mozilla/5.0"}
+        response = get_session().get(url, headers=headers)
+        response.raise_for_status()
+        data = response.json()
+        tickers = [item["symbol"] for item in data["data"]["data"]["rows"]]
+        logger.info(f"Successfully fetched {len(tickers)} Nasdaq-100 tickers from Nasdaq API")
+        return tickers
+    except Exception as e:
+        metrics.inc("source_errors_total", source="nasdaq")
+        logger.error(f"Failed to fetch Nasdaq-100 tickers from Nasdaq API | error: {e}")
+        return []
+
+RUSSELL3000_HOLDINGS_URL = (
+    "https://www.ishares.com/us/products/239714/ishares-russell-3000-etf/1467271812596.ajax"
+    "?fileType=csv&fileName=IWV_holdings&dataType=fund"
+)
+US_LISTING_URLS = {
+    "nasdaqlisted": "https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt",
+    "otherlisted": "https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt",
+}
+
+def _yahoo_symbol(symbol: str) -> str:
+    """BRK.B 같은 클래스 구분 기호를 야후 형식(BRK-B)으로 변환"""
+    return symbol.strip().upper().replace(".", "-").replace("/", "-")
+
+def fetch_russell3000_tickers() -> List[str]:
+    """iShares Russell 3000 ETF(IWV) 보유 종목 CSV 에서 주식만 추출"""
+    try:
+        response = get_session().get(RUSSELL3000_HOLDINGS_URL, headers={"User-Agent": "Mozilla/5.0"})
+        response.raise_for_status()
+        # 펀드 정보 몇 줄 뒤에 'Ticker,' 로 시작하는 표가 나온다
+        lines = response.text.splitlines()
+        header = next(i for i, line in enumerate(lines) if line.startswith("Ticker,"))
+        holdings = pd.read_csv(io.StringIO("\n".join(lines[header:])))
+        equities = holdings[holdings["Asset Class"] == "Equity"]
+        tickers = sorted({_yahoo_symbol(ticker) for ticker in equities["Ticker"].dropna().astype(str) if ticker != "-"})
+        logger.info(f"Successfully fetched {len(tickers)} Russell 3000 tickers")
+        return tickers
+    except Exception as e:
+        metrics.inc("source_errors_total", source="ishares")
+        logger.error(f"Failed to fetch Russell 3000 tickers | error: {e}")
+        return []
+
+def fetch_us_listed_tickers() -> List[str]:
+    """NASDAQ Trader 심볼 디렉터리에서 미국 상장 보통주 전체 (ETF, 테스트 종목 제외)"""
+    try:
+        tickers = set()
+        for name, url in US_LISTING_URLS.items():
+            response = get_session().get(url, headers={"User-Agent": "Mozilla/5.0"})
+            response.raise_for_status()
+            # 마지막 줄은 'File Creation Time' 이다
+            listing = pd.read_csv(io.StringIO(response.text), sep="|", dtype=str, skipfooter=1, engine="python")
+            symbols = listing["Symbol"] if "Symbol" in listing else listing["ACT Symbol"]
+            listed = symbols[(listing["Test Issue"] == "N") & (listing["ETF"] == "N")].dropna()
+            # 우선주($), 권리/유닛 등 야후에서 조회되지 않는 특수 종목은 제외
+            tickers.update(_yahoo_symbol(symbol) for symbol in listed if not any(c in symbol for c in "$+^="))
+        logger.info(f"Successfully fetched {len(tickers)} US listed tickers")
+        return sorted(tickers)
+    except Exception as e:
+        metrics.inc("source_errors_total", source="nasdaqtrader")
+        logger.error(f"Failed to fetch US listed tickers | error: {e}")
+        return []
+
+def csv_ticker_source(path: str) -> Callable[[], List[str]]:
+    """'ticker' 또는 'symbol' 열 (없으면 첫 열) 이 있는 CSV 관심 종목 파일을 읽는 조회 함수"""
+
+    def fetch() -> List[str]:
+        try:
+            watchlist = pd.read_csv(path, dtype=str)
+            columns = {column.strip().lower(): column for column in watchlist.columns}
+            column = columns.get("ticker") or columns.get("symbol") or watchlist.columns[0]
+            tickers = list(dict.fromkeys(_yahoo_symbol(ticker) for ticker in watchlist[column].dropna() if ticker.strip()))
+            logger.info(f"Loaded {len(tickers)} tickers from watchlist {path}")
+            return tickers
+        except Exception as e:
+            metrics.inc("source_errors_total", source="csv")
+            logger.error(f"Failed to load watchlist {path} | error: {e}")
+            return []
+
+    return fetch
+
+class Universe:
+    """구성 종목을 처음 사용할 때 불러오고 디스크 스냅샷으로 보관하는 종목군
+
+    갱신 주기가 지나면 다시 조회하고, 조회에 실패하면 마지막으로 성공한 스냅샷을 계속 쓴다. admin_only 인
+    종목군(수천 종목)은 관리자만 /screen 으로 실행할 수 있다.
+    """
+
+    def __init__(self, name: str, fetch: Callable[[], List[str]], path: str,
+                 refresh_interval: float = UNIVERSE_REFRESH_INTERVAL, label: Optional[str] = None,
+                 admin_only: bool = False):
+        self.name = name
+        self.label = label or name
+        self.admin_only = admin_only
+        self.fetch = fetch
+        self.path = path
+        self.refresh_interval = refresh_interval
+        self._tickers: List[str] = []
+        self._members: FrozenSet[str] = frozenset()
+        self._fetched_at: Optional[float] = None
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _set(self, tickers: List[str], fetched_at: float):
+        self._tickers = tickers
+        self._members = frozenset(tickers)
+        self._fetched_at = fetched_at
+
+    def _load_snapshot(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            self._set(snapshot["tickers"], snapshot["fetched_at"])
+            logger.info(f"Loaded {self.name} universe snapshot | tickers: {len(self._tickers)}")
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to load {self.name} universe snapshot | error: {e}")
+
+    def _save_snapshot(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"fetched_at": self._fetched_at, "tickers": self._tickers}, f)
+        os.replace(tmp_path, self.path)
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._fetched_at is None:
+                self._load_snapshot()
+            now = time.time()
+            if self._fetched_at is not None and now - self._fetched_at < self.refresh_interval:
+                return
+            if now < self._retry_at:
+                return
+            tickers = self.fetch()
+            if tickers:
+                self._set(tickers, time.time())
+                self._save_snapshot()
+                return
+            self._retry_at = now + FAILURE_RETRY_INTERVAL
+            if self._tickers:
+                logger.warning(f"{self.name} universe refresh failed, using last snapshot | tickers: {len(self._tickers)}")
+
+    def tickers(self) -> List[str]:
+        self._ensure_loaded()
+        return list(self._tickers)
+
+    def members(self) -> FrozenSet[str]:
+        self._ensure_loaded()
+        return self._members
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self.members()
+
+class UniverseRegistry:
+    def __init__(self, directory: str, watchlist_dir: Optional[str] = None):
+        self.directory = directory
+        self.watchlist_dir = watchlist_dir
+        self._universes: Dict[str, Universe] = {}
+
+    def register(self, name: str, fetch: Callable[[], List[str]], **kwargs) -> Universe:
+        universe = Universe(name, fetch, os.path.join(self.directory, f"{name}.json"), **kwargs)
+        self._universes[name] = universe
+        return universe
+
+    def get(self, name: str) -> Universe:
+        return self._universes[name]
+
+    def discover_watchlists(self):
+        """관심 종목 디렉터리의 *.csv 를 파일 이름으로 등록 (새로 추가된 파일만)"""
+        if not self.watchlist_dir or not os.path.isdir(self.watchlist_dir):
+            return
+        for filename in sorted(os.listdir(self.watchlist_dir)):
+            name, extension = os.path.splitext(filename)
+            name = name.lower()
+            if extension.lower() != ".csv" or name in self._universes:
+                continue
+            # 로컬 파일이라 자주 다시 읽어도 부담이 없다
+            self.register(name, csv_ticker_source(os.path.join(self.watchlist_dir, filename)),
+                          refresh_interval=60, label=f"관심목록 {name}")
+
+    def names(self) -> List[str]:
+        self.discover_watchlists()
+        return list(self._universes)
+
+    def __contains__(self, name: str) -> bool:
+        self.discover_watchlists()
+        return name in self._universes
+
+universes = UniverseRegistry(os.path.join(CACHE_DIR, "universes"), WATCHLIST_DIR)
+universes.register("nasdaq", fetch_nasdaq_tickers, label="나스닥")
+universes.register("sp500", fetch_sp500_tickers, label="S&P 500")
+# 수천 종목이라 한 번 실행으로 모두의 yfinance 요청 한도를 소모할 수 있어 관리자만 실행
+universes.register("russell3000", fetch_russell3000_tickers, label="러셀 3000", admin_only=True)
+universes.register("us_all", fetch_us_listed_tickers, label="미국 전체 상장", admin_only=True)
@@ -0,0 +1,73 @@
+"""종목별 analyze_close 반복과 analyze_universe 벡터화 경로 비교
+
+    python -m benchmarks.bench_analyze_universe [--tickers 5000] [--days 1260]
+"""
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+from benchmarks.fake_provider import app_environment, make_info, make_panel, make_tickers
+
+COMPARED = ["current_price", "industry_pe", "intrinsic_value", "safety_margin", "cagr", "score",
+            "moat", "consistency", "track_record", "buy_recommendation"]
+
+def panel_close(panel: pd.DataFrame, ticker: str):
+    """패널에서 티커의 종가 열 (첫/마지막 유효 봉 바깥 구간 제외)"""
+    if ticker not in panel.columns:
+        return None
+    close = panel[ticker]
+    first = close.first_valid_index()
+    if first is None:
+        return None
+    return close.loc[first:close.last_valid_index()]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=1260)
+    args = parser.parse_args()
+
+    with app_environment():
+        run(args)
+
+def run(args):
+    from app.utils import stock
+    from app.utils.analysis import analyze_universe, build_info_frame
+    from app.utils.logging import setup_logging
+    from app.utils.universe import universes
+
+    setup_logging().setLevel(logging.ERROR)
+    tickers = make_tickers(args.tickers)
+    panel = make_panel(tickers, args.days)
+    infos = {ticker: make_info(ticker) for ticker in tickers}
+    stock.fetch_stock_info = infos.__getitem__
+    # 종목군 소속 여부(is_nasdaq100/is_sp500)를 Nasdaq API, Wikipedia 대신 합성 티커로 판정
+    universes.get("nasdaq").fetch = lambda: tickers[:max(1, len(tickers) // 5)]
+    universes.get("sp500").fetch = lambda: list(tickers)
+
+    start = time.perf_counter()
+    scalar = [
+        result for ticker in tickers
+        if (close := panel_close(panel, ticker)) is not None
+        and (result := stock.analyze_close(ticker, close, include_description=False)) is not None
+    ]
+    scalar_df = pd.DataFrame(scalar).set_index("ticker")
+    scalar_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    info_frame = build_info_frame([{"ticker": ticker, **info} for ticker, info in infos.items()])
+    vector_df = analyze_universe(panel, info_frame)
+    vector_time = time.perf_counter() - start
+
+    assert list(scalar_df.index) == list(vector_df.index), "analyzed ticker sets differ"
+    for column in COMPARED:
+        left, right = scalar_df[column].to_numpy(dtype=float), vector_df[column].to_numpy(dtype=float)
+        assert np.allclose(left, right, atol=0.011, equal_nan=True), f"{column} mismatch"
+
+    print(f"tickers={args.tickers} days={args.days} analyzed={len(vector_df)}")
+    print(f"per-ticker : {scalar_time:8.3f}s")
+    print(f"vectorized : {vector_time:8.3f}s  ({scalar_time / vector_time:.0f}x faster, results match)")
+
+if __name__ == "__main__":
+    main()
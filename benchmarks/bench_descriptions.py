@@ -0,0 +1,43 @@
+"""종목 설명: 티커별 요청 vs 묶음 요청, 그리고 캐시 재사용 비교 (로컬 가짜 엔드포인트 사용)
+
+    python -m benchmarks.bench_descriptions [--tickers 120] [--latency 0.2]
+"""
+import argparse
+import time
+from benchmarks.fake_openrouter import FakeCompletionServer
+from benchmarks.fake_provider import app_environment, make_tickers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=120)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    with FakeCompletionServer(args.latency) as server, app_environment(OPEN_ROUTER_API_URL=server.url):
+        from app.utils import stock
+
+        tickers = make_tickers(args.tickers)
+        half = len(tickers) // 2
+
+        start = time.perf_counter()
+        single = {ticker: stock.fetch_stock_description(ticker) for ticker in tickers[:half]}
+        single_time, single_requests = time.perf_counter() - start, server.requests
+
+        start = time.perf_counter()
+        batch = stock.fetch_stock_descriptions(tickers[half:])
+        batch_time, batch_requests = time.perf_counter() - start, server.requests - single_requests
+        assert len(batch) == len(tickers) - half, "batch reply was not fully parsed"
+
+        start = time.perf_counter()
+        cached = stock.fetch_stock_descriptions(tickers)
+        cached_time, cached_requests = time.perf_counter() - start, server.requests - single_requests - batch_requests
+        assert cached_requests == 0 and len(cached) == len(tickers), "cache miss on second pass"
+        assert all(cached[ticker] == single[ticker] for ticker in single)
+
+    print(f"tickers={args.tickers} latency={args.latency}s")
+    print(f"single : {half:>5} tickers | {single_requests:>4} requests | {single_time:6.2f}s")
+    print(f"batch  : {len(tickers) - half:>5} tickers | {batch_requests:>4} requests | {batch_time:6.2f}s")
+    print(f"cached : {len(tickers):>5} tickers | {cached_requests:>4} requests | {cached_time:6.2f}s")
+
+if __name__ == "__main__":
+    main()
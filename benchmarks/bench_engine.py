@@ -0,0 +1,33 @@
+"""동시성 수준별 스크리닝 엔진 소요 시간 측정
+
+    python -m benchmarks.bench_engine [--tickers 200] [--latency 0.05]
+"""
+import argparse
+import asyncio
+import time
+from benchmarks.fake_provider import FakeDataProvider, make_tickers
+from app.utils.engine import ScreeningEngine
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="가짜 요청 1회당 지연(초)")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    args = parser.parse_args()
+
+    tickers = make_tickers(args.tickers)
+    print(f"tickers={args.tickers} latency={args.latency}s")
+    print(f"{'concurrency':>11} | {'wall (s)':>8} | {'tickers/s':>9} | {'speedup':>7}")
+    baseline = None
+    for level in args.levels:
+        provider = FakeDataProvider(latency=args.latency)
+        engine = ScreeningEngine(provider.analyze, concurrency=level, retries=0)
+        start = time.perf_counter()
+        results = asyncio.run(engine.run(tickers))
+        elapsed = time.perf_counter() - start
+        assert len(results) == len(tickers)
+        baseline = baseline or elapsed
+        print(f"{level:>11} | {elapsed:>8.2f} | {len(tickers) / elapsed:>9.1f} | {baseline / elapsed:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
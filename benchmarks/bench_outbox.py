@@ -0,0 +1,98 @@
+"""전송 큐 방송 벤치마크
+
+텔레그램 한도(전체 초당 30통, 채팅당 초당 1통)를 넘기면 RetryAfter 를 던지는 가짜 봇에 수천 채팅 방송을
+보내면서 대화형 응답을 섞는다. 완료 시간, 실제 전송 속도, RetryAfter 횟수, 유실 메시지, 대화형 응답 지연을 잰다.
+
+    python -m benchmarks.bench_outbox [--chats 2000] [--messages 2] [--replies 50]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, List
+
+import benchmarks.fake_provider  # noqa: F401  (앱 설정에 필요한 환경 변수 지정)
+import telegram.error
+
+class FloodLimitedBot:
+    """한도를 넘는 전송에 RetryAfter 를 던지는 텔레그램 봇 대역"""
+
+    def __init__(self, global_rate: float = 30, chat_rate: float = 1, latency: float = 0.03):
+        self.global_rate = global_rate
+        self.chat_rate = chat_rate
+        self.latency = latency
+        self.window = deque()
+        self.last_by_chat: Dict[Any, float] = {}
+        self.delivered: List[Dict[str, Any]] = []
+        self.rejected = 0
+
+    async def send_message(self, chat_id, text, **kwargs):
+        await asyncio.sleep(self.latency)
+        now = time.monotonic()
+        while self.window and now - self.window[0] > 1.0:
+            self.window.popleft()
+        # 채팅당 한도는 짧은 연속 전송을 허용하도록 절반 간격까지 봐준다
+        too_fast = now - self.last_by_chat.get(chat_id, float("-inf")) < 0.5 / self.chat_rate
+        if len(self.window) >= self.global_rate * 1.1 or too_fast:
+            self.rejected += 1
+            raise telegram.error.RetryAfter(1)
+        self.window.append(now)
+        self.last_by_chat[chat_id] = now
+        self.delivered.append({"chat_id": chat_id, "text": text, "at": now})
+        return self
+
+async def broadcast(args) -> Dict[str, Any]:
+    from app.utils.outbox import BROADCAST, SendQueue
+
+    bot = FloodLimitedBot(latency=args.latency)
+    queue = SendQueue(global_rate=args.global_rate, chat_rate=1, chat_burst=3)
+    start = time.monotonic()
+    futures = [
+        queue.submit(bot, chat_id, f"report {chat_id}/{part}", priority=BROADCAST, coalesce=False)
+        for chat_id in range(args.chats) for part in range(args.messages)
+    ]
+
+    async def interactive(index: int) -> float:
+        # 방송 도중 들어오는 사용자 응답
+        await asyncio.sleep(index * 0.2)
+        began = time.monotonic()
+        await queue.send(bot, f"user-{index}", "reply")
+        return time.monotonic() - began
+
+    reply_latencies = await asyncio.gather(*(interactive(i) for i in range(args.replies)))
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    wall = time.monotonic() - start
+    await queue.close()
+
+    per_chat = defaultdict(list)
+    for sent in bot.delivered:
+        per_chat[sent["chat_id"]].append(sent["text"])
+    in_order = all(texts == sorted(texts) for texts in per_chat.values())
+    expected = args.chats * args.messages + args.replies
+    return {
+        "messages": expected,
+        "delivered": len(bot.delivered),
+        "dropped": sum(isinstance(result, Exception) for result in results) + expected - len(bot.delivered),
+        "retry_after": bot.rejected,
+        "wall_s": round(wall, 2),
+        "rate_per_s": round(len(bot.delivered) / wall, 1),
+        "ideal_s": round(expected / args.global_rate, 2),
+        "in_order": in_order,
+        "reply_p50_ms": round(statistics.median(reply_latencies) * 1000, 1) if reply_latencies else None,
+        "reply_max_ms": round(max(reply_latencies) * 1000, 1) if reply_latencies else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=2, help="채팅당 방송 메시지 수")
+    parser.add_argument("--replies", type=int, default=50, help="방송 중 섞이는 대화형 응답 수")
+    parser.add_argument("--global-rate", type=float, default=30)
+    parser.add_argument("--latency", type=float, default=0.03, help="가짜 API 응답 지연 (초)")
+    args = parser.parse_args()
+    for key, value in asyncio.run(broadcast(args)).items():
+        print(f"{key:>14}: {value}")
+
+if __name__ == "__main__":
+    main()
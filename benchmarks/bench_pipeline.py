@@ -0,0 +1,240 @@
+"""분석/스크리닝 파이프라인 오프라인 벤치마크
+
+yfinance, Nasdaq API, Wikipedia, OpenRouter 를 모두 결정적인 가짜 데이터로 대체하고
+analyze_stock, manual_screening(가짜 봇), 운영과 같은 Application 으로 디스패치한 메시지 처리를 종목군 크기별로 끝까지 실행한다.
+각 (시나리오, 크기) 조합은 캐시가 비어 있는 별도 프로세스에서 실행되며,
+처리량, 지연 시간 분위수, 최대 메모리(RSS)를 출력하고 JSON 으로 저장해 실행 간 비교할 수 있게 한다.
+
+screening 시나리오는 한 번의 실행이라 지연 분위수 대신 첫 출력/첫 결과까지의 시간을 기록한다.
+
+    python -m benchmarks.bench_pipeline [--sizes 100 1000 10000] [--latency 0.0]
+        [--scenarios analyze screening message] [--concurrent-updates 64] [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+SCENARIOS = ("analyze", "screening", "message")
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(latencies: List[float]) -> Dict[str, float]:
+    return {f"p{q}_ms": round(percentile(latencies, q) * 1000, 2) for q in (50, 90, 99)}
+
+def format_ms(value) -> str:
+    """분위수가 없는 시나리오(screening)는 '-' 로 표시"""
+    return "-" if value is None else f"{value:.1f}"
+
+def run_analyze(market, args) -> Dict[str, Any]:
+    from app.utils.stock import analyze_stock
+
+    latencies = []
+    start = time.perf_counter()
+    for ticker in market.tickers:
+        began = time.perf_counter()
+        analyze_stock(ticker, include_description=False)
+        latencies.append(time.perf_counter() - began)
+    wall = time.perf_counter() - start
+    return {"count": len(market.tickers), "wall_s": wall, **summarize(latencies)}
+
+def run_screening(market, args) -> Dict[str, Any]:
+    from benchmarks.fake_provider import FakeBot
+    from app.utils.screening import manual_screening
+
+    bot = FakeBot()
+    context = SimpleNamespace(bot=bot, bot_data={})
+    start = time.perf_counter()
+    asyncio.run(manual_screening(context, chat_id=1, scope="all", is_manual=True))
+    wall = time.perf_counter() - start
+    first = bot.sent[0]["at"] - start if bot.sent else wall
+    # 진행 상황 메시지를 제외한 첫 결과 메시지(추천 목록 또는 완료 요약)까지의 시간
+    results = [sent for sent in bot.sent if "추천" in sent["text"] or "완료" in sent["text"]]
+    first_result = results[0]["at"] - start if results else wall
+    return {
+        "count": len(market.tickers),
+        "wall_s": wall,
+        "first_output_s": round(first, 3),
+        "first_result_s": round(first_result, 3),
+        "messages": len(bot.sent),
+        "largest_message_chars": max((len(sent["text"]) for sent in bot.sent), default=0),
+    }
+
+def run_message(market, args) -> Dict[str, Any]:
+    from datetime import datetime, timezone
+    from telegram import Chat, Message, Update, User
+    from telegram.ext import Application, ExtBot, TypeHandler
+    from benchmarks.fake_provider import FakeBot
+    from app.main import build_application
+
+    recorder = FakeBot()
+
+    class OfflineBot(ExtBot):
+        """텔레그램 서버 없이 봇 정보를 채우고 전송은 가짜 봇에 기록"""
+
+        async def initialize(self):
+            self._bot_user = User(1, "bench", True, username="bench_bot")
+            self._initialized = True
+
+        async def shutdown(self):
+            self._initialized = False
+
+        async def send_message(self, chat_id, text, *args, **kwargs):
+            return await recorder.send_message(chat_id, text)
+
+    # 일부 티커가 겹치는 동시 요청 폭주 (요청 병합 효과 포함). 지정하지 않으면 종목군 크기만큼 보낸다
+    requests = args.burst or len(market.tickers)
+    tickers = [market.tickers[i % max(1, min(len(market.tickers), requests // 2))] for i in range(requests)]
+    enqueued: Dict[int, float] = {}
+    latencies: List[float] = []
+
+    async def burst():
+        # 운영과 같은 Application 구성으로 업데이트 큐에 넣어 PTB 디스패치(동시 처리 수 포함)를 거치게 한다
+        bot = OfflineBot("1:offline")
+        application = build_application(Application.builder().bot(bot))
+        done = asyncio.Event()
+
+        async def record_done(update: Update, context):
+            latencies.append(time.perf_counter() - enqueued[update.update_id])
+            if len(latencies) == len(tickers):
+                done.set()
+
+        application.add_handler(TypeHandler(Update, record_done), group=1)
+        await application.initialize()
+        await application.start()
+        now = datetime.now(timezone.utc)
+        for update_id, ticker in enumerate(tickers):
+            # 폭주는 여러 사용자에게서 오므로 채팅별 전송 한도에 걸리지 않도록 채팅을 나눈다
+            chat_id = update_id + 1
+            user = User(chat_id, f"user{chat_id}", False)
+            message = Message(update_id, now, Chat(chat_id, Chat.PRIVATE), from_user=user, text=ticker.lower())
+            message.set_bot(bot)
+            enqueued[update_id] = time.perf_counter()
+            await application.update_queue.put(Update(update_id, message=message))
+        await done.wait()
+        await application.stop()
+        await application.shutdown()
+
+    start = time.perf_counter()
+    asyncio.run(burst())
+    wall = time.perf_counter() - start
+    return {"count": len(tickers), "wall_s": wall, "concurrent_updates": int(os.environ["TELEGRAM_CONCURRENT_UPDATES"]),
+            **summarize(latencies)}
+
+RUNNERS = {"analyze": run_analyze, "screening": run_screening, "message": run_message}
+
+def worker(args):
+    """단일 (시나리오, 크기) 측정. 결과 JSON 을 표준출력 마지막 줄로 출력"""
+    from benchmarks.fake_openrouter import FakeCompletionServer
+    from benchmarks.fake_provider import FakeMarket, app_environment
+
+    with FakeCompletionServer(args.llm_latency) as server, app_environment(
+        OPEN_ROUTER_API_URL=server.url, TELEGRAM_CONCURRENT_UPDATES=args.concurrent_updates
+    ):
+        from app.utils.logging import setup_logging
+        import logging
+
+        setup_logging().setLevel(logging.WARNING)
+        market = FakeMarket(args.size, latency=args.latency, days=args.days)
+        market.install()
+
+        if args.trace_memory:
+            tracemalloc.start()
+        result = RUNNERS[args.scenario](market, args)
+        if args.trace_memory:
+            result["peak_traced_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+            tracemalloc.stop()
+
+    result.update({
+        "scenario": args.scenario,
+        "size": args.size,
+        "throughput_per_s": round(result["count"] / result["wall_s"], 2) if result["wall_s"] else 0.0,
+        "wall_s": round(result["wall_s"], 3),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "provider_calls": market.calls,
+        "llm_requests": server.requests,
+    })
+    print(json.dumps(result))
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--latency", type=float, default=0.0, help="가짜 yfinance 요청 1회당 지연(초)")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="가짜 OpenRouter 응답 지연(초)")
+    parser.add_argument("--days", type=int, default=1260, help="티커별 가격 이력 길이(영업일)")
+    parser.add_argument("--burst", type=int, default=None, help="message 시나리오의 동시 요청 수 (기본: 종목군 크기)")
+    parser.add_argument("--concurrent-updates", type=int, default=64,
+                        help="message 시나리오의 텔레그램 업데이트 동시 처리 수 (1 이면 PTB 기본값처럼 하나씩)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="tracemalloc 으로 파이썬 할당 최대치도 측정 (느려지므로 처리량 비교 시에는 끄기)")
+    parser.add_argument("--output", default=None, help="결과 JSON 경로 (기본: benchmarks/results/pipeline-<시각>.json)")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args)
+        return
+
+    results = []
+    print(f"{'scenario':>10} | {'size':>6} | {'wall (s)':>8} | {'items/s':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'RSS MB':>7}", flush=True)
+    for scenario in args.scenarios:
+        for size in args.sizes:
+            command = [
+                sys.executable, "-m", "benchmarks.bench_pipeline", "--worker",
+                "--scenario", scenario, "--size", str(size), "--latency", str(args.latency),
+                "--llm-latency", str(args.llm_latency), "--days", str(args.days),
+                "--concurrent-updates", str(args.concurrent_updates),
+            ] + (["--burst", str(args.burst)] if args.burst else []) + (["--trace-memory"] if args.trace_memory else [])
+            completed = subprocess.run(command, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(f"{scenario:>10} | {size:>6} | failed\n{completed.stderr[-2000:]}", flush=True)
+                continue
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            results.append(result)
+            print(f"{scenario:>10} | {size:>6} | {result['wall_s']:>8.2f} | {result['throughput_per_s']:>8.1f} | "
+                  f"{format_ms(result.get('p50_ms')):>8} | {format_ms(result.get('p99_ms')):>8} | {result['max_rss_mb']:>7.1f}", flush=True)
+
+    output = args.output or os.path.join(
+        os.path.dirname(__file__), "results", f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "revision": git_revision(),
+                "python": platform.python_version(),
+                "latency": args.latency,
+                "llm_latency": args.llm_latency,
+                "days": args.days,
+                "burst": args.burst,
+                "concurrent_updates": args.concurrent_updates,
+                "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"saved {output}")
+
+if __name__ == "__main__":
+    main()
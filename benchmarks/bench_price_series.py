@@ -0,0 +1,74 @@
+"""단일 종목 분석용 압축 가격 이력(PriceSeries) 벤치마크
+
+가짜 시장으로 종목을 분석하며 티커당 메모리를 yfinance 원본 형태(OHLCV + Dividends/Splits float64, tz 인덱스)
+및 캐시에서 읽은 OHLCV 프레임과 비교하고, 작은 예산에서 캐시 크기가 한도를 넘지 않는지, 분석 결과가 float64
+전체 프레임으로 계산한 값과 같은지, 메모리 재사용 시 분석 시간이 얼마나 줄어드는지 확인한다.
+
+    python -m benchmarks.bench_price_series [--size 500] [--budget-kb 2048]
+"""
+import argparse
+import sys
+import time
+
+from benchmarks.fake_provider import FakeMarket, app_environment
+
+COMPARED = ["current_price", "intrinsic_value", "safety_margin", "cagr", "score"]
+
+def frame_bytes(df) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--budget-kb", type=int, default=2048, help="캐시 예산 (KB)")
+    args = parser.parse_args()
+
+    with app_environment(PRICE_SERIES_CACHE_BYTES=args.budget_kb * 1024):
+        import numpy as np
+        from app.utils import stock
+        from app.utils.cache import market_cache
+        from app.utils.price_series import price_series
+
+        market = FakeMarket(args.size)
+        market.install()
+
+        # yfinance Ticker.history 가 돌려주는 형태
+        raw = market.prices(market.tickers[0]).assign(Dividends=0.0, **{"Stock Splits": 0.0})
+        raw.index = raw.index.tz_localize("America/New_York")
+        raw_bytes = frame_bytes(raw)
+
+        peak, mismatches, cold, warm = 0, 0, [], []
+        for ticker in market.tickers:
+            began = time.perf_counter()
+            result = stock.analyze_stock(ticker, include_description=False)
+            cold.append(time.perf_counter() - began)
+            peak = max(peak, price_series.nbytes)
+            # analyze_stock 이 갱신한 캐시의 OHLCV 프레임(float64)으로 계산한 기준 결과
+            frame = market_cache.load_prices(ticker, stock.period_start("5y"))
+            reference = stock.analyze_close(ticker, frame["Close"], include_description=False)
+            if (result is None) != (reference is None):
+                mismatches += 1
+            elif result is not None:
+                same = all(abs(result[key] - reference[key]) <= 0.011 for key in COMPARED)
+                mismatches += not (same and result["buy_recommendation"] == reference["buy_recommendation"])
+
+        # 예산 안에 남은 종목을 다시 분석 (메모리 재사용)
+        recent = market.tickers[-len(price_series):]
+        for ticker in recent:
+            began = time.perf_counter()
+            stock.analyze_stock(ticker, include_description=False)
+            warm.append(time.perf_counter() - began)
+
+        loaded_bytes = frame_bytes(market_cache.load_prices(market.tickers[0], stock.period_start("5y")))
+        stats = price_series.stats()
+        print(f"tickers: {args.size}, rows per ticker: {market.days}")
+        print(f"memory per ticker: yfinance frame {raw_bytes / 1024:.1f} KB, cached OHLCV frame {loaded_bytes / 1024:.1f} KB, "
+              f"PriceSeries {stats['bytes_per_ticker'] / 1024:.1f} KB")
+        print(f"cache: {stats['entries']} tickers, {stats['bytes'] / 1024:.0f} KB of {stats['limit_bytes'] / 1024:.0f} KB "
+              f"(peak {peak / 1024:.0f} KB), evictions: {stats['evictions']}")
+        print(f"analyze_stock (median): load {np.median(cold) * 1000:.2f} ms, reuse {np.median(warm) * 1000:.2f} ms")
+        print(f"result mismatches vs float64 frame: {mismatches}")
+    sys.exit(1 if mismatches or peak > args.budget_kb * 1024 else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""스크리닝 결과 스냅샷 저장소 벤치마크
+
+합성 종목군의 analyze_universe 결과를 하루씩 조금씩 바꿔가며 여러 실행일 스냅샷으로 저장한 뒤, 저장/읽기
+시간, 안전마진 30% 돌파 조회와 전일 대비 비교 시간, 티커당 메모리(딕셔너리 목록 대비)를 잰다.
+
+    python -m benchmarks.bench_result_store [--size 5000] [--days 10]
+"""
+import argparse
+import os
+import time
+import tracemalloc
+
+from benchmarks.fake_provider import app_environment, make_info, make_panel, make_tickers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=10, help="저장할 실행일 수")
+    args = parser.parse_args()
+
+    with app_environment() as root:
+        import numpy as np
+        import pandas as pd
+        from app.utils.analysis import analyze_universe, build_info_frame
+        from app.utils.result_store import ResultStore
+        from app.utils.universe import universes
+
+        tickers = make_tickers(args.size)
+        universes.get("nasdaq").fetch = lambda: tickers[: args.size // 5]
+        universes.get("sp500").fetch = lambda: list(tickers)
+        panel = make_panel(tickers, days=1260)
+        base = analyze_universe(panel, build_info_frame([{"ticker": t, **make_info(t)} for t in tickers]))
+        store = ResultStore(os.path.join(root, "results"))
+        rng = np.random.default_rng(0)
+
+        dates = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=args.days).strftime("%Y-%m-%d")
+        save_times = []
+        for run_date in dates:
+            results = base.copy()
+            results["safety_margin"] = (results["safety_margin"] + rng.normal(0, 5, len(results))).round(2)
+            results["buy_recommendation"] = (results["safety_margin"] > 30) & (results["score"] >= 0.6)
+            began = time.perf_counter()
+            store.save("bench", results, run_date)
+            save_times.append(time.perf_counter() - began)
+
+        began = time.perf_counter()
+        latest = store.load("bench")
+        load_ms = (time.perf_counter() - began) * 1000
+        began = time.perf_counter()
+        crossed = store.crossed("bench", "safety_margin", 30.0, since=dates[-5])
+        crossed_ms = (time.perf_counter() - began) * 1000
+        began = time.perf_counter()
+        diff = store.diff("bench")
+        diff_ms = (time.perf_counter() - began) * 1000
+
+        # 기존 표현: 티커마다 결과 딕셔너리 하나
+        tracemalloc.start()
+        records = base.to_dict("records")
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del records
+        snapshot_bytes = store.nbytes("bench")
+
+        print(f"tickers: {len(base)}, run dates: {args.days}")
+        print(f"save (median): {np.median(save_times) * 1000:.1f} ms, load latest: {load_ms:.1f} ms")
+        print(f"safety margin crossed 30% in last 5 runs: {len(crossed)} tickers in {crossed_ms:.1f} ms")
+        print(f"diff vs previous run: {len(diff)} tickers in {diff_ms:.1f} ms "
+              f"({int((diff['status'] == 'recommendation_changed').sum())} recommendation changes)")
+        print(f"memory per ticker: dicts {dict_bytes / len(base):.0f} B vs snapshot {snapshot_bytes / len(latest):.0f} B")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""샤드 분할 스크리닝 확장성 벤치마크
+
+같은 합성 종목군을 워커 프로세스 수를 바꿔가며 빈 캐시에서 끝까지 스크리닝하고, 처리량과 1 워커 대비
+배율을 잰다. 모든 워커 수에서 합쳐진 결과가 같은지도 확인한다. 배율은 코어 수를 넘을 수 없다.
+
+    python -m benchmarks.bench_sharding [--size 2000] [--workers 1 2 4] [--latency 0.0]
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from benchmarks.fake_provider import app_environment, install_fake_market, make_tickers
+
+async def screen(screener, tickers):
+    import pandas as pd
+
+    results = [result async for _, result in screener.run(tickers)]
+    results = [result for result in results if not result.empty]
+    return pd.concat(results).sort_index() if results else pd.DataFrame()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shard-size", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.0, help="가짜 yfinance 호출 지연 (초)")
+    args = parser.parse_args()
+
+    with app_environment() as root:
+        from app.utils.sharding import ShardedScreener
+
+        tickers = make_tickers(args.size)
+        print(f"cpu cores: {os.cpu_count()}, tickers: {args.size}, shard size: {args.shard_size}")
+        baseline, reference = None, None
+        for workers in args.workers:
+            # 워커는 spawn 시점의 환경을 물려받으므로 워커 수마다 빈 캐시에서 시작
+            os.environ["CACHE_DIR"] = os.path.join(root, f"workers-{workers}")
+            screener = ShardedScreener(workers, args.shard_size, install_fake_market, (args.size, args.latency))
+            start = time.perf_counter()
+            result = asyncio.run(screen(screener, tickers))
+            wall = time.perf_counter() - start
+            screener.shutdown()
+            baseline = baseline or wall
+            if reference is None:
+                reference = result
+            same = result.index.equals(reference.index) and result["score"].equals(reference["score"])
+            print(f"workers {workers:>2}: {wall:7.2f}s  {args.size / wall:7.1f} tickers/s  "
+                  f"speedup {baseline / wall:4.2f}x  rows {len(result)}  same result: {same}")
+
+if __name__ == "__main__":
+    main()
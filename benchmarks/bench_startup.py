@@ -0,0 +1,35 @@
+"""봇 모듈 임포트(프로세스 시작) 소요 시간 측정
+
+새 인터프리터에서 app.main 을 임포트하는 시간을 반복 측정한다. 캐시와 로그 파일은 임시 디렉터리에 쓴다.
+
+    python -m benchmarks.bench_startup [--runs 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+from benchmarks.fake_provider import app_environment
+
+SNIPPET = "import time; s = time.perf_counter(); import app.main; print(time.perf_counter() - s)"
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    timings = []
+    with app_environment(PYTHONPATH=ROOT) as cache_dir:
+        for _ in range(args.runs):
+            # 로그 파일이 작업 디렉터리에 생기므로 저장소 밖에서 실행한다
+            output = subprocess.run(
+                [sys.executable, "-c", SNIPPET], cwd=cache_dir, capture_output=True, text=True, check=True
+            ).stdout
+            timings.append(float(output.strip().splitlines()[-1]))
+    print(f"import app.main | runs: {args.runs} | median: {statistics.median(timings):.3f}s "
+          f"| min: {min(timings):.3f}s | max: {max(timings):.3f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""관심 종목 시세 알림 벤치마크
+
+여러 채팅이 공통 종목 풀에서 관심 종목을 골라 등록한 상태에서 합성 시세(랜덤 워크)로 여러 번 시세를
+확인한다. 확인 한 번당 시세 요청 수/요청 티커 수(채팅 x 종목 단순 반복 대비), 소요 시간, 알림 수를 재고,
+알림이 기준을 아래에서 위로 넘은 경우에만 나갔는지 확인한다.
+
+    python -m benchmarks.bench_watch [--chats 2000] [--per-chat 10] [--pool 300] [--polls 50]
+"""
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.fake_provider import app_environment, make_info, make_tickers
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=2000)
+    parser.add_argument("--per-chat", type=int, default=10)
+    parser.add_argument("--pool", type=int, default=300, help="채팅들이 고르는 종목 풀 크기")
+    parser.add_argument("--polls", type=int, default=50)
+    args = parser.parse_args()
+
+    with app_environment() as cache_dir:
+        import numpy as np
+        from app.config.config import PRICE_CHUNK_SIZE
+        from app.utils.price_watch import PriceWatcher, WatchStore
+
+        rng = np.random.default_rng(0)
+        pool = [ticker for ticker in make_tickers(args.pool * 2) if make_info(ticker)["trailingEps"] > 0][: args.pool]
+        prices = {ticker: 30.0 + 70 * rng.random() for ticker in pool}
+        calls = {"requests": 0, "tickers": 0, "info": 0}
+
+        def quote_fetcher(tickers):
+            calls["requests"] += -(-len(tickers) // PRICE_CHUNK_SIZE)
+            calls["tickers"] += len(tickers)
+            return {ticker: prices[ticker] for ticker in tickers}
+
+        def info_fetcher(ticker):
+            calls["info"] += 1
+            return make_info(ticker)
+
+        store = WatchStore(os.path.join(cache_dir, "watches.sqlite3"))
+        watcher = PriceWatcher(store, quote_fetcher=quote_fetcher, info_fetcher=info_fetcher)
+        watched = 0
+        for chat_id in range(args.chats):
+            for ticker in rng.choice(pool, args.per_chat, replace=False):
+                store.add(chat_id, str(ticker), float(rng.choice([20, 30, 40])))
+                watched += 1
+        watcher.poll()  # 첫 확인은 현재 상태만 기록
+        for key in calls:
+            calls[key] = 0
+
+        alerts, timings, bad = 0, [], 0
+        for _ in range(args.polls):
+            for ticker in pool:
+                prices[ticker] *= float(np.exp(rng.normal(0, 0.03)))
+            before = {(chat_id, ticker): above for chat_id, ticker, _, above in store.watches()}
+            began = time.perf_counter()
+            fired = watcher.poll()
+            timings.append(time.perf_counter() - began)
+            alerts += len(fired)
+            # 알림은 직전 판정이 '기준 미만' 이었던 항목에서만 나와야 한다
+            bad += sum(1 for chat_id, ticker, _, _ in fired if before[(chat_id, ticker)])
+
+        distinct = len(store.tickers())
+        print(f"chats: {args.chats}, watches: {watched}, distinct tickers: {distinct}, polls: {args.polls}")
+        print(f"per poll: {calls['requests'] / args.polls:.0f} quote requests for {calls['tickers'] / args.polls:.0f} tickers "
+              f"(naive per-watch polling: {watched} requests)")
+        print(f"intrinsic value lookups after warm-up: {calls['info']}")
+        print(f"poll time (median): {np.median(timings) * 1000:.1f} ms, alerts: {alerts}, alerts without crossing: {bad}")
+    sys.exit(1 if bad else 0)
+
+if __name__ == "__main__":
+    main()
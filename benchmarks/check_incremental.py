@@ -0,0 +1,122 @@
+"""증분 재스크리닝이 전체 재계산과 같은 결과를 내는지 확인하고 두 방식의 시간을 비교
+
+합성 가격 이력을 캐시에 넣은 뒤 하루씩 새 봉을 추가하고 분석 구간을 밀면서, 가끔 마지막 봉을 확정
+종가로 고치고 일부 티커의 EPS 를 바꾼다. 매 단계마다 IncrementalScreener 결과를 캐시 가격 전체로
+다시 계산한 analyze_universe 결과와 비교하며, 하나라도 다르면 0 이 아닌 코드로 끝난다.
+
+    python -m benchmarks.check_incremental [--size 500] [--steps 30]
+"""
+import argparse
+import os
+import sys
+import time
+
+from benchmarks.fake_provider import app_environment, make_info, make_panel, make_tickers
+
+BOOL_COLUMNS = ["moat", "consistency", "track_record", "is_nasdaq100", "is_sp500", "buy_recommendation"]
+
+def compare(incremental, full) -> list:
+    """두 결과 프레임의 차이 목록"""
+    import numpy as np
+
+    problems = []
+    if sorted(incremental.index) != sorted(full.index):
+        return [f"tickers differ: {len(incremental)} vs {len(full)}"]
+    incremental = incremental.loc[full.index, full.columns]
+    for column in full.columns:
+        left, right = incremental[column].to_numpy(), full[column].to_numpy()
+        if column == "ticker" or column in BOOL_COLUMNS:
+            same = left == right
+        else:
+            same = np.isclose(left.astype(float), right.astype(float), rtol=0, atol=1e-9, equal_nan=True)
+        if not same.all():
+            problems.append(f"{column}: {int((~same).sum())} mismatches (e.g. {full.index[~same][0]})")
+    return problems
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=500)
+    parser.add_argument("--steps", type=int, default=30)
+    parser.add_argument("--days", type=int, default=1260)
+    args = parser.parse_args()
+
+    with app_environment() as cache_dir:
+        import numpy as np
+        import pandas as pd
+        from app.utils.analysis import analyze_universe, build_info_frame, price_stats
+        from app.utils.cache import MarketDataCache
+        from app.utils.incremental import IncrementalScreener
+        from app.utils.universe import universes
+
+        tickers = make_tickers(args.size)
+        universes.get("nasdaq").fetch = lambda: tickers[: args.size // 5]
+        universes.get("sp500").fetch = lambda: list(tickers)
+        panel = make_panel(tickers, days=args.days + args.steps)
+        infos = {ticker: make_info(ticker) for ticker in tickers}
+        cache = MarketDataCache(os.path.join(cache_dir, "check.sqlite3"))
+        screener = IncrementalScreener(cache)
+        rng = np.random.default_rng(1)
+
+        for ticker in tickers:
+            cache.store_prices(ticker, panel[[ticker]].iloc[: args.days].rename(columns={ticker: "Close"}), replace=True)
+
+        failures = 0
+        timings = {"incremental": [], "full": []}
+        for step in range(args.steps + 1):
+            end = args.days + step
+            since = panel.index[end - args.days]
+            if step:
+                bar = panel.iloc[[end - 1]]
+                if step % 3 == 0:
+                    # 장중 값으로 먼저 저장해 한 번 스크리닝한 뒤 확정 종가로 바뀌는 경우
+                    for ticker in tickers:
+                        cache.store_prices(ticker, bar[[ticker]].rename(columns={ticker: "Close"}) * 1.001)
+                    screener.update_prices(tickers, since=since)
+                for ticker in tickers:
+                    cache.store_prices(ticker, bar[[ticker]].rename(columns={ticker: "Close"}))
+                for ticker in rng.choice(tickers, max(1, args.size // 50), replace=False):
+                    infos[ticker]["trailingEps"] = round(infos[ticker]["trailingEps"] * 1.1 + 0.01, 4)
+            info_frame = build_info_frame([{"ticker": ticker, **info} for ticker, info in infos.items()])
+
+            began = time.perf_counter()
+            states = screener.update_prices(tickers, since=since)
+            incremental = screener.score(states, info_frame)
+            timings["incremental"].append(time.perf_counter() - began)
+
+            began = time.perf_counter()
+            closes = {}
+            for ticker in tickers:
+                df = cache.load_prices(ticker, since)
+                if df is not None:
+                    closes[ticker] = df["Close"]
+            full_panel = pd.DataFrame(closes)
+            full = analyze_universe(full_panel, info_frame)
+            timings["full"].append(time.perf_counter() - began)
+
+            problems = compare(incremental, full)
+            # 결과에는 임계값을 거친 값만 남으므로 가격 통계 자체도 비교
+            stats = price_stats(full_panel.to_numpy(dtype=float))
+            expected = pd.DataFrame({key: stats[key] for key in ("first_close", "current_price", "rows", "volatility")},
+                                    index=full_panel.columns)
+            actual = pd.DataFrame(
+                [(state.first_close, state.last_close, state.rows, state.volatility) for state in states.values()],
+                index=list(states), columns=expected.columns,
+            ).loc[expected.index]
+            drift = ~np.isclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-9, atol=0, equal_nan=True)
+            if drift.any():
+                problems.append(f"price stats: {int(drift.any(axis=1).sum())} tickers differ")
+            if problems:
+                failures += 1
+                print(f"step {step}: MISMATCH " + "; ".join(problems))
+
+        # 첫 단계는 상태를 처음 만드는 비용이므로 이후 단계만 비교
+        incremental_ms = np.median(timings["incremental"][1:]) * 1000
+        full_ms = np.median(timings["full"][1:]) * 1000
+        print(f"tickers: {args.size}, steps: {args.steps}, mismatching steps: {failures}")
+        print(f"initial build: {timings['incremental'][0] * 1000:.0f} ms")
+        print(f"per step (median): incremental {incremental_ms:.0f} ms vs full {full_ms:.0f} ms "
+              f"({full_ms / incremental_ms:.1f}x)")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""산업 P/E 대응 범위와 조회 시간 확인
+
+yfinance 산업명 목록(한 줄에 '산업|섹터', 기본: 수동 대응표의 산업명)을 IndustryPEResolver 로 대응시켜
+방법별(exact/override/normalized/fuzzy/sector) 개수와 유사도/섹터 대체로 정해진 이름을 출력하고, 처음
+조회와 메모이즈된 조회의 시간을 잰다. 대응표가 표에 없는(또는 NA 인) 산업을 가리키거나 dash 로 쓴 산업명이
+섹터 대체로 떨어지면 0 이 아닌 코드로 끝난다.
+
+    python -m benchmarks.check_pe_mapping [--industries yf_industries.txt] [--stern pedata.csv]
+"""
+import argparse
+import collections
+import sys
+import time
+
+import benchmarks.fake_provider  # noqa: F401  (앱 설정에 필요한 환경 변수 지정)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--industries", help="'산업|섹터' 목록 파일")
+    parser.add_argument("--stern", help="Stern pedata CSV (기본: 내장 표)")
+    parser.add_argument("--lookups", type=int, default=100000, help="메모이즈된 조회 횟수")
+    args = parser.parse_args()
+
+    from app.utils.pe_mapping import INDUSTRY_PE, YFINANCE_INDUSTRY_OVERRIDES
+    from app.utils.pe_resolver import IndustryPEResolver
+
+    resolver = IndustryPEResolver.from_file(args.stern) if args.stern else IndustryPEResolver(INDUSTRY_PE)
+    if args.industries:
+        with open(args.industries, encoding="utf-8") as f:
+            pairs = [tuple((line.strip().split("|") + [""])[:2]) for line in f if line.strip()]
+    else:
+        pairs = [(industry, "") for industry in YFINANCE_INDUSTRY_OVERRIDES]
+        # yfinance 가 em dash 로 구분해 주는 표기 ("Drug Manufacturers—General")
+        pairs += [(industry.replace(" - ", "\u2014"), "") for industry in YFINANCE_INDUSTRY_OVERRIDES if " - " in industry]
+
+    broken = sorted(industry for industry, name in YFINANCE_INDUSTRY_OVERRIDES.items() if name not in resolver.table)
+    for industry in broken:
+        print(f"override target missing: {industry} -> {YFINANCE_INDUSTRY_OVERRIDES[industry]}")
+
+    dashed = [industry for industry, _ in pairs if "\u2014" in industry or "\u2013" in industry]
+    for industry in dashed:
+        if resolver.resolve(industry, "")[2] == "sector":
+            broken.append(industry)
+            print(f"dash spelling not mapped: {industry}")
+
+    methods = collections.Counter()
+    began = time.perf_counter()
+    resolved = [resolver.resolve(industry, sector) for industry, sector in pairs]
+    cold_us = (time.perf_counter() - began) / max(len(pairs), 1) * 1e6
+    for (industry, sector), (name, pe, method) in zip(pairs, resolved):
+        methods[method] += 1
+        if method in ("fuzzy", "sector"):
+            print(f"{method:>6}: {industry} ({sector or '-'}) -> {name} [{pe}]")
+
+    began = time.perf_counter()
+    for i in range(args.lookups):
+        resolver.resolve(*pairs[i % len(pairs)])
+    warm_us = (time.perf_counter() - began) / args.lookups * 1e6
+
+    print(f"industries: {len(pairs)}, " + ", ".join(f"{method} {count}" for method, count in methods.most_common()))
+    print(f"lookup: first {cold_us:.1f} us, memoized {warm_us:.2f} us")
+    sys.exit(1 if broken else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""일일 스크리닝 구독/회차 스케줄러가 재시작에도 중복 없이 한 번만 실행하는지 확인
+
+같은 SQLite 파일 위에 스케줄러를 새로 만드는 것으로 재시작을 흉내내며 다음을 확인한다.
+- 같은 채팅을 여러 번 구독해도 한 번만 저장
+- 같은 회차가 동시에 두 번 시작돼도 스크리닝(보고서 작성)은 한 번, 채팅마다 한 번 전송
+- 재시작 후 완료된 회차는 다시 실행하지 않음
+- 전송 도중 끊긴 회차는 재시작 후 아직 받지 못한 채팅에만 이어서 전송
+- 봇을 차단한 채팅은 구독에서 제외
+- 채팅별 전송 시작이 spread 초 안에서 분산
+- 회차 계산: 설정 시각 직전은 전날 회차, 설정 시각부터는 당일 회차
+
+    python -m benchmarks.check_scheduler [--chats 60]
+"""
+import argparse
+import asyncio
+import collections
+import os
+import random
+import sys
+from datetime import datetime
+
+from benchmarks.fake_provider import FakeBot, app_environment
+
+class RecordingBot(FakeBot):
+    """blocked 채팅에는 Forbidden 을 내고, 전송이 stop_after 건에 이르면 on_stop 을 부른다"""
+
+    def __init__(self, blocked=(), stop_after=None, on_stop=None):
+        super().__init__()
+        self.blocked = set(blocked)
+        self.stop_after = stop_after
+        self.on_stop = on_stop
+
+    async def send_message(self, chat_id, text, **kwargs):
+        import telegram.error
+
+        if chat_id in self.blocked:
+            raise telegram.error.Forbidden("bot was blocked by the user")
+        message = await super().send_message(chat_id, text, **kwargs)
+        if self.stop_after is not None and len(self.sent) == self.stop_after:
+            self.on_stop()
+        return message
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chats", type=int, default=60)
+    args = parser.parse_args()
+
+    with app_environment() as cache_dir:
+        from app.utils import subscriptions as module
+        from app.utils.subscriptions import DailyScreeningScheduler, SubscriptionStore, parse_time, resolve_timezone
+
+        path = os.path.join(cache_dir, "check.sqlite3")
+        at = parse_time("09:00", resolve_timezone("Asia/Seoul"))
+        reports = []
+
+        async def build_report(scope="all", max_age=None):
+            reports.append(scope)
+            await asyncio.sleep(0.05)
+            return ["report"]
+
+        module.build_report = build_report
+
+        def boot() -> DailyScreeningScheduler:
+            return DailyScreeningScheduler(SubscriptionStore(path), at, jitter=0, spread=0)
+
+        failures = []
+
+        def check(condition: bool, message: str):
+            print(("ok   " if condition else "FAIL ") + message)
+            if not condition:
+                failures.append(message)
+
+        async def scenario():
+            chats = list(range(1, args.chats + 1))
+            scheduler = boot()
+            for chat_id in chats + chats[: args.chats // 2]:
+                scheduler.store.add(chat_id)
+            check(scheduler.store.count() == args.chats, f"duplicate subscribes stored once ({scheduler.store.count()})")
+
+            bot = RecordingBot(blocked={chats[-1]})
+            await asyncio.gather(scheduler.run_slot(bot, "2025-01-02"), scheduler.run_slot(bot, "2025-01-02"))
+            per_chat = collections.Counter(sent["chat_id"] for sent in bot.sent)
+            check(len(reports) == 1, f"concurrent starts ran one screening ({len(reports)})")
+            check(len(per_chat) == args.chats - 1 and set(per_chat.values()) == {1},
+                  f"each chat got the report once ({len(per_chat)} chats, max {max(per_chat.values())})")
+            check(chats[-1] not in scheduler.store.chat_ids(), "blocked chat unsubscribed")
+
+            scheduler = boot()
+            await scheduler.run_slot(RecordingBot(), "2025-01-02")
+            check(len(reports) == 1, f"finished slot not rerun after restart ({len(reports)})")
+
+            # 다음 회차 전송 도중 프로세스가 끊긴 경우
+            half = (args.chats - 1) // 2
+            task = None
+            bot = RecordingBot(stop_after=half, on_stop=lambda: task.cancel())
+            task = asyncio.create_task(scheduler.run_slot(bot, "2025-01-03"))
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+            first = {sent["chat_id"] for sent in bot.sent}
+            delivered = boot().store.delivered("2025-01-03")
+            scheduler = boot()
+            resumed = RecordingBot()
+            await scheduler.run_slot(resumed, "2025-01-03")
+            second = collections.Counter(sent["chat_id"] for sent in resumed.sent)
+            check(not (delivered & set(second)), f"resumed slot skipped {len(delivered)} already delivered chats")
+            check(first | set(second) == set(scheduler.store.chat_ids()) and set(second.values()) == {1},
+                  f"resumed slot reached remaining {len(second)} chats once")
+            check(scheduler.store.is_finished("2025-01-03"), "resumed slot marked finished")
+
+            # 채팅별 전송 시작 분산 (앞선 회차의 채팅별 전송 한도에 묶이지 않도록 새 채팅으로)
+            spread = 0.5
+            spreading = DailyScreeningScheduler(SubscriptionStore(os.path.join(cache_dir, "spread.sqlite3")), at,
+                                                jitter=0, spread=spread)
+            for chat_id in range(10001, 10011):
+                spreading.store.add(chat_id)
+            random.seed(0)
+            bot = RecordingBot()
+            await spreading.run_slot(bot, "2025-01-04")
+            sent_at = sorted(sent["at"] for sent in bot.sent)
+            check(len(bot.sent) == spreading.store.count() and sent_at[-1] - sent_at[0] > spread / 2,
+                  f"broadcast spread over {sent_at[-1] - sent_at[0]:.2f}s (spread {spread}s)")
+
+            for moment, expected in (("2025-01-03T08:59:00+09:00", "2025-01-02"),
+                                     ("2025-01-03T09:00:00+09:00", "2025-01-03"),
+                                     ("2025-01-03T00:30:00+00:00", "2025-01-03")):
+                slot = scheduler.latest_slot(datetime.fromisoformat(moment))[0]
+                check(slot == expected, f"latest slot at {moment} is {slot}")
+
+        asyncio.run(scenario())
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
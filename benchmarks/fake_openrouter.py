@@ -0,0 +1,47 @@
+"""OpenRouter chat completions API 를 흉내내는 로컬 HTTP 서버"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class FakeCompletionServer:
+    """단일 설명 요청에는 한 문장을, 묶음 요청(JSON 요구)에는 {티커: 설명} JSON 을 돌려준다"""
+
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive 허용
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                server.requests += 1
+                time.sleep(server.latency)
+                prompt = body["messages"][0]["content"]
+                if "JSON" in prompt:
+                    tickers = prompt.splitlines()[1:]
+                    content = "```json\n" + json.dumps({t: f"{t}는 가짜 설명입니다." for t in tickers}, ensure_ascii=False) + "\n```"
+                else:
+                    content = f"{prompt.split()[0]}는 가짜 설명입니다."
+                payload = json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}/api/v1/chat/completions"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
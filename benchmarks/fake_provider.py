@@ -0,0 +1,182 @@
+"""yfinance 등 외부 데이터 소스를 대신하는 결정적(deterministic) 가짜 데이터 공급자"""
+import os
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+# app.config 는 임포트 시 토큰을 요구하므로 벤치마크용 더미 값을 채운다
+os.environ.setdefault("TELEGRAM_TOKEN", "benchmark")
+os.environ.setdefault("OPEN_ROUTER_API_KEY", "benchmark")
+
+@contextmanager
+def app_environment(**settings) -> Iterator[str]:
+    """임시 CACHE_DIR 과 주어진 설정을 환경 변수로 지정하고 캐시 디렉터리 경로를 넘긴다
+
+    앱 설정은 임포트 시점에 읽히므로 앱 모듈은 이 블록 안에서 불러온다.
+    """
+    with tempfile.TemporaryDirectory() as cache_dir:
+        os.environ["CACHE_DIR"] = cache_dir
+        for name, value in settings.items():
+            os.environ[name] = str(value)
+        yield cache_dir
+
+def make_tickers(count: int) -> List[str]:
+    return [f"T{i:05d}" for i in range(count)]
+
+class FakeDataProvider:
+    """티커 이름으로 시드를 고정해 항상 같은 결과를 돌려주는 지연 시뮬레이터"""
+
+    def __init__(self, latency: float = 0.05):
+        self.latency = latency
+        self.calls = 0
+
+    def analyze(self, ticker: str) -> Optional[Dict[str, Any]]:
+        self.calls += 1
+        # yfinance 가격 이력 + info 요청 두 번의 블로킹 호출을 흉내낸다
+        time.sleep(self.latency)
+        time.sleep(self.latency)
+        seed = zlib.crc32(ticker.encode())
+        current_price = 10 + seed % 500
+        intrinsic_value = current_price * (0.5 + (seed % 100) / 50)
+        safety_margin = (intrinsic_value - current_price) / intrinsic_value * 100
+        return {
+            "ticker": ticker,
+            "current_price": round(current_price, 2),
+            "intrinsic_value": round(intrinsic_value, 2),
+            "safety_margin": round(safety_margin, 2),
+            "buy_recommendation": safety_margin > 30,
+        }
+
+INDUSTRIES = ["Semiconductor", "Machinery", "Software (Internet)", "Unknown Industry"]
+SECTORS = ["Technology", "Industrials", "Healthcare", "Default"]
+
+def make_panel(tickers: List[str], days: int = 1260, seed: int = 0):
+    """기하 브라운 운동으로 만든 (날짜 x 티커) 종가 패널. 일부 티커는 상장 기간이 짧다"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    drift = rng.normal(0.0004, 0.0003, len(tickers))
+    vol = rng.uniform(0.01, 0.04, len(tickers))
+    returns = rng.normal(drift, vol, (days, len(tickers)))
+    values = 50 * np.exp(np.cumsum(returns, axis=0))
+    listed_from = np.where(rng.random(len(tickers)) < 0.2, rng.integers(1, days - 1, len(tickers)), 0)
+    values[np.arange(days)[:, None] < listed_from] = np.nan
+    index = pd.bdate_range(end="2025-01-31", periods=days)
+    return pd.DataFrame(values, index=index, columns=tickers)
+
+def make_info(ticker: str) -> Dict[str, Any]:
+    seed = zlib.crc32(ticker.encode())
+    info = {
+        "trailingEps": (seed % 1000) / 100 - 1,
+        "industry": INDUSTRIES[seed % len(INDUSTRIES)],
+        "sector": SECTORS[(seed >> 3) % len(SECTORS)],
+        "profitMargins": (seed % 37) / 100,
+        "returnOnEquity": (seed % 41) / 100,
+    }
+    if seed % 5:
+        info["trailingPE"] = 5 + seed % 60
+    return info
+
+class FakeMarket:
+    """yfinance, Nasdaq API, Wikipedia 를 대신하는 합성 시장 데이터 (지연 시간 설정 가능)"""
+
+    def __init__(self, size: int, latency: float = 0.0, days: int = 1260):
+        self.tickers = make_tickers(size)
+        self.nasdaq = self.tickers[:max(1, size // 5)]
+        self.latency = latency
+        self.days = days
+        self.calls = 0
+        self._index = None
+
+    def _sleep(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def prices(self, ticker: str, period: Optional[str] = None, start=None):
+        import numpy as np
+        import pandas as pd
+
+        if self._index is None:
+            # bdate_range 생성 비용이 커서 한 번만 만든다
+            self._index = pd.bdate_range(end=pd.Timestamp.now().normalize(), periods=self.days)
+        index = self._index
+        rng = np.random.default_rng(zlib.crc32(ticker.encode()))
+        close = 50 * np.exp(np.cumsum(rng.normal(0.0004, rng.uniform(0.01, 0.04), self.days)))
+        df = pd.DataFrame(
+            {"Open": close, "High": close * 1.01, "Low": close * 0.99, "Close": close,
+             "Volume": rng.integers(1e5, 1e7, self.days).astype(float)},
+            index=index,
+        )
+        return df[df.index >= pd.Timestamp(start)] if start is not None else df
+
+    def info(self, ticker: str) -> Dict[str, Any]:
+        self._sleep()
+        return make_info(ticker)
+
+    def history(self, ticker: str, period: Optional[str] = None, start=None, **kwargs):
+        self._sleep()
+        return self.prices(ticker, period, start)
+
+    def download(self, tickers, period: Optional[str] = None, start=None, **kwargs):
+        import pandas as pd
+
+        self._sleep()  # 청크당 한 번
+        frames = {ticker: self.prices(ticker, period, start) for ticker in tickers}
+        return pd.concat(frames, axis=1).swaplevel(0, 1, axis=1)
+
+    def install(self):
+        """yfinance 와 종목군 조회 함수를 이 가짜 시장으로 교체"""
+        import yfinance as yf
+        from app.utils.universe import universes
+
+        market = self
+
+        class FakeTicker:
+            def __init__(self, ticker: str, session=None):
+                self.ticker = ticker
+
+            def history(self, **kwargs):
+                return market.history(self.ticker, **kwargs)
+
+            @property
+            def info(self):
+                return market.info(self.ticker)
+
+        yf.Ticker = FakeTicker
+        yf.download = self.download
+        universes.get("nasdaq").fetch = lambda: list(self.nasdaq)
+        universes.get("sp500").fetch = lambda: list(self.tickers)
+
+def install_fake_market(size: int, latency: float = 0.0):
+    """워커 프로세스 초기화 함수로 쓰기 위한 FakeMarket(size, latency).install()"""
+    FakeMarket(size, latency).install()
+
+class FakeBot:
+    """send_message 호출을 기록하는 텔레그램 봇 대역"""
+
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        message = FakeMessage(self, chat_id, text)
+        self.sent.append({"chat_id": chat_id, "text": text, "at": time.perf_counter()})
+        return message
+
+class FakeMessage:
+    def __init__(self, bot: FakeBot, chat_id, text: str):
+        self.bot = bot
+        self.chat_id = chat_id
+        self.text = text
+        self.message_id = len(bot.sent)
+
+    async def reply_text(self, text, **kwargs):
+        return await self.bot.send_message(self.chat_id, text)
+
+    async def edit_text(self, text, **kwargs):
+        self.text = text
+        self.bot.sent.append({"chat_id": self.chat_id, "text": text, "at": time.perf_counter(), "edit": True})
+        return self